@@ -0,0 +1,28 @@
+"""Add events.end_time and attendees (event_id, check_in_status) indexes
+
+Revision ID: 02bbbd0871de
+Revises: 6a79152dedc1
+Create Date: 2026-10-18 13:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '02bbbd0871de'
+down_revision: Union[str, None] = '6a79152dedc1'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_index('ix_events_end_time', 'events', ['end_time'], unique=False)
+    op.create_index('ix_attendees_event_id_check_in_status', 'attendees', ['event_id', 'check_in_status'], unique=False)
+
+
+def downgrade() -> None:
+    op.drop_index('ix_attendees_event_id_check_in_status', table_name='attendees')
+    op.drop_index('ix_events_end_time', table_name='events')
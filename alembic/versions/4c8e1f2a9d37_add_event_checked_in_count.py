@@ -0,0 +1,34 @@
+"""Add events.checked_in_count
+
+Revision ID: 4c8e1f2a9d37
+Revises: b19ac7be72a6
+Create Date: 2026-10-18 18:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '4c8e1f2a9d37'
+down_revision: Union[str, None] = 'b19ac7be72a6'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    with op.batch_alter_table('events') as batch_op:
+        batch_op.add_column(sa.Column('checked_in_count', sa.Integer(), server_default='0', nullable=False))
+
+    # Backfill from the existing check-ins
+    op.execute(
+        "UPDATE events SET checked_in_count = "
+        "(SELECT COUNT(*) FROM attendees WHERE attendees.event_id = events.event_id AND attendees.check_in_status)"
+    )
+
+
+def downgrade() -> None:
+    with op.batch_alter_table('events') as batch_op:
+        batch_op.drop_column('checked_in_count')
@@ -0,0 +1,30 @@
+"""Add composite indexes for keyset pagination of events
+
+Revision ID: 6a79152dedc1
+Revises: d6dfe9de32ce
+Create Date: 2026-10-18 11:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '6a79152dedc1'
+down_revision: Union[str, None] = 'd6dfe9de32ce'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_index('ix_events_start_time_event_id', 'events', ['start_time', 'event_id'], unique=False)
+    op.create_index('ix_events_status_start_time_event_id', 'events', ['status', 'start_time', 'event_id'], unique=False)
+    op.create_index('ix_events_location_start_time_event_id', 'events', ['location', 'start_time', 'event_id'], unique=False)
+
+
+def downgrade() -> None:
+    op.drop_index('ix_events_location_start_time_event_id', table_name='events')
+    op.drop_index('ix_events_status_start_time_event_id', table_name='events')
+    op.drop_index('ix_events_start_time_event_id', table_name='events')
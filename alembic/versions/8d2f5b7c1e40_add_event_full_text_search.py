@@ -0,0 +1,66 @@
+"""Add full-text search over events (FTS5 table on SQLite, tsvector column on Postgres)
+
+Revision ID: 8d2f5b7c1e40
+Revises: 4c8e1f2a9d37
+Create Date: 2026-10-18 21:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = '8d2f5b7c1e40'
+down_revision: Union[str, None] = '4c8e1f2a9d37'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    dialect = op.get_bind().dialect.name
+    if dialect == "sqlite":
+        op.execute(
+            "CREATE VIRTUAL TABLE events_fts USING fts5("
+            "name, description, location, content='events', content_rowid='event_id', "
+            "tokenize='unicode61 remove_diacritics 2', prefix='2 3')"
+        )
+        op.execute(
+            "CREATE TRIGGER events_fts_insert AFTER INSERT ON events BEGIN "
+            "INSERT INTO events_fts (rowid, name, description, location) "
+            "VALUES (new.event_id, new.name, new.description, new.location); END"
+        )
+        op.execute(
+            "CREATE TRIGGER events_fts_delete AFTER DELETE ON events BEGIN "
+            "INSERT INTO events_fts (events_fts, rowid, name, description, location) "
+            "VALUES ('delete', old.event_id, old.name, old.description, old.location); END"
+        )
+        op.execute(
+            "CREATE TRIGGER events_fts_update AFTER UPDATE OF name, description, location ON events BEGIN "
+            "INSERT INTO events_fts (events_fts, rowid, name, description, location) "
+            "VALUES ('delete', old.event_id, old.name, old.description, old.location); "
+            "INSERT INTO events_fts (rowid, name, description, location) "
+            "VALUES (new.event_id, new.name, new.description, new.location); END"
+        )
+        # Index the existing events
+        op.execute("INSERT INTO events_fts (events_fts) VALUES ('rebuild')")
+    elif dialect == "postgresql":
+        # Generated, so existing rows are indexed as the column is added
+        op.execute(
+            "ALTER TABLE events ADD COLUMN search_vector tsvector GENERATED ALWAYS AS ("
+            "setweight(to_tsvector('simple', coalesce(name, '')), 'A') || "
+            "setweight(to_tsvector('simple', coalesce(location, '')), 'B') || "
+            "setweight(to_tsvector('simple', coalesce(description, '')), 'C')) STORED"
+        )
+        op.execute("CREATE INDEX ix_events_search_vector ON events USING gin (search_vector)")
+
+
+def downgrade() -> None:
+    dialect = op.get_bind().dialect.name
+    if dialect == "sqlite":
+        for trigger in ("events_fts_insert", "events_fts_delete", "events_fts_update"):
+            op.execute(f"DROP TRIGGER {trigger}")
+        op.execute("DROP TABLE events_fts")
+    elif dialect == "postgresql":
+        op.execute("DROP INDEX ix_events_search_vector")
+        op.execute("ALTER TABLE events DROP COLUMN search_vector")
@@ -0,0 +1,30 @@
+"""Add attendees keyset indexes ordered by attendee_id
+
+Revision ID: b19ac7be72a6
+Revises: 02bbbd0871de
+Create Date: 2026-10-18 15:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'b19ac7be72a6'
+down_revision: Union[str, None] = '02bbbd0871de'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.drop_index('ix_attendees_event_id_check_in_status', table_name='attendees')
+    op.create_index('ix_attendees_event_id_check_in_status_attendee_id', 'attendees', ['event_id', 'check_in_status', 'attendee_id'], unique=False)
+    op.create_index('ix_attendees_event_id_attendee_id', 'attendees', ['event_id', 'attendee_id'], unique=False)
+
+
+def downgrade() -> None:
+    op.drop_index('ix_attendees_event_id_attendee_id', table_name='attendees')
+    op.drop_index('ix_attendees_event_id_check_in_status_attendee_id', table_name='attendees')
+    op.create_index('ix_attendees_event_id_check_in_status', 'attendees', ['event_id', 'check_in_status'], unique=False)
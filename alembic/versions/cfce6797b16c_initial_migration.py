@@ -0,0 +1,66 @@
+"""Initial migration
+
+Revision ID: cfce6797b16c
+Revises: 
+Create Date: 2025-02-21 02:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'cfce6797b16c'
+down_revision: Union[str, None] = None
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table('events',
+    sa.Column('event_id', sa.Integer(), nullable=False),
+    sa.Column('name', sa.String(), nullable=False),
+    sa.Column('description', sa.String(), nullable=True),
+    sa.Column('start_time', sa.DateTime(), nullable=True),
+    sa.Column('end_time', sa.DateTime(), nullable=True),
+    sa.Column('location', sa.String(), nullable=False),
+    sa.Column('max_attendees', sa.Integer(), nullable=False),
+    sa.Column('status', sa.Enum('scheduled', 'ongoing', 'completed', 'canceled', name='eventstatus'), nullable=True),
+    sa.PrimaryKeyConstraint('event_id')
+    )
+    op.create_index(op.f('ix_events_event_id'), 'events', ['event_id'], unique=False)
+    op.create_table('users',
+    sa.Column('user_id', sa.Integer(), nullable=False),
+    sa.Column('username', sa.String(), nullable=False),
+    sa.Column('email', sa.String(), nullable=False),
+    sa.Column('hashed_password', sa.String(), nullable=False),
+    sa.Column('role', sa.String(), nullable=True),
+    sa.PrimaryKeyConstraint('user_id'),
+    sa.UniqueConstraint('email'),
+    sa.UniqueConstraint('username')
+    )
+    op.create_index(op.f('ix_users_user_id'), 'users', ['user_id'], unique=False)
+    op.create_table('attendees',
+    sa.Column('attendee_id', sa.Integer(), nullable=False),
+    sa.Column('first_name', sa.String(), nullable=False),
+    sa.Column('last_name', sa.String(), nullable=False),
+    sa.Column('email', sa.String(), nullable=False),
+    sa.Column('phone_number', sa.String(), nullable=False),
+    sa.Column('check_in_status', sa.Boolean(), nullable=True),
+    sa.Column('event_id', sa.Integer(), nullable=True),
+    sa.ForeignKeyConstraint(['event_id'], ['events.event_id'], ),
+    sa.PrimaryKeyConstraint('attendee_id'),
+    sa.UniqueConstraint('email')
+    )
+    op.create_index(op.f('ix_attendees_attendee_id'), 'attendees', ['attendee_id'], unique=False)
+
+
+def downgrade() -> None:
+    op.drop_index(op.f('ix_attendees_attendee_id'), table_name='attendees')
+    op.drop_table('attendees')
+    op.drop_index(op.f('ix_users_user_id'), table_name='users')
+    op.drop_table('users')
+    op.drop_index(op.f('ix_events_event_id'), table_name='events')
+    op.drop_table('events')
@@ -0,0 +1,34 @@
+"""Add events.registered_count
+
+Revision ID: d6dfe9de32ce
+Revises: cfce6797b16c
+Create Date: 2026-10-18 09:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'd6dfe9de32ce'
+down_revision: Union[str, None] = 'cfce6797b16c'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    with op.batch_alter_table('events') as batch_op:
+        batch_op.add_column(sa.Column('registered_count', sa.Integer(), server_default='0', nullable=False))
+
+    # Backfill from the existing registrations
+    op.execute(
+        "UPDATE events SET registered_count = "
+        "(SELECT COUNT(*) FROM attendees WHERE attendees.event_id = events.event_id)"
+    )
+
+
+def downgrade() -> None:
+    with op.batch_alter_table('events') as batch_op:
+        batch_op.drop_column('registered_count')
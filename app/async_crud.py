@@ -0,0 +1,182 @@
+"""Async counterparts of the functions in ``app.crud``.
+
+Every function accepts either an ``AsyncSession`` or a plain ``Session``. With an
+``AsyncSession`` the matching ``crud`` function runs through ``run_sync``, so each
+round-trip awaits the async driver (aiosqlite / asyncpg) instead of blocking the
+event loop. A sync session is passed straight through, keeping the old behaviour.
+"""
+from datetime import datetime
+from typing import AsyncIterator, List, Optional, Sequence, Tuple
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session
+from starlette.concurrency import iterate_in_threadpool, run_in_threadpool
+from app import auth, crud
+from app.models import model
+from app.models.model import EventStatus
+from app.schema import AttendeeCreate, EventCreate, EventUpdate
+
+
+async def _run(db, fn, *args, **kwargs):
+    if isinstance(db, AsyncSession):
+        return await db.run_sync(fn, *args, **kwargs)
+    return fn(db, *args, **kwargs)
+
+
+async def rollback(db: AsyncSession | Session):
+    if isinstance(db, AsyncSession):
+        await db.rollback()
+    else:
+        db.rollback()
+
+
+async def close(db: AsyncSession | Session):
+    if isinstance(db, AsyncSession):
+        await db.close()
+    else:
+        db.close()
+
+
+async def create_event(db: AsyncSession | Session, event: EventCreate):
+    return await _run(db, crud.create_event, event)
+
+async def update_event(db: AsyncSession | Session, event_id: int, event_data: EventUpdate):
+    return await _run(db, crud.update_event, event_id, event_data)
+
+async def get_events(
+    db: AsyncSession | Session,
+    status: Optional[EventStatus] = None,
+    location: Optional[str] = None,
+    start_date: Optional[datetime] = None,
+    end_date: Optional[datetime] = None,
+    skip: int = 0,
+    limit: int = 10,
+    columns: Sequence = (model.Event,),
+):
+    return await _run(db, crud.get_events, status, location, start_date, end_date, skip, limit, columns)
+
+async def get_events_page(
+    db: AsyncSession | Session,
+    status: Optional[EventStatus] = None,
+    location: Optional[str] = None,
+    start_date: Optional[datetime] = None,
+    end_date: Optional[datetime] = None,
+    after: Optional[Tuple[Optional[datetime], int]] = None,
+    limit: int = 10,
+    columns: Sequence = (model.Event,),
+):
+    return await _run(db, crud.get_events_page, status, location, start_date, end_date, after, limit, columns)
+
+async def search_events(
+    db: AsyncSession | Session,
+    terms: List[str],
+    status: Optional[EventStatus] = None,
+    location: Optional[str] = None,
+    start_date: Optional[datetime] = None,
+    end_date: Optional[datetime] = None,
+    skip: int = 0,
+    limit: int = 10,
+    columns: Sequence = (model.Event,),
+):
+    return await _run(db, crud.search_events, terms, status, location, start_date, end_date, skip, limit, columns)
+
+async def get_event(db: AsyncSession | Session, event_id: int):
+    return await _run(db, crud.get_event, event_id)
+
+async def create_attendee(db: AsyncSession | Session, attendee: AttendeeCreate):
+    return await _run(db, crud.create_attendee, attendee)
+
+async def get_attendees(
+    db: AsyncSession | Session,
+    event_id: int,
+    columns: Sequence = (model.Attendee,),
+    check_in_status: Optional[bool] = None,
+    after: Optional[int] = None,
+    limit: Optional[int] = None,
+):
+    return await _run(db, crud.get_attendees, event_id, columns, check_in_status, after, limit)
+
+async def stream_rows(db: AsyncSession | Session, stmt, chunk_size: int = 1000) -> AsyncIterator[list]:
+    """Yields the rows of ``stmt`` in lists of up to ``chunk_size``.
+
+    Rows come from a server-side cursor (``yield_per``), so only one chunk is in
+    memory at a time. A sync session fetches in a worker thread to keep the loop free.
+    """
+    stmt = stmt.execution_options(yield_per=chunk_size)
+    if isinstance(db, AsyncSession):
+        result = await db.stream(stmt)
+        try:
+            async for partition in result.partitions():
+                yield partition
+        finally:
+            await result.close()
+    else:
+        result = await run_in_threadpool(db.execute, stmt)
+        try:
+            async for partition in iterate_in_threadpool(result.partitions()):
+                yield partition
+        finally:
+            result.close()
+
+def stream_attendees(
+    db: AsyncSession | Session,
+    event_id: int,
+    columns: Sequence = (model.Attendee,),
+    check_in_status: Optional[bool] = None,
+    after: Optional[int] = None,
+    limit: Optional[int] = None,
+    chunk_size: int = 1000,
+) -> AsyncIterator[list]:
+    """Streams the ``get_attendees`` rows in chunks; see ``stream_rows``."""
+    return stream_rows(db, crud.select_attendees(event_id, columns, check_in_status, after, limit), chunk_size)
+
+def stream_events(
+    db: AsyncSession | Session,
+    status: Optional[EventStatus] = None,
+    location: Optional[str] = None,
+    start_date: Optional[datetime] = None,
+    end_date: Optional[datetime] = None,
+    columns: Sequence = (model.Event,),
+    chunk_size: int = 1000,
+) -> AsyncIterator[list]:
+    """Streams every matching event in event_id order in chunks; see ``stream_rows``."""
+    return stream_rows(db, crud.select_events(status, location, start_date, end_date, columns), chunk_size)
+
+async def bulk_create_attendees(db: AsyncSession | Session, attendees: List[AttendeeCreate]):
+    return await _run(db, crud.bulk_create_attendees, attendees)
+
+async def get_event_stats(db: AsyncSession | Session, event_ids: Sequence[int]):
+    return await _run(db, crud.get_event_stats, event_ids)
+
+async def check_in_attendee(db: AsyncSession | Session, attendee_id: int):
+    return await _run(db, crud.check_in_attendee, attendee_id)
+
+async def bulk_check_in(db: AsyncSession | Session, attendee_ids: List[int]):
+    return await _run(db, crud.bulk_check_in, attendee_ids)
+
+async def create_user(db: AsyncSession | Session, username: str, email: str, hashed_password: str):
+    """Creates a new user in the database."""
+    return await _run(db, crud.create_user, username, email, hashed_password)
+
+async def get_user(db: AsyncSession | Session, user_id: int):
+    """Fetches a user by primary key."""
+    return await _run(db, crud.get_user, user_id)
+
+async def attach_user(db: AsyncSession | Session, user_data: dict):
+    """Attaches a cached user snapshot to the session without querying the database."""
+    return await _run(db, crud.attach_user, user_data)
+
+async def get_user_by_email(db: AsyncSession | Session, email: str):
+    """Fetches a user by email."""
+    return await _run(db, crud.get_user_by_email, email)
+
+async def authenticate_user(db: AsyncSession | Session, email: str, password: str):
+    """Authenticates user credentials, running bcrypt in the hashing pool instead of on the event loop."""
+    user = await get_user_by_email(db, email)
+    if not user:
+        return None
+    valid, new_hash = await auth.verify_password_async(password, user.hashed_password)
+    if not valid:
+        return None
+    if new_hash:
+        await _run(db, crud.update_password_hash, user, new_hash)
+    return user
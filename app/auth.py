@@ -1,32 +1,43 @@
+import asyncio
+import time
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timedelta
+from typing import Optional
 from jose import JWTError, jwt
 from passlib.context import CryptContext
-from fastapi.security import OAuth2PasswordBearer
 from fastapi import Depends, HTTPException, status
+from sqlalchemy import event, inspect
 from sqlalchemy.orm import Session
 from app.dependency import ACCESS_TOKEN_EXPIRE_MINUTES, ALGORITHM, SECRET_KEY, get_db
+from app.db import SessionLocal
 from app.models import model
-from fastapi.security import OAuth2PasswordBearer
-from fastapi.openapi.models import OAuthFlows as OAuthFlowsModel
-from fastapi.openapi.models import OAuthFlowPassword
+from app import async_crud, crud
 from fastapi.security.utils import get_authorization_scheme_param
 from app.dependency import oauth2_scheme
+from app.cache import TTLCache
+from config import AUTH_CACHE_MAX_ENTRIES, AUTH_CACHE_TTL_SECONDS, BCRYPT_ROUNDS, PASSWORD_HASH_WORKERS
 
-# Hashing passwords
-pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
+# Hashing passwords; hashes made at a different cost report as needing an update
+pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto", bcrypt__rounds=BCRYPT_ROUNDS)
+
+# bcrypt releases the GIL, so a small thread pool keeps hashing off the event loop
+_hash_executor = ThreadPoolExecutor(max_workers=PASSWORD_HASH_WORKERS, thread_name_prefix="password-hash")
 
-# Define OAuth2 scheme for JWT
-oauth2_scheme = OAuth2PasswordBearer(
-    tokenUrl="auth/login",  # This should match your login endpoint
-    scheme_name="JWT",
-    auto_error=True
-)
 def verify_password(plain_password, hashed_password):
     return pwd_context.verify(plain_password, hashed_password)
 
 def get_password_hash(password):
     return pwd_context.hash(password)
 
+async def verify_password_async(plain_password, hashed_password):
+    """Verifies in the hashing pool; returns (valid, new_hash), new_hash set when the cost changed."""
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(_hash_executor, pwd_context.verify_and_update, plain_password, hashed_password)
+
+async def get_password_hash_async(password):
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(_hash_executor, pwd_context.hash, password)
+
 # Generate JWT Token
 def create_access_token(data: dict, expires_delta: timedelta = None):
     to_encode = data.copy()
@@ -41,8 +52,60 @@ def authenticate_user(db: Session, username: str, password: str):
         return user
     return None
 
+# Decoded claims keyed by raw token, and user column snapshots keyed by user_id.
+# A warm request authenticates without decoding the JWT or touching the database.
+token_cache = TTLCache(AUTH_CACHE_MAX_ENTRIES, AUTH_CACHE_TTL_SECONDS)
+user_cache = TTLCache(AUTH_CACHE_MAX_ENTRIES, AUTH_CACHE_TTL_SECONDS)
+
+_USER_COLUMNS = [column.key for column in inspect(model.User).column_attrs]
+
+def invalidate_user(user_id) -> None:
+    """Drops a cached user; call after changing users outside the ORM unit of work."""
+    user_cache.pop(str(user_id))
+
+@event.listens_for(model.User, "after_update")
+@event.listens_for(model.User, "after_delete")
+def _invalidate_changed_user(mapper, connection, target):
+    invalidate_user(target.user_id)
+
+def user_from_token(token: str) -> Optional[dict]:
+    """Column values of the token's user, or None for a bad token or an unknown user.
+
+    For code outside a route (middleware), which has no request session: a user
+    cache miss is loaded with a short-lived session of its own. Blocks; call it
+    from a worker thread.
+    """
+    try:
+        user_id = _decode_token(token).get("sub")
+    except JWTError:
+        return None
+    if user_id is None:
+        return None
+    user_data = user_cache.get(str(user_id))
+    if user_data is None:
+        with SessionLocal() as db:
+            user = crud.get_user(db, user_id)
+            if user is None:
+                return None
+            user_data = {key: getattr(user, key) for key in _USER_COLUMNS}
+        user_cache.set(str(user_id), user_data)
+    return user_data
+
+def auth_cache_stats() -> dict:
+    """Hit/miss counters of the authentication caches."""
+    return {"tokens": token_cache.stats(), "users": user_cache.stats()}
+
+def _decode_token(token: str) -> dict:
+    claims = token_cache.get(token)
+    if claims is None:
+        claims = jwt.decode(token, SECRET_KEY, algorithms=[ALGORITHM])
+        # Never serve claims past the token's own expiry
+        expires_in = claims["exp"] - time.time() if "exp" in claims else None
+        token_cache.set(token, claims, ttl=expires_in)
+    return claims
+
 # Get current user from JWT token
-def get_current_user(token: str = Depends(oauth2_scheme), db: Session = Depends(get_db)):
+async def get_current_user(token: str = Depends(oauth2_scheme), db: Session = Depends(get_db)):
     credentials_exception = HTTPException(
         status_code=status.HTTP_401_UNAUTHORIZED,
         detail="Invalid authentication credentials",
@@ -50,13 +113,26 @@ def get_current_user(token: str = Depends(oauth2_scheme), db: Session = Depends(
     )
     
     try:
-        payload = jwt.decode(token, SECRET_KEY, algorithms=[ALGORITHM])
+        payload = _decode_token(token)
         user_id: str = payload.get("sub")
     except JWTError:
         raise credentials_exception
-    
-    user = db.query(model.User).filter(model.User.user_id == user_id).first()
+    if user_id is None:
+        raise credentials_exception
+
+    user_data = user_cache.get(str(user_id))
+    if user_data is not None:
+        return await async_crud.attach_user(db, user_data)
+
+    user = await async_crud.get_user(db, user_id)
     if user is None:
         raise credentials_exception
+    user_cache.set(str(user_id), {key: getattr(user, key) for key in _USER_COLUMNS})
+
+    return user
 
+# Restrict an endpoint to administrators
+async def get_current_admin(user: model.User = Depends(get_current_user)):
+    if user.role != "admin":
+        raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Admin privileges required")
     return user
\ No newline at end of file
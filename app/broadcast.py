@@ -0,0 +1,125 @@
+"""In-process publish/subscribe hub behind the live check-in WebSocket feed.
+
+Each subscriber owns a bounded queue. ``publish`` never waits: a subscriber
+whose queue is full is dropped (its feed closes) instead of slowing the
+publisher or growing memory. Messages are encoded once and the same string is
+queued for every subscriber. The hub is per process; clients of other uvicorn
+workers only see check-ins made through their own worker.
+"""
+import asyncio
+import threading
+from collections import defaultdict
+from typing import Any, Dict, Hashable, Iterable, Optional, Set
+from app.responses import dump_json
+from config import CHECKIN_FEED_FRAME_SIZE, CHECKIN_FEED_QUEUE_SIZE
+
+_DROPPED = object()
+
+
+class Subscription:
+    def __init__(self, topic: Hashable, maxsize: int):
+        self.topic = topic
+        self.queue: asyncio.Queue = asyncio.Queue(maxsize)
+        self.loop = asyncio.get_running_loop()
+        self.dropped = False
+
+    async def get(self) -> Optional[Any]:
+        """The next message, or None once the hub has dropped this subscriber."""
+        message = await self.queue.get()
+        return None if message is _DROPPED else message
+
+
+class BroadcastHub:
+    """Fans messages out to the subscribers of a topic; safe to publish from any thread."""
+
+    def __init__(self, maxsize: int):
+        self.maxsize = maxsize
+        self._topics: Dict[Hashable, Set[Subscription]] = defaultdict(set)
+        self._lock = threading.Lock()
+        self.published = self.delivered = self.dropped = 0
+
+    def subscribe(self, topic: Hashable) -> Subscription:
+        """Registers a subscriber; call from the event loop that will consume it."""
+        subscription = Subscription(topic, self.maxsize)
+        with self._lock:
+            self._topics[topic].add(subscription)
+        return subscription
+
+    def unsubscribe(self, subscription: Subscription) -> None:
+        with self._lock:
+            subscribers = self._topics.get(subscription.topic)
+            if subscribers is not None:
+                subscribers.discard(subscription)
+                if not subscribers:
+                    del self._topics[subscription.topic]
+
+    def has_subscribers(self, topic: Hashable) -> bool:
+        return topic in self._topics
+
+    def publish(self, topic: Hashable, message: Any) -> int:
+        """Queues ``message`` for the topic's subscribers; returns how many there were."""
+        with self._lock:
+            subscribers = tuple(self._topics.get(topic, ()))
+            self.published += 1
+        if not subscribers:
+            return 0
+        try:
+            running = asyncio.get_running_loop()
+        except RuntimeError:
+            running = None
+        by_loop = defaultdict(list)
+        for subscription in subscribers:
+            by_loop[subscription.loop].append(subscription)
+        for loop, subscriptions in by_loop.items():
+            if loop is running:
+                self._deliver(subscriptions, message)
+            elif not loop.is_closed():
+                loop.call_soon_threadsafe(self._deliver, subscriptions, message)
+        return len(subscribers)
+
+    def stats(self) -> dict:
+        with self._lock:
+            subscribers = sum(len(subscribers) for subscribers in self._topics.values())
+            return {"subscribers": subscribers, "published": self.published,
+                    "delivered": self.delivered, "dropped": self.dropped}
+
+    def _deliver(self, subscriptions: Iterable[Subscription], message: Any):
+        delivered = 0
+        for subscription in subscriptions:
+            if subscription.dropped:
+                continue
+            try:
+                subscription.queue.put_nowait(message)
+                delivered += 1
+            except asyncio.QueueFull:
+                self._drop(subscription)
+        with self._lock:
+            self.delivered += delivered
+
+    def _drop(self, subscription: Subscription):
+        subscription.dropped = True
+        self.unsubscribe(subscription)
+        # Discard the backlog so the consumer sees the drop next
+        while not subscription.queue.empty():
+            subscription.queue.get_nowait()
+        subscription.queue.put_nowait(_DROPPED)
+        with self._lock:
+            self.dropped += 1
+
+
+checkin_hub = BroadcastHub(CHECKIN_FEED_QUEUE_SIZE)
+
+
+def publish_check_ins(attendees: Iterable) -> None:
+    """Publishes checked-in attendees to their events' feeds, in frames of up to CHECKIN_FEED_FRAME_SIZE."""
+    by_event = defaultdict(list)
+    for attendee in attendees:
+        if not checkin_hub.has_subscribers(attendee.event_id):
+            continue
+        by_event[attendee.event_id].append(
+            {"attendee_id": attendee.attendee_id, "first_name": attendee.first_name, "last_name": attendee.last_name}
+        )
+    for event_id, check_ins in by_event.items():
+        for start in range(0, len(check_ins), CHECKIN_FEED_FRAME_SIZE):
+            frame = {"event_id": event_id, "check_ins": check_ins[start:start + CHECKIN_FEED_FRAME_SIZE]}
+            checkin_hub.publish(event_id, dump_json(frame).decode())
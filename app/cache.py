@@ -0,0 +1,184 @@
+"""Bounded in-process caches with expiry and hit/miss accounting."""
+import hashlib
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Callable, Hashable, Iterable, NamedTuple, Optional
+from fastapi import Response
+from config import EVENT_CACHE_MAX_ENTRIES, EVENT_CACHE_TTL_SECONDS, STATUS_RESYNC_SECONDS
+
+_MISSING = object()
+
+
+class TTLCache:
+    """LRU mapping capped at ``maxsize`` entries that each expire after ``ttl`` seconds.
+
+    Safe to share between the event loop and worker threads.
+    """
+
+    def __init__(self, maxsize: int, ttl: float, clock: Callable[[], float] = time.monotonic):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._clock = clock
+        self._data: "OrderedDict[Hashable, tuple]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = self.misses = self.evictions = 0
+
+    def get(self, key: Hashable, default: Any = None) -> Any:
+        with self._lock:
+            value, expires_at = self._data.get(key, (_MISSING, 0.0))
+            if value is _MISSING or expires_at <= self._clock():
+                if value is not _MISSING:
+                    del self._data[key]
+                self.misses += 1
+                return default
+            self._data.move_to_end(key)
+            self.hits += 1
+            return value
+
+    def set(self, key: Hashable, value: Any, ttl: Optional[float] = None) -> None:
+        ttl = self.ttl if ttl is None else min(ttl, self.ttl)
+        if self.maxsize <= 0 or ttl <= 0:
+            return
+        with self._lock:
+            self._data[key] = (value, self._clock() + ttl)
+            self._data.move_to_end(key)
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+                self.evictions += 1
+
+    def pop(self, key: Hashable) -> None:
+        with self._lock:
+            self._data.pop(key, None)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._data.clear()
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+    def stats(self) -> dict:
+        lookups = self.hits + self.misses
+        return {
+            "size": len(self._data),
+            "maxsize": self.maxsize,
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "hit_ratio": self.hits / lookups if lookups else 0.0,
+        }
+
+
+class CachedResponse(NamedTuple):
+    etag: str
+    body: bytes
+
+    def to_response(self, if_none_match: Optional[str] = None) -> Response:
+        """A 304 when ``if_none_match`` names this ETag, the cached JSON body otherwise."""
+        # Authenticated data: shared caches must not store it, clients must revalidate
+        headers = {"ETag": self.etag, "Cache-Control": "private, no-cache"}
+        if if_none_match and _etag_matches(if_none_match, self.etag):
+            return Response(status_code=304, headers=headers)
+        return Response(self.body, media_type="application/json", headers=headers)
+
+
+def _etag_matches(if_none_match: str, etag: str) -> bool:
+    # If-None-Match uses the weak comparison, so W/"x" matches "x"
+    if if_none_match.strip() == "*":
+        return True
+    return any(tag.strip().removeprefix("W/") == etag for tag in if_none_match.split(","))
+
+
+class ResponseCache:
+    """LRU of serialized responses and their strong ETags, dropped by tag when the rows behind them change.
+
+    Invalidation only reaches this process, so entries also expire after ``ttl``
+    seconds: that bounds how long a write made through another worker goes unseen.
+    ``generation`` advances on every invalidation. Pass the value read before
+    querying to ``set``: a response built from reads that raced an invalidation
+    is returned but not stored, so it can't outlive the change.
+    """
+
+    def __init__(self, maxsize: int, ttl: float, clock: Callable[[], float] = time.monotonic):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self.generation = 0
+        self._clock = clock
+        self._data: "OrderedDict[Hashable, tuple]" = OrderedDict()
+        self._tagged: dict = {}
+        self._lock = threading.Lock()
+        self.hits = self.misses = self.evictions = 0
+
+    def get(self, key: Hashable) -> Optional[CachedResponse]:
+        with self._lock:
+            entry = self._data.get(key)
+            if entry is None or entry[2] <= self._clock():
+                if entry is not None:
+                    self._remove(key)
+                self.misses += 1
+                return None
+            self._data.move_to_end(key)
+            self.hits += 1
+            return entry[0]
+
+    def set(self, key: Hashable, body: bytes, tags: Iterable[str], generation: int) -> CachedResponse:
+        cached = CachedResponse(f'"{hashlib.blake2b(body, digest_size=16).hexdigest()}"', body)
+        with self._lock:
+            if generation != self.generation or self.maxsize <= 0 or self.ttl <= 0:
+                return cached
+            self._remove(key)
+            tags = tuple(tags)
+            self._data[key] = (cached, tags, self._clock() + self.ttl)
+            for tag in tags:
+                self._tagged.setdefault(tag, set()).add(key)
+            while len(self._data) > self.maxsize:
+                self._remove(next(iter(self._data)))
+                self.evictions += 1
+        return cached
+
+    def invalidate(self, *tags: str) -> None:
+        with self._lock:
+            self.generation += 1
+            for tag in tags:
+                for key in self._tagged.pop(tag, ()):
+                    self._remove(key)
+
+    def clear(self) -> None:
+        with self._lock:
+            self.generation += 1
+            self._data.clear()
+            self._tagged.clear()
+
+    def _remove(self, key: Hashable) -> None:
+        entry = self._data.pop(key, None)
+        for tag in entry[1] if entry else ():
+            keys = self._tagged.get(tag)
+            if keys is not None:
+                keys.discard(key)
+                if not keys:
+                    del self._tagged[tag]
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+    def stats(self) -> dict:
+        lookups = self.hits + self.misses
+        return {
+            "size": len(self._data),
+            "maxsize": self.maxsize,
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "hit_ratio": self.hits / lookups if lookups else 0.0,
+        }
+
+
+# GET /events and GET /events/{id} bodies, tagged "events" and "event:<id>". Status transitions
+# run in the leader and only invalidate its entries, so the others' live no longer than a resync
+event_responses = ResponseCache(EVENT_CACHE_MAX_ENTRIES, min(EVENT_CACHE_TTL_SECONDS, STATUS_RESYNC_SECONDS))
+
+
+def invalidate_events(*event_ids: int) -> None:
+    """Drops every cached event listing, plus the cached detail of each of ``event_ids``."""
+    event_responses.invalidate("events", *(f"event:{event_id}" for event_id in event_ids))
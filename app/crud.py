@@ -1,21 +1,43 @@
-from sqlalchemy.orm import Session
+import logging
+from collections import Counter
+from sqlalchemy import Select, func, insert, literal_column, or_, select, tuple_, update
+from sqlalchemy.orm import Session, make_transient_to_detached
+from sqlalchemy.orm.attributes import set_committed_value
 from sqlalchemy.exc import IntegrityError
 from app.models import model
-from app.schema import EventCreate, EventUpdate, AttendeeCreate
+from app.schema import AttendeeCreate, AttendeeResponse, EventCreate, EventResponse, EventUpdate
 from datetime import datetime
-from typing import Optional, List
+from typing import Optional, List, Sequence, Tuple
 from app.models.model import EventStatus
-from app import auth
+from app import auth, search
+from app.broadcast import publish_check_ins
+from app.cache import invalidate_events
+from app.db import SessionLocal
+from app.event_status import rearm_event, status_at, utcnow
+from app.jobs import job_runner
+from config import STATS_RECONCILE_SECONDS
+
+logger = logging.getLogger(__name__)
+
+# Just the fields of the response schemas; list endpoints select these as plain
+# rows and encode them directly, skipping ORM identity mapping and pydantic
+EVENT_RESPONSE_COLUMNS = tuple(getattr(model.Event, field) for field in EventResponse.model_fields)
+ATTENDEE_RESPONSE_COLUMNS = tuple(getattr(model.Attendee, field) for field in AttendeeResponse.model_fields)
 
 def create_event(db: Session, event: EventCreate):
     event_data = event.model_dump()
     
     if "status" not in event_data or event_data["status"] is None:
         event_data["status"] = EventStatus.scheduled  
+    # Store a transition that is already due, rather than leave it to the scheduler, which only
+    # hears of events written by other workers at its next resync
+    event_data["status"] = status_at(event_data["status"], event_data.get("start_time"), event_data.get("end_time"), utcnow())
     db_event = model.Event(**event_data)
     db.add(db_event)
     db.commit() 
+    invalidate_events()
     db.refresh(db_event)
+    rearm_event(db_event)
     return db_event 
 
 
@@ -26,52 +48,130 @@ def update_event(db: Session, event_id: int, event_data: EventUpdate):
         return None
     for key, value in event_data.dict(exclude_unset=True).items():
         setattr(event, key, value)
+    event.status = status_at(event.status, event.start_time, event.end_time, utcnow())
     db.commit()
+    invalidate_events(event_id)
     db.refresh(event)
+    rearm_event(event)
     return event
 
+def _filter_events(
+    query,
+    status: Optional[EventStatus] = None,
+    location: Optional[str] = None,
+    start_date: Optional[datetime] = None,
+    end_date: Optional[datetime] = None,
+):
+    if status:
+        query = query.filter(model.Event.status == status)
+    if location:
+        query = query.filter(model.Event.location == location)
+    if start_date:
+        query = query.filter(model.Event.start_time >= start_date)
+    if end_date:
+        query = query.filter(model.Event.end_time <= end_date)
+    return query
+
 def get_events(
     db: Session, 
     status: Optional[EventStatus] = None, 
     location: Optional[str] = None, 
-    start_date: Optional[str] = None, 
-    end_date: Optional[str] = None, 
+    start_date: Optional[datetime] = None, 
+    end_date: Optional[datetime] = None, 
     skip: int = 0, 
-    limit: int = 10
+    limit: int = 10,
+    columns: Sequence = (model.Event,),
 ) -> List[model.Event]:
 
-    query = db.query(model.Event)
-
-    if status:
-        query = query.filter(model.Event.status == status)
-    if location:
-        query = query.filter(model.Event.location == location)
-    
-    if start_date or end_date:
-        try:
-            if start_date:
-                start_date_obj = datetime.strptime(start_date, "%Y-%m-%d")
-                query = query.filter(model.Event.start_time >= start_date_obj)
-            if end_date:
-                end_date_obj = datetime.strptime(end_date, "%Y-%m-%d")
-                query = query.filter(model.Event.end_time <= end_date_obj)
-        except ValueError:
-            return []  
+    query = _filter_events(db.query(*columns), status, location, start_date, end_date)
     return query.offset(skip).limit(limit).all()
 
+def select_events(
+    status: Optional[EventStatus] = None,
+    location: Optional[str] = None,
+    start_date: Optional[datetime] = None,
+    end_date: Optional[datetime] = None,
+    columns: Sequence = (model.Event,),
+) -> Select:
+    """Every matching event in event_id order, as a statement for callers that stream its result."""
+    return _filter_events(select(*columns), status, location, start_date, end_date).order_by(model.Event.event_id)
+
+def get_events_page(
+    db: Session,
+    status: Optional[EventStatus] = None,
+    location: Optional[str] = None,
+    start_date: Optional[datetime] = None,
+    end_date: Optional[datetime] = None,
+    after: Optional[Tuple[Optional[datetime], int]] = None,
+    limit: int = 10,
+    columns: Sequence = (model.Event,),
+) -> List[model.Event]:
+    """Keyset page ordered by ``(start_time, event_id)``, starting after the ``after`` key.
+
+    Events without a start_time sort first, each phase being its own index range
+    scan. Up to ``limit + 1`` rows are returned so callers can tell if more exist.
+    ``columns`` must include ``start_time`` and ``event_id`` to build the next key.
+    """
+    query = _filter_events(db.query(*columns), status, location, start_date, end_date)
+    events = []
+
+    if after is None or after[0] is None:
+        undated = query.filter(model.Event.start_time.is_(None))
+        if after is not None:
+            undated = undated.filter(model.Event.event_id > after[1])
+        events = undated.order_by(model.Event.event_id).limit(limit + 1).all()
+        after = None
+
+    if len(events) <= limit:
+        dated = query.filter(model.Event.start_time.isnot(None))
+        if after is not None:
+            dated = dated.filter(tuple_(model.Event.start_time, model.Event.event_id) > tuple_(*after))
+        events += dated.order_by(model.Event.start_time, model.Event.event_id).limit(limit + 1 - len(events)).all()
+
+    return events
+
+def search_events(
+    db: Session,
+    terms: List[str],
+    status: Optional[EventStatus] = None,
+    location: Optional[str] = None,
+    start_date: Optional[datetime] = None,
+    end_date: Optional[datetime] = None,
+    skip: int = 0,
+    limit: int = 10,
+    columns: Sequence = (model.Event,),
+) -> List[model.Event]:
+    """Events containing every term (as a word prefix), best match first; see ``app.search``."""
+    query = db.query(*columns)
+    if db.get_bind().dialect.name == "postgresql":
+        tsquery = func.to_tsquery("simple", search.tsquery(terms))
+        vector = literal_column("events.search_vector")
+        query = query.filter(vector.op("@@")(tsquery)).order_by(func.ts_rank(vector, tsquery).desc())
+    else:
+        # bm25() is lower for better matches; weights follow the columns: name, description, location
+        query = (
+            query.join(search.events_fts, search.events_fts.c.rowid == model.Event.event_id)
+            .filter(literal_column("events_fts").op("MATCH")(search.fts5_query(terms)))
+            .order_by(literal_column("bm25(events_fts, 10.0, 1.0, 4.0)"))
+        )
+    query = _filter_events(query, status, location, start_date, end_date)
+    return query.order_by(model.Event.event_id).offset(skip).limit(limit).all()
 
 def get_event(db: Session, event_id: int):
     return db.query(model.Event).filter(model.Event.event_id == event_id).first()
 
 def create_attendee(db: Session, attendee: AttendeeCreate):
-    event = db.query(model.Event).filter(model.Event.event_id == attendee.event_id).first()
-    
-    if not event or event.status != EventStatus.scheduled:
-        return None, "Event not available for registration"
+    # Claim a seat with a single conditional UPDATE so concurrent registrations can't overbook
+    seat_claimed = db.query(model.Event).filter(
+        model.Event.event_id == attendee.event_id,
+        model.Event.status == EventStatus.scheduled,
+        model.Event.registered_count < model.Event.max_attendees,
+    ).update({model.Event.registered_count: model.Event.registered_count + 1}, synchronize_session=False)
 
-    # Check max attendees limit
-    attendee_count = db.query(model.Attendee).filter(model.Attendee.event_id == attendee.event_id).count()
-    if attendee_count >= event.max_attendees:
+    if not seat_claimed:
+        event = db.query(model.Event).filter(model.Event.event_id == attendee.event_id).first()
+        if not event or event.status != EventStatus.scheduled:
+            return None, "Event not available for registration"
         return None, "Event is fully booked"
 
     db_attendee = model.Attendee(**attendee.model_dump())
@@ -81,35 +181,283 @@ def create_attendee(db: Session, attendee: AttendeeCreate):
         db.refresh(db_attendee)
         return db_attendee, None
     except IntegrityError:
-        db.rollback()
+        db.rollback()  # Also releases the claimed seat
         return None, "Attendee already registered with this email"
 
-def get_attendees(db: Session, event_id: int):
-    return db.query(model.Attendee).filter(model.Attendee.event_id == event_id).all()
+def _filter_attendees(query, event_id: int, check_in_status: Optional[bool] = None, after: Optional[int] = None):
+    # Works on a Query or a Select; attendee_id order lets ``after`` resume a listing
+    query = query.filter(model.Attendee.event_id == event_id)
+    if check_in_status is not None:
+        query = query.filter(model.Attendee.check_in_status == check_in_status)
+    if after is not None:
+        query = query.filter(model.Attendee.attendee_id > after)
+    return query.order_by(model.Attendee.attendee_id)
+
+def get_attendees(
+    db: Session,
+    event_id: int,
+    columns: Sequence = (model.Attendee,),
+    check_in_status: Optional[bool] = None,
+    after: Optional[int] = None,
+    limit: Optional[int] = None,
+):
+    query = _filter_attendees(db.query(*columns), event_id, check_in_status, after)
+    return query.limit(limit).all()
+
+def select_attendees(
+    event_id: int,
+    columns: Sequence = (model.Attendee,),
+    check_in_status: Optional[bool] = None,
+    after: Optional[int] = None,
+    limit: Optional[int] = None,
+) -> Select:
+    """The ``get_attendees`` query as a statement, for callers that stream its result."""
+    return _filter_attendees(select(*columns), event_id, check_in_status, after).limit(limit)
 
 def check_in_attendee(db: Session, attendee_id: int):
     attendee = db.query(model.Attendee).filter(model.Attendee.attendee_id == attendee_id).first()
     if not attendee:
         return None
-    attendee.check_in_status = True
-    db.commit()
-    db.refresh(attendee)
+    if not attendee.check_in_status:
+        # Guarded so two concurrent check-ins of one attendee count once
+        checked_in = db.query(model.Attendee).filter(
+            model.Attendee.attendee_id == attendee_id, model.Attendee.check_in_status.isnot(True)
+        ).update({model.Attendee.check_in_status: True}, synchronize_session=False)
+        if checked_in:
+            _count_check_ins(db, {attendee.event_id: 1})
+        set_committed_value(attendee, "check_in_status", True)
+        db.commit()
+        db.refresh(attendee)
+        if checked_in:
+            publish_check_ins([attendee])
     return attendee
 
+def _count_check_ins(db: Session, check_ins: dict):
+    # In the caller's transaction, so the counter commits (or rolls back) with the check-ins
+    for event_id, count in check_ins.items():
+        db.query(model.Event).filter(model.Event.event_id == event_id).update(
+            {model.Event.checked_in_count: model.Event.checked_in_count + count}, synchronize_session=False
+        )
+
+# Keeps each IN (...) list well under SQLite's bound-parameter limit
+BULK_CHECK_IN_CHUNK_SIZE = 500
+
 def bulk_check_in(db: Session, attendee_ids: List[int]):
+    """Checks in attendees with one set-based UPDATE per chunk of IDs.
+
+    Returns ``(checked_in_attendees, already_checked_in, unknown)`` where the
+    last two are the counts of IDs that were already checked in or don't exist.
+    """
+    attendee_ids = list(dict.fromkeys(attendee_ids))
+    use_returning = db.get_bind().dialect.update_returning
     updated_attendees = []
-    for attendee_id in attendee_ids:
-        attendee = db.query(model.Attendee).filter(model.Attendee.attendee_id == attendee_id).first()
-        if attendee and not attendee.check_in_status:
-            attendee.check_in_status = True
-            updated_attendees.append(attendee)
-    
+    already_checked_in = unknown = 0
+
+    for start in range(0, len(attendee_ids), BULK_CHECK_IN_CHUNK_SIZE):
+        chunk = attendee_ids[start:start + BULK_CHECK_IN_CHUNK_SIZE]
+        stmt = (
+            update(model.Attendee)
+            .where(model.Attendee.attendee_id.in_(chunk), model.Attendee.check_in_status.isnot(True))
+            .values(check_in_status=True)
+        )
+        if use_returning:
+            checked_in = db.scalars(
+                stmt.returning(model.Attendee), execution_options={"synchronize_session": False}
+            ).all()
+        else:
+            # Locked where the database supports it, so no other check-in lands between the SELECT and the UPDATE
+            checked_in = db.query(model.Attendee).filter(
+                model.Attendee.attendee_id.in_(chunk), model.Attendee.check_in_status.isnot(True)
+            ).with_for_update().all()
+            if checked_in:
+                result = db.execute(
+                    stmt.where(model.Attendee.attendee_id.in_([a.attendee_id for a in checked_in])),
+                    execution_options={"synchronize_session": "evaluate"},
+                )
+                if result.rowcount != len(checked_in):
+                    # One was checked in elsewhere after the SELECT and there's no telling which;
+                    # start over rather than count and publish it twice
+                    db.rollback()
+                    return bulk_check_in(db, attendee_ids)
+        updated_attendees.extend(checked_in)
+        _count_check_ins(db, Counter(a.event_id for a in checked_in))
+
+        remaining = set(chunk).difference(a.attendee_id for a in checked_in)
+        if remaining:
+            existing = db.query(func.count(model.Attendee.attendee_id)).filter(
+                model.Attendee.attendee_id.in_(remaining)
+            ).scalar()
+            already_checked_in += existing
+            unknown += len(remaining) - existing
+
     if updated_attendees:
-        db.commit()
+        # Detach first so commit doesn't expire them and force a reload per row
         for attendee in updated_attendees:
-            db.refresh(attendee)
-    
-    return updated_attendees
+            db.expunge(attendee)
+        db.commit()
+        publish_check_ins(updated_attendees)
+
+    return updated_attendees, already_checked_in, unknown
+
+BULK_REGISTRATION_CHUNK_SIZE = 1000
+
+def bulk_create_attendees(db: Session, attendees: List[AttendeeCreate]) -> List[Tuple[Optional[int], Optional[str]]]:
+    """Registers many attendees, returning ``(attendee_id, error)`` per input row.
+
+    Capacity is read for all the events involved and emails are checked against
+    the table up front, a chunk at a time. Accepted rows are then inserted with
+    executemany, one transaction per chunk that also claims the chunk's seats.
+    """
+    results: List[Tuple[Optional[int], Optional[str]]] = [(None, None)] * len(attendees)
+    # Looked up a chunk at a time, keeping each IN (...) list under the bound-parameter limit however big the upload
+    emails = list(dict.fromkeys(attendee.email for attendee in attendees))
+    registered = set()
+    for start in range(0, len(emails), BULK_REGISTRATION_CHUNK_SIZE):
+        registered.update(db.scalars(
+            select(model.Attendee.email).where(model.Attendee.email.in_(emails[start:start + BULK_REGISTRATION_CHUNK_SIZE]))
+        ))
+    event_ids = list(dict.fromkeys(attendee.event_id for attendee in attendees))
+    free_seats = {}
+    for start in range(0, len(event_ids), BULK_REGISTRATION_CHUNK_SIZE):
+        free_seats.update(
+            (event_id, max_attendees - registered_count)
+            for event_id, max_attendees, registered_count in db.query(
+                model.Event.event_id, model.Event.max_attendees, model.Event.registered_count
+            ).filter(
+                model.Event.event_id.in_(event_ids[start:start + BULK_REGISTRATION_CHUNK_SIZE]),
+                model.Event.status == EventStatus.scheduled,
+            )
+        )
+
+    accepted, seen = [], set()
+    for index, attendee in enumerate(attendees):
+        if attendee.email in registered:
+            results[index] = (None, "Attendee already registered with this email")
+        elif attendee.email in seen:
+            results[index] = (None, "Duplicate email in this upload")
+        elif attendee.event_id not in free_seats:
+            results[index] = (None, "Event not available for registration")
+        elif free_seats[attendee.event_id] <= 0:
+            results[index] = (None, "Event is fully booked")
+        else:
+            free_seats[attendee.event_id] -= 1
+            accepted.append(index)
+            # Only an accepted row claims its email; a rejected one leaves it free for a later row
+            seen.add(attendee.email)
+
+    use_returning = db.get_bind().dialect.insert_executemany_returning
+    for start in range(0, len(accepted), BULK_REGISTRATION_CHUNK_SIZE):
+        chunk = accepted[start:start + BULK_REGISTRATION_CHUNK_SIZE]
+        seats = Counter(attendees[index].event_id for index in chunk)
+        for event_id, wanted in seats.items():
+            shortfall = wanted - _claim_seats(db, event_id, wanted)
+            # Registrations raced us for the last seats; the chunk's latest rows lose out
+            for index in [index for index in reversed(chunk) if attendees[index].event_id == event_id][:shortfall]:
+                results[index] = (None, "Event is fully booked")
+                chunk.remove(index)
+        if not chunk:
+            db.commit()
+            continue
+
+        rows = [attendees[index].model_dump() for index in chunk]
+        try:
+            if use_returning:
+                # Matched up by email rather than parameter order, which SQLite can only
+                # guarantee by inserting row by row; unordered, the rows batch into multi-row INSERTs
+                ids_by_email = dict(db.execute(
+                    insert(model.Attendee).returning(model.Attendee.email, model.Attendee.attendee_id), rows
+                ).all())
+            else:
+                db.execute(insert(model.Attendee), rows)
+                ids_by_email = dict(db.execute(
+                    select(model.Attendee.email, model.Attendee.attendee_id)
+                    .where(model.Attendee.email.in_([row["email"] for row in rows]))
+                ).all())
+            attendee_ids = [ids_by_email[row["email"]] for row in rows]
+            db.commit()
+        except IntegrityError:
+            db.rollback()  # Also releases the chunk's seats
+            # An email was registered concurrently; settle this chunk row by row
+            for index in chunk:
+                attendee, error = create_attendee(db, attendees[index])
+                results[index] = (attendee.attendee_id if attendee else None, error)
+            continue
+        for index, attendee_id in zip(chunk, attendee_ids):
+            results[index] = (attendee_id, None)
+
+    return results
+
+def _claim_seats(db: Session, event_id: int, seats: int) -> int:
+    # Conditional UPDATE as in create_attendee; when other registrations got
+    # there first, settle for the seats that are still free
+    while seats > 0:
+        claimed = db.query(model.Event).filter(
+            model.Event.event_id == event_id,
+            model.Event.status == EventStatus.scheduled,
+            model.Event.registered_count + seats <= model.Event.max_attendees,
+        ).update({model.Event.registered_count: model.Event.registered_count + seats}, synchronize_session=False)
+        if claimed:
+            return seats
+        free = db.query(model.Event.max_attendees - model.Event.registered_count).filter(
+            model.Event.event_id == event_id, model.Event.status == EventStatus.scheduled
+        ).scalar()
+        seats = min(seats, free or 0)
+    return 0
+
+
+def get_event_stats(db: Session, event_ids: Sequence[int]):
+    """Attendance counters of the given events, read from the events rows alone."""
+    return db.query(
+        model.Event.event_id,
+        model.Event.max_attendees,
+        model.Event.registered_count,
+        model.Event.checked_in_count,
+    ).filter(model.Event.event_id.in_(event_ids)).order_by(model.Event.event_id).all()
+
+# Drifted events repaired per UPDATE by reconcile_event_counters
+RECONCILE_CHUNK_SIZE = 500
+
+def reconcile_event_counters(db: Session) -> List[int]:
+    """Checks every event's counters against a GROUP BY over attendees and repairs drift.
+
+    Returns the IDs of the events that were repaired.
+    """
+    counts = select(
+        model.Attendee.event_id,
+        func.count().label("registered"),
+        func.count().filter(model.Attendee.check_in_status.is_(True)).label("checked_in"),
+    ).group_by(model.Attendee.event_id).subquery()
+    registered = func.coalesce(counts.c.registered, 0)
+    checked_in = func.coalesce(counts.c.checked_in, 0)
+    drifted = db.scalars(
+        select(model.Event.event_id)
+        .outerjoin(counts, counts.c.event_id == model.Event.event_id)
+        .where(or_(model.Event.registered_count != registered, model.Event.checked_in_count != checked_in))
+    ).all()
+
+    def recount(*criteria):
+        return select(func.count()).where(model.Attendee.event_id == model.Event.event_id, *criteria).scalar_subquery()
+
+    for start in range(0, len(drifted), RECONCILE_CHUNK_SIZE):
+        # Recounted inside the UPDATE, so registrations since the GROUP BY are included
+        db.execute(
+            update(model.Event)
+            .where(model.Event.event_id.in_(drifted[start:start + RECONCILE_CHUNK_SIZE]))
+            .values(
+                registered_count=recount(),
+                checked_in_count=recount(model.Attendee.check_in_status.is_(True)),
+            )
+            .execution_options(synchronize_session=False)
+        )
+    db.commit()
+    return drifted
+
+@job_runner.every(seconds=STATS_RECONCILE_SECONDS)
+def reconcile_event_counters_job():
+    with SessionLocal() as db:
+        repaired = reconcile_event_counters(db)
+    if repaired:
+        logger.warning("Repaired drifted attendance counters of events %s", repaired)
 
 
 def create_user(db: Session, username: str, email: str, hashed_password: str):
@@ -120,13 +468,34 @@ def create_user(db: Session, username: str, email: str, hashed_password: str):
     db.refresh(user)
     return user
 
+def get_user(db: Session, user_id: int):
+    """Fetches a user by primary key."""
+    return db.query(model.User).filter(model.User.user_id == user_id).first()
+
+def attach_user(db: Session, user_data: dict):
+    """Attaches a cached user snapshot to the session without querying the database."""
+    user = model.User(**user_data)
+    make_transient_to_detached(user)
+    return db.merge(user, load=False)
+
 def get_user_by_email(db: Session, email: str):
     """Fetches a user by email."""
     return db.query(model.User).filter(model.User.email == email).first()
 
+def update_password_hash(db: Session, user: model.User, hashed_password: str):
+    """Stores a password hash recomputed with the current hashing settings."""
+    user.hashed_password = hashed_password
+    db.commit()
+    return user
+
 def authenticate_user(db: Session, email: str, password: str):
     """Authenticates user credentials."""
     user = get_user_by_email(db, email)
-    if not user or not auth.verify_password(password, user.hashed_password):
+    if not user:
+        return None
+    valid, new_hash = auth.pwd_context.verify_and_update(password, user.hashed_password)
+    if not valid:
         return None
+    if new_hash:
+        update_password_hash(db, user, new_hash)
     return user
\ No newline at end of file
@@ -1,8 +1,60 @@
-from sqlalchemy import create_engine
+from sqlalchemy import create_engine, event
+from sqlalchemy.engine import make_url
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import sessionmaker
-from config import DATABASE_URL
+from app.metrics import instrument_engine
+from config import ASYNC_DATABASE_URL, DATABASE_URL, METRICS_ENABLED, USE_ASYNC_DB, Settings, settings
 
-engine = create_engine(DATABASE_URL)
+
+def engine_options(url: str, profile: Settings = settings) -> dict:
+    """create_engine keyword arguments for the configured engine profile."""
+    options = {"pool_timeout": profile.db_pool_timeout} if profile.db_pool_timeout else {}
+    if profile.db_engine_profile == "tuned" and make_url(url).get_backend_name() == "postgresql":
+        options.update(
+            pool_size=profile.db_pool_size,
+            max_overflow=profile.db_max_overflow,
+            pool_pre_ping=profile.db_pool_pre_ping,
+            pool_recycle=profile.db_pool_recycle,
+        )
+    return options
+
+
+def apply_sqlite_pragmas(engine, profile: Settings = settings):
+    """Runs the profile's PRAGMAs on every new SQLite connection the engine opens."""
+    if profile.db_engine_profile != "tuned" or engine.dialect.name != "sqlite":
+        return
+    pragmas = [
+        f"PRAGMA journal_mode={profile.sqlite_journal_mode}",
+        f"PRAGMA synchronous={profile.sqlite_synchronous}",
+        f"PRAGMA mmap_size={int(profile.sqlite_mmap_size)}",
+        f"PRAGMA busy_timeout={int(profile.sqlite_busy_timeout_ms)}",
+        f"PRAGMA cache_size={int(profile.sqlite_cache_size)}",
+    ]
+
+    @event.listens_for(engine, "connect")
+    def _set_pragmas(dbapi_connection, connection_record):
+        cursor = dbapi_connection.cursor()
+        try:
+            for pragma in pragmas:
+                cursor.execute(pragma)
+        finally:
+            cursor.close()
+
+
+engine = create_engine(DATABASE_URL, **engine_options(DATABASE_URL))
+apply_sqlite_pragmas(engine)
+if METRICS_ENABLED:
+    instrument_engine(engine)
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
-Base = declarative_base()
\ No newline at end of file
+Base = declarative_base()
+
+# Async engine is only built when enabled so the async driver stays optional
+async_engine = create_async_engine(ASYNC_DATABASE_URL, **engine_options(ASYNC_DATABASE_URL)) if USE_ASYNC_DB else None
+if async_engine is not None:
+    apply_sqlite_pragmas(async_engine.sync_engine)
+    if METRICS_ENABLED:
+        instrument_engine(async_engine.sync_engine, "async")
+AsyncSessionLocal = async_sessionmaker(
+    bind=async_engine, class_=AsyncSession, autoflush=False, expire_on_commit=False
+)
@@ -1,27 +1,26 @@
 # from db.db import *
-from fastapi import HTTPException, Security
-from fastapi import security
-from jose import JWTError
-import jwt
-from app.db import SessionLocal
-from fastapi.security import HTTPAuthorizationCredentials, OAuth2PasswordBearer
+from fastapi.security import OAuth2PasswordBearer
+from app.db import AsyncSessionLocal, SessionLocal
+from config import USE_ASYNC_DB
 
 # Secret key & JWT settings
 SECRET_KEY = "supersecretkey"
 ALGORITHM = "HS256"
 ACCESS_TOKEN_EXPIRE_MINUTES = 30
 
+# The one bearer scheme every route authenticates with (see auth.get_current_user)
 oauth2_scheme = OAuth2PasswordBearer(tokenUrl="auth/login", scheme_name="JWT", auto_error=True)
-def verify_token(credentials: HTTPAuthorizationCredentials = Security(security)):
-    token = credentials.credentials
-    try:
-        payload = jwt.decode(token, SECRET_KEY, algorithms=[ALGORITHM])
-        return payload  # You can extract user info here
-    except JWTError:
-        raise HTTPException(status_code=401, detail="Invalid token")
-def get_db():
+
+def get_sync_db():
     db = SessionLocal()
     try:
         yield db
     finally:
-        db.close()
\ No newline at end of file
+        db.close()
+
+async def get_async_db():
+    async with AsyncSessionLocal() as db:
+        yield db
+
+# Routes depend on get_db; config decides which session type it hands out
+get_db = get_async_db if USE_ASYNC_DB else get_sync_db
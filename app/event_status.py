@@ -0,0 +1,251 @@
+"""Deadline-driven event status transitions: scheduled → ongoing → completed.
+
+Every scheduled or ongoing event has exactly one pending transition, at its
+``start_time`` or ``end_time``. ``EventStatusScheduler`` keeps those deadlines in
+a min-heap indexed by ``event_id``, sleeps until the earliest one and applies
+whatever is due in small batches. ``crud.create_event`` / ``crud.update_event``
+re-arm an event through ``rearm_event`` whenever its times or status change.
+
+The scheduler runs as a ``job_runner`` service, i.e. only in the leader process;
+``resync_event_statuses`` picks up events the other workers wrote.
+"""
+import heapq
+import logging
+import threading
+import time
+from datetime import datetime, timezone
+from typing import Callable, Dict, Iterable, List, Optional, Tuple
+from sqlalchemy import select, update
+from app.cache import invalidate_events
+from app.db import SessionLocal
+from app.jobs import job_runner
+from app.metrics import observe_job
+from app.models import model
+from app.models.model import EventStatus
+from config import STATUS_BATCH_SIZE, STATUS_RESYNC_SECONDS
+
+logger = logging.getLogger(__name__)
+
+PENDING_STATUSES = (EventStatus.scheduled, EventStatus.ongoing)
+
+
+def utcnow() -> datetime:
+    # Event times are stored as naive UTC
+    return datetime.now(timezone.utc).replace(tzinfo=None)
+
+
+def _naive_utc(value: Optional[datetime]) -> Optional[datetime]:
+    if value is not None and value.tzinfo is not None:
+        return value.astimezone(timezone.utc).replace(tzinfo=None)
+    return value
+
+
+def status_at(status: EventStatus, start_time: Optional[datetime], end_time: Optional[datetime], now: datetime) -> EventStatus:
+    """The status an event should have at ``now``; canceled and completed events never move."""
+    if status not in PENDING_STATUSES:
+        return status
+    start_time, end_time = _naive_utc(start_time), _naive_utc(end_time)
+    if end_time is not None and end_time <= now:
+        return EventStatus.completed
+    if status == EventStatus.scheduled and start_time is not None and start_time <= now:
+        return EventStatus.ongoing
+    return status
+
+
+def next_transition(status: EventStatus, start_time: Optional[datetime], end_time: Optional[datetime]) -> Optional[datetime]:
+    """When ``status_at`` next changes for an event, or None if it never will."""
+    start_time, end_time = _naive_utc(start_time), _naive_utc(end_time)
+    if status == EventStatus.scheduled:
+        return start_time if start_time is not None else end_time
+    if status == EventStatus.ongoing:
+        return end_time
+    return None
+
+
+class EventStatusScheduler:
+    """Applies event status transitions as their deadlines pass, from one background thread.
+
+    ``resync`` reloads the heap from the database, picking up events written by
+    other processes; ``run_due`` applies everything due at a given time and is what
+    the thread calls each time it wakes.
+    """
+
+    def __init__(
+        self,
+        session_factory: Callable = SessionLocal,
+        batch_size: int = STATUS_BATCH_SIZE,
+        clock: Callable[[], datetime] = utcnow,
+    ):
+        self._session_factory = session_factory
+        self.batch_size = batch_size
+        self._clock = clock
+        # Superseded heap entries stay behind and are skipped when they surface
+        self._heap: List[Tuple[datetime, int]] = []
+        self._deadlines: Dict[int, datetime] = {}
+        self._condition = threading.Condition()
+        self._thread: Optional[threading.Thread] = None
+        self._stopping = False
+
+    @property
+    def running(self) -> bool:
+        return self._thread is not None
+
+    def start(self):
+        if self.running:
+            return
+        self.resync()
+        self._stopping = False
+        self._thread = threading.Thread(target=self._loop, name="event-status", daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        if not self.running:
+            return
+        with self._condition:
+            self._stopping = True
+            self._condition.notify()
+        self._thread.join()
+        self._thread = None
+
+    def resync(self):
+        """Rebuilds the heap from every scheduled or ongoing event."""
+        stmt = select(model.Event.event_id, model.Event.status, model.Event.start_time, model.Event.end_time).where(
+            model.Event.status.in_(PENDING_STATUSES)
+        )
+        deadlines = {}
+        with self._session_factory() as db:
+            for event_id, status, start_time, end_time in db.execute(stmt.execution_options(yield_per=10000)):
+                deadline = next_transition(status, start_time, end_time)
+                if deadline is not None:
+                    deadlines[event_id] = deadline
+        heap = [(deadline, event_id) for event_id, deadline in deadlines.items()]
+        heapq.heapify(heap)
+        with self._condition:
+            self._deadlines, self._heap = deadlines, heap
+            self._condition.notify()
+
+    def rearm(self, event_id: int, status: EventStatus, start_time: Optional[datetime], end_time: Optional[datetime]):
+        """Replaces an event's pending deadline after its times or status changed."""
+        if not self.running:
+            return
+        with self._condition:
+            self._arm(event_id, next_transition(status, start_time, end_time))
+            self._condition.notify()
+
+    def next_deadline(self) -> Optional[datetime]:
+        with self._condition:
+            return self._peek()
+
+    def run_due(self, now: Optional[datetime] = None) -> int:
+        """Applies every transition due at ``now``; returns how many events changed status."""
+        now = now or self._clock()
+        with self._condition:
+            due = self._pop_due(now)
+        changed = 0
+        for i in range(0, len(due), self.batch_size):
+            changed += self._apply(due[i:i + self.batch_size], now)
+        return changed
+
+    def _arm(self, event_id: int, deadline: Optional[datetime]):
+        if deadline is None:
+            self._deadlines.pop(event_id, None)
+        else:
+            self._deadlines[event_id] = deadline
+            heapq.heappush(self._heap, (deadline, event_id))
+        if len(self._heap) > 2 * len(self._deadlines) + 1024:
+            self._heap = [(deadline, event_id) for event_id, deadline in self._deadlines.items()]
+            heapq.heapify(self._heap)
+
+    def _peek(self) -> Optional[datetime]:
+        while self._heap:
+            deadline, event_id = self._heap[0]
+            if self._deadlines.get(event_id) == deadline:
+                return deadline
+            heapq.heappop(self._heap)
+        return None
+
+    def _pop_due(self, now: datetime) -> List[int]:
+        due = []
+        while (deadline := self._peek()) is not None and deadline <= now:
+            _, event_id = heapq.heappop(self._heap)
+            del self._deadlines[event_id]
+            due.append(event_id)
+        return due
+
+    def _apply(self, event_ids: Iterable[int], now: datetime) -> int:
+        columns = (model.Event.event_id, model.Event.status, model.Event.start_time, model.Event.end_time)
+        moves: Dict[Tuple[EventStatus, EventStatus], List[int]] = {}
+        changed = set()
+        with self._session_factory() as db:
+            rows = db.execute(select(*columns).where(model.Event.event_id.in_(event_ids))).all()
+            for event_id, status, start_time, end_time in rows:
+                target = status_at(status, start_time, end_time, now)
+                if target != status:
+                    moves.setdefault((status, target), []).append(event_id)
+            for (current, target), ids in moves.items():
+                # The status guard leaves events that changed since they were read alone;
+                # whoever changed them re-armed them
+                result = db.execute(
+                    update(model.Event)
+                    .where(model.Event.event_id.in_(ids), model.Event.status == current)
+                    .values(status=target)
+                    .execution_options(synchronize_session=False)
+                )
+                if result.rowcount == len(ids):
+                    changed.update(ids)
+                else:
+                    changed.update(db.scalars(
+                        select(model.Event.event_id).where(model.Event.event_id.in_(ids), model.Event.status == target)
+                    ))
+            db.commit()
+
+        moved = {event_id: target for (_, target), ids in moves.items() for event_id in ids}
+        with self._condition:
+            for event_id, status, start_time, end_time in rows:
+                if event_id in moved and event_id not in changed:
+                    continue
+                self._arm(event_id, next_transition(moved.get(event_id, status), start_time, end_time))
+        if changed:
+            invalidate_events(*changed)
+        return len(changed)
+
+    def _loop(self):
+        while True:
+            with self._condition:
+                while not self._stopping:
+                    deadline, now = self._peek(), self._clock()
+                    if deadline is not None and deadline <= now:
+                        break
+                    timeout = None if deadline is None else (deadline - now).total_seconds()
+                    self._condition.wait(timeout)
+                if self._stopping:
+                    return
+            started = time.perf_counter()
+            try:
+                changed = self.run_due(now)
+            except Exception:
+                observe_job("event-status", time.perf_counter() - started, failed=True)
+                logger.exception("Applying event status transitions failed")
+                with self._condition:
+                    self._condition.wait(STATUS_RESYNC_SECONDS)
+                if not self._stopping:
+                    self.resync()
+                continue
+            observe_job("event-status", time.perf_counter() - started)
+            if changed:
+                logger.info("Moved %d events to their next status", changed)
+
+
+status_scheduler = EventStatusScheduler()
+
+
+def rearm_event(event: model.Event):
+    status_scheduler.rearm(event.event_id, event.status, event.start_time, event.end_time)
+
+
+job_runner.service("event-status", status_scheduler.start, status_scheduler.stop)
+
+
+@job_runner.every(seconds=STATUS_RESYNC_SECONDS)
+def resync_event_statuses():
+    status_scheduler.resync()
@@ -0,0 +1,261 @@
+"""Background jobs that run in exactly one process, however many workers serve the app.
+
+Jobs and long-running services are declared on ``job_runner`` where they are
+defined::
+
+    @job_runner.every(seconds=60)
+    def resync_event_statuses(): ...
+
+    job_runner.service("event-status", status_scheduler.start, status_scheduler.stop)
+
+The ``lifespan`` hook starts the runner with ``leader_lock(engine)``. Every
+process keeps trying to take the lock; the one holding it starts the services
+and runs the jobs, and hands over on shutdown (or when it loses the lock) so
+another worker takes over within ``JOB_LEADER_RETRY_SECONDS``.
+"""
+import asyncio
+import logging
+import os
+import time
+from typing import Callable, List, NamedTuple, Optional
+from sqlalchemy import text
+from sqlalchemy.engine import Engine
+from sqlalchemy.exc import DBAPIError
+from app.metrics import observe_job
+from config import JOB_ADVISORY_LOCK_KEY, JOB_LEADER_RETRY_SECONDS, JOB_LOCK_PATH
+
+try:
+    import fcntl
+except ImportError:  # Windows
+    fcntl = None
+    import msvcrt
+
+logger = logging.getLogger(__name__)
+
+
+class Job(NamedTuple):
+    name: str
+    fn: Callable[[], None]
+    interval: float
+
+
+class Service(NamedTuple):
+    name: str
+    start: Callable[[], None]
+    stop: Callable[[], None]
+
+
+class FileLock:
+    """Exclusive, non-blocking lock on a file; the OS releases it if the process dies."""
+
+    def __init__(self, path: str):
+        self.path = path
+        self._file = None
+
+    def acquire(self) -> bool:
+        if self._file is not None:
+            return True
+        file = open(self.path, "a+")
+        try:
+            if fcntl is not None:
+                fcntl.flock(file.fileno(), fcntl.LOCK_EX | fcntl.LOCK_NB)
+            else:
+                msvcrt.locking(file.fileno(), msvcrt.LK_NBLCK, 1)
+        except OSError:
+            file.close()
+            return False
+        file.truncate(0)
+        file.write(f"{os.getpid()}\n")
+        file.flush()
+        self._file = file
+        return True
+
+    def is_held(self) -> bool:
+        return self._file is not None
+
+    def release(self):
+        if self._file is not None:
+            self._file.close()  # Closing the descriptor drops the lock
+            self._file = None
+
+
+class AdvisoryLock:
+    """Postgres session-level advisory lock, held on a dedicated connection."""
+
+    def __init__(self, engine: Engine, key: int):
+        self.engine = engine
+        self.key = key
+        self._conn = None
+
+    def acquire(self) -> bool:
+        if self._conn is not None:
+            return True
+        conn = self.engine.connect()
+        try:
+            acquired = conn.execute(text("SELECT pg_try_advisory_lock(:key)"), {"key": self.key}).scalar()
+            conn.commit()  # The lock outlives the transaction; don't sit idle in one
+        except DBAPIError:
+            conn.close()
+            raise
+        if not acquired:
+            conn.close()
+            return False
+        self._conn = conn
+        return True
+
+    def is_held(self) -> bool:
+        # The lock goes with the connection, so a dead connection means another process may lead
+        if self._conn is None:
+            return False
+        try:
+            self._conn.execute(text("SELECT 1"))
+            self._conn.commit()
+            return True
+        except DBAPIError:
+            self._conn.invalidate()
+            self._conn.close()
+            self._conn = None
+            return False
+
+    def release(self):
+        if self._conn is None:
+            return
+        try:
+            self._conn.execute(text("SELECT pg_advisory_unlock(:key)"), {"key": self.key})
+            self._conn.commit()
+        except DBAPIError:
+            pass  # Closing the connection releases it anyway
+        finally:
+            self._conn.close()
+            self._conn = None
+
+
+class ProcessLock:
+    """Always granted; for in-memory databases, which no other process can see."""
+
+    def __init__(self):
+        self._held = False
+
+    def acquire(self) -> bool:
+        self._held = True
+        return True
+
+    def is_held(self) -> bool:
+        return self._held
+
+    def release(self):
+        self._held = False
+
+
+def leader_lock(engine: Engine, path: Optional[str] = JOB_LOCK_PATH, key: int = JOB_ADVISORY_LOCK_KEY):
+    """The lock that elects the job leader among processes sharing ``engine``'s database."""
+    if engine.dialect.name == "postgresql":
+        return AdvisoryLock(engine, key)
+    database = engine.url.database
+    if path is None and (not database or database == ":memory:"):
+        return ProcessLock()
+    return FileLock(path or f"{os.path.abspath(database)}.leader")
+
+
+class JobRunner:
+    """Runs the declared services and interval jobs while this process holds the leader lock."""
+
+    def __init__(self, retry_seconds: float = JOB_LEADER_RETRY_SECONDS):
+        self.retry_seconds = retry_seconds
+        self.jobs: List[Job] = []
+        self.services: List[Service] = []
+        self._lock = None
+        self._elect_task: Optional[asyncio.Task] = None
+        self._job_tasks: List[asyncio.Task] = []
+        self._stepping_down: Optional[asyncio.Event] = None
+        self._started_services: List[Service] = []
+
+    @property
+    def is_leader(self) -> bool:
+        return self._stepping_down is not None
+
+    def every(self, seconds: float, name: Optional[str] = None):
+        """Declares ``fn`` as a job run every ``seconds`` on the leader, in a worker thread."""
+        def register(fn):
+            self.jobs.append(Job(name or fn.__name__, fn, seconds))
+            return fn
+        return register
+
+    def service(self, name: str, start: Callable[[], None], stop: Callable[[], None]):
+        """Declares a long-running service, started on becoming leader and stopped on stepping down."""
+        self.services.append(Service(name, start, stop))
+
+    async def start(self, lock):
+        self._lock = lock
+        self._elect_task = asyncio.create_task(self._elect())
+
+    async def stop(self):
+        if self._elect_task is None:
+            return
+        self._elect_task.cancel()
+        try:
+            await self._elect_task
+        except asyncio.CancelledError:
+            pass
+        self._elect_task = None
+        await self._step_down()
+
+    async def _elect(self):
+        while True:
+            try:
+                if not self.is_leader:
+                    if await asyncio.to_thread(self._lock.acquire):
+                        await self._lead()
+                elif not await asyncio.to_thread(self._lock.is_held):
+                    logger.warning("Lost the job leader lock; stopping background jobs")
+                    await self._step_down()
+            except Exception:
+                logger.exception("Job leader election failed")
+            await asyncio.sleep(self.retry_seconds)
+
+    async def _lead(self):
+        logger.info("Became job leader (pid %d)", os.getpid())
+        self._stepping_down = asyncio.Event()
+        try:
+            for service in self.services:
+                await asyncio.to_thread(service.start)
+                self._started_services.append(service)
+        except Exception:
+            await self._step_down()
+            raise
+        self._job_tasks = [asyncio.create_task(self._run_every(job, self._stepping_down)) for job in self.jobs]
+
+    async def _run_every(self, job: Job, stepping_down: asyncio.Event):
+        while True:
+            try:
+                await asyncio.wait_for(stepping_down.wait(), job.interval)
+                return
+            except asyncio.TimeoutError:
+                pass
+            started = time.perf_counter()
+            try:
+                await asyncio.to_thread(job.fn)
+            except Exception:
+                observe_job(job.name, time.perf_counter() - started, failed=True)
+                logger.exception("Background job %s failed", job.name)
+            else:
+                observe_job(job.name, time.perf_counter() - started)
+
+    async def _step_down(self):
+        if self._stepping_down is not None:
+            # Let a job that is already running finish rather than abandoning its thread
+            self._stepping_down.set()
+            await asyncio.gather(*self._job_tasks, return_exceptions=True)
+            self._job_tasks = []
+        while self._started_services:
+            service = self._started_services.pop()
+            try:
+                await asyncio.to_thread(service.stop)
+            except Exception:
+                logger.exception("Stopping %s failed", service.name)
+        self._stepping_down = None
+        if self._lock is not None:
+            await asyncio.to_thread(self._lock.release)
+
+
+job_runner = JobRunner()
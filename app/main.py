@@ -1,101 +1,87 @@
-from fastapi import FastAPI, Request
-from fastapi.exceptions import RequestValidationError
-from fastapi.responses import JSONResponse
+"""The ASGI application, built by ``create_app``.
+
+Importing this module does no work. ``uvicorn --factory app.main:create_app``
+builds the app when the server starts; ``app.main:app`` (for ``uvicorn
+app.main:app`` and the tests) is built on first access. Startup never touches
+the schema: run ``python -m app.migrate`` to create or upgrade the database.
+"""
 from contextlib import asynccontextmanager
-from apscheduler.schedulers.background import BackgroundScheduler
-from datetime import datetime, timezone
-from app.db import engine, Base, SessionLocal
-from app.routers.urls import router as api_router
-import app.models.model as models
-from app.models.model import EventStatus  # Import Enum for event status
-
-# Function to update event status
-def auto_update_event_status():
-    db = SessionLocal()
-    now = datetime.now(timezone.utc)
-    
-    # Correct status comparison using Enum
-    updated_rows = db.query(models.Event).filter(
-        models.Event.end_time < now,
-        models.Event.status != EventStatus.completed  # Use Enum instead of string
-    ).update({models.Event.status: EventStatus.completed}, synchronize_session=False)
-    
-    if updated_rows:
-        print(f"Updated {updated_rows} events to 'completed'")
-    
-    db.commit()
-    db.close()
-
-# Set up a scheduler to run the task every hour
-scheduler = BackgroundScheduler()
-scheduler.add_job(auto_update_event_status, "interval", hours=1)  # Runs every hour
-scheduler.start()
-
-# Lifespan event for initializing the database
+
+
+# Lifespan event for the background jobs and the engines
 @asynccontextmanager
-async def lifespan(app: FastAPI):
-    print("Initializing database...")
-    Base.metadata.create_all(bind=engine)
+async def lifespan(app):
+    from app.db import async_engine, engine
+    from app.jobs import job_runner, leader_lock
+
+    # Exactly one worker process runs the background jobs (see app.jobs)
+    await job_runner.start(leader_lock(engine))
     yield  # Allows app to start
+    await job_runner.stop()
     engine.dispose()
+    if async_engine is not None:
+        await async_engine.dispose()
     print("Shutting down application...")
 
-# Create FastAPI instance with lifespan
-app = FastAPI(title="Event Management API", lifespan=lifespan)
-
-
-original_openapi = app.openapi
-
-def custom_openapi():
-    if app.openapi_schema:
-        return app.openapi_schema  
-
-    openapi_schema = original_openapi()
-    openapi_schema["components"]["securitySchemes"] = {
-        "BearerAuth": {
-            "type": "http",
-            "scheme": "bearer",
-            "bearerFormat": "JWT"
-        }
-    }
-    
-    # 🔹 Apply security globally
-    for path in openapi_schema["paths"].values():
-        for method in path:
-            path[method]["security"] = [{"BearerAuth": []}]
-
-    app.openapi_schema = openapi_schema
-    return app.openapi_schema
-
-app.openapi = custom_openapi
-
-
-# Register all routes
-app.include_router(api_router)
-
-# Custom Exception Handler for Request Validation Errors
-@app.exception_handler(RequestValidationError)
-async def validation_exception_handler(request: Request, exc: RequestValidationError):
-    errors = exc.errors()
-    readable_errors = [
-        {
-            "field": " → ".join(map(str, error["loc"])),  # Format field location
-            "message": error["msg"]
-        }
-        for error in errors
-    ]
-    return JSONResponse(
-        status_code=400,
-        content={"detail": "Validation Error", "errors": readable_errors}
-    )
-
-# Shutdown Event to Stop Scheduler
-# @app.on_event("shutdown")
-# def shutdown_scheduler():
-#     print("Shutting down scheduler...")
-#     scheduler.shutdown()
+
+def create_app():
+    from fastapi import FastAPI, Request
+    from fastapi.exceptions import RequestValidationError
+    from fastapi.responses import JSONResponse
+    from app.openapi import install_openapi
+    from app.profiling import ProfilingMiddleware
+    from app.routers.urls import router as api_router
+    from config import METRICS_ENABLED
+
+    # Create FastAPI instance with lifespan
+    app = FastAPI(title="Event Management API", lifespan=lifespan)
+
+    # Served from the precomputed app/openapi.json (see app.openapi)
+    install_openapi(app)
+
+    # Register all routes
+    app.include_router(api_router)
+
+    # Per-route latency, in-flight requests and DB time per request, served at /metrics
+    if METRICS_ENABLED:
+        from app.metrics import MetricsMiddleware
+        from app.routers.metrics_urls import metrics_router
+
+        app.add_middleware(MetricsMiddleware)
+        app.include_router(metrics_router)
+
+    # Profiles admin-flagged and sampled requests; outermost, so it sees the whole request
+    app.add_middleware(ProfilingMiddleware)
+
+    # Custom Exception Handler for Request Validation Errors
+    @app.exception_handler(RequestValidationError)
+    async def validation_exception_handler(request: Request, exc: RequestValidationError):
+        errors = exc.errors()
+        readable_errors = [
+            {
+                "field": " → ".join(map(str, error["loc"])),  # Format field location
+                "message": error["msg"]
+            }
+            for error in errors
+        ]
+        return JSONResponse(
+            status_code=400,
+            content={"detail": "Validation Error", "errors": readable_errors}
+        )
+
+    return app
+
+
+def __getattr__(name):
+    # ``app`` is built on first access rather than at import
+    if name == "app":
+        global app
+        app = create_app()
+        return app
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
 
 # Run the FastAPI app with Uvicorn
 if __name__ == "__main__":
     import uvicorn
-    uvicorn.run("main:app", host="127.0.0.1", port=8000, reload=True)
+    uvicorn.run("app.main:create_app", factory=True, host="127.0.0.1", port=8000, reload=True)
@@ -0,0 +1,60 @@
+"""Creates or upgrades the database schema; the app itself never touches it.
+
+Run from the repository root before starting the app, and after pulling new
+migrations::
+
+    python -m app.migrate            # to the latest revision
+    python -m app.migrate 6a79152dedc1
+
+It runs the Alembic migrations in ``alembic/versions`` against ``DATABASE_URL``
+(``alembic upgrade`` on its own uses the URL in ``alembic.ini``).
+"""
+import argparse
+import os
+import sys
+from alembic import command
+from alembic.config import Config
+from sqlalchemy import create_engine, inspect
+from config import DATABASE_URL
+
+ALEMBIC_INI = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "alembic.ini")
+
+
+class UnversionedDatabase(Exception):
+    """The database has tables but no Alembic revision, so migrating it would recreate them."""
+
+
+def alembic_config(url: str = DATABASE_URL) -> Config:
+    config = Config(ALEMBIC_INI)
+    config.set_main_option("script_location", os.path.join(os.path.dirname(ALEMBIC_INI), "alembic"))
+    # Config values go through configparser interpolation
+    config.set_main_option("sqlalchemy.url", url.replace("%", "%%"))
+    return config
+
+
+def migrate(url: str = DATABASE_URL, revision: str = "head") -> None:
+    engine = create_engine(url)
+    try:
+        tables = set(inspect(engine).get_table_names())
+    finally:
+        engine.dispose()
+    # Databases from before this command were built by create_all at startup, without a revision
+    if tables and "alembic_version" not in tables:
+        raise UnversionedDatabase(
+            f"{', '.join(sorted(tables))} exist but the database has no Alembic revision; "
+            "run `alembic stamp <revision>` with the revision its schema matches, then migrate")
+    command.upgrade(alembic_config(url), revision)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("revision", nargs="?", default="head")
+    args = parser.parse_args()
+    try:
+        migrate(revision=args.revision)
+    except UnversionedDatabase as exc:
+        sys.exit(str(exc))
+
+
+if __name__ == "__main__":
+    main()
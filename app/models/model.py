@@ -1,7 +1,8 @@
-from sqlalchemy import Column, Integer, String, DateTime, Boolean, Enum, ForeignKey
+from sqlalchemy import Column, Integer, String, DateTime, Boolean, Enum, ForeignKey, Index, event
 from sqlalchemy.orm import relationship
 from datetime import datetime
 from app.db import Base
+from app.search import create_search_index_after_create
 import enum
 
 # Enum for Event Status
@@ -22,10 +23,26 @@ class Event(Base):
     end_time = Column(DateTime)
     location = Column(String, nullable=False)
     max_attendees = Column(Integer, nullable=False)
+    # Seats taken; incremented atomically by crud.create_attendee
+    registered_count = Column(Integer, nullable=False, default=0, server_default="0")
+    # Attendees checked in; incremented by crud.check_in_attendee / crud.bulk_check_in
+    checked_in_count = Column(Integer, nullable=False, default=0, server_default="0")
     status = Column(Enum(EventStatus), default=EventStatus.scheduled)
     
     attendees = relationship("Attendee", back_populates="event")
 
+    # Keyset pagination walks (start_time, event_id), optionally within a status or location,
+    # and the status scheduler loads pending events by status; end_time serves end_date filters
+    __table_args__ = (
+        Index("ix_events_start_time_event_id", "start_time", "event_id"),
+        Index("ix_events_status_start_time_event_id", "status", "start_time", "event_id"),
+        Index("ix_events_location_start_time_event_id", "location", "start_time", "event_id"),
+        Index("ix_events_end_time", "end_time"),
+    )
+
+# The full-text index (FTS5 table / tsvector column) is raw DDL; create_all builds it with the table
+event.listen(Event.__table__, "after_create", create_search_index_after_create)
+
 # Attendee Model
 class Attendee(Base):
     __tablename__ = "attendees"
@@ -40,6 +57,12 @@ class Attendee(Base):
 
     event = relationship("Event", back_populates="attendees")
 
+    # Per-event listing in attendee_id (keyset) order, with or without a check-in filter
+    __table_args__ = (
+        Index("ix_attendees_event_id_check_in_status_attendee_id", "event_id", "check_in_status", "attendee_id"),
+        Index("ix_attendees_event_id_attendee_id", "event_id", "attendee_id"),
+    )
+
 # User Model for Authentication
 class User(Base):
     __tablename__ = "users"
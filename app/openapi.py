@@ -0,0 +1,67 @@
+"""The OpenAPI schema, generated once at build time and served from ``openapi.json``.
+
+FastAPI builds the schema on the first ``/docs`` or ``/openapi.json`` hit by
+walking every route's models; the app instead loads the committed file. After
+changing a route or schema, regenerate it from the repository root::
+
+    python -m app.openapi
+
+``app/test/test_startup.py`` fails while the file is out of date. Without the
+file, the schema is generated on first use as before.
+"""
+import json
+import os
+from typing import Optional
+
+OPENAPI_PATH = os.path.join(os.path.dirname(__file__), "openapi.json")
+
+
+def generate_openapi(app) -> dict:
+    """``app``'s schema as FastAPI generates it, with bearer authentication applied to every operation."""
+    # FastAPI's own generator, whatever app.openapi has been replaced with
+    openapi_schema = type(app).openapi(app)
+    openapi_schema["components"]["securitySchemes"] = {
+        "BearerAuth": {
+            "type": "http",
+            "scheme": "bearer",
+            "bearerFormat": "JWT"
+        }
+    }
+
+    # 🔹 Apply security globally
+    for path in openapi_schema["paths"].values():
+        for method in path:
+            path[method]["security"] = [{"BearerAuth": []}]
+    return openapi_schema
+
+
+def load_openapi(path: str = OPENAPI_PATH) -> Optional[dict]:
+    try:
+        with open(path, encoding="utf-8") as f:
+            return json.load(f)
+    except FileNotFoundError:
+        return None
+
+
+def write_openapi(app, path: str = OPENAPI_PATH) -> None:
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(generate_openapi(app), f, indent=2, ensure_ascii=False)
+        f.write("\n")
+
+
+def install_openapi(app, path: Optional[str] = OPENAPI_PATH) -> None:
+    """Serves ``app``'s schema from ``path`` (or generates it on first use when there is no file)."""
+
+    def openapi():
+        if app.openapi_schema is None:
+            app.openapi_schema = (load_openapi(path) if path else None) or generate_openapi(app)
+        return app.openapi_schema
+
+    app.openapi = openapi
+
+
+if __name__ == "__main__":
+    from app.main import create_app
+
+    write_openapi(create_app())
+    print(f"Wrote {OPENAPI_PATH}")
@@ -0,0 +1,224 @@
+"""Opt-in request profiling, stored in a rotating local directory.
+
+An admin asks for a profile of one request with an ``X-Profile: cprofile`` or
+``X-Profile: stacks`` header (or ``?profile=`` for a browser). The response then
+carries the profile's name in its own ``X-Profile`` header, and the profile can
+be fetched from ``GET /profiles/{name}``. The flag is ignored for anyone else.
+With ``PROFILE_SAMPLE_RATE=N``, 1 in N requests is also profiled, whoever sends
+it, in ``PROFILE_SAMPLE_MODE``.
+
+* ``cprofile`` traces every call (``.prof``, readable by pstats or snakeviz).
+  It is precise but slows the request down several times.
+* ``stacks`` samples the event loop thread's stack every
+  ``PROFILE_SAMPLE_INTERVAL_MS``, as collapsed stacks (``.collapsed``, one
+  ``frame;frame;... count`` line per stack) for flamegraph tools. It is cheap
+  enough to leave sampling on.
+
+Both watch the event loop thread, so whatever else the loop runs meanwhile
+(other requests) shows up too, and work handed to worker threads (bcrypt,
+threadpool endpoints) does not. One profile runs at a time per process; a
+request asking while another is being profiled gets ``X-Profile: busy``.
+"""
+import cProfile
+import io
+import itertools
+import logging
+import os
+import pstats
+import re
+import sys
+import threading
+import time
+from collections import Counter
+from typing import List, Optional
+from fastapi.security.utils import get_authorization_scheme_param
+from starlette.concurrency import run_in_threadpool
+from app import auth
+from config import PROFILE_DIR, PROFILE_KEEP, PROFILE_SAMPLE_INTERVAL_MS, PROFILE_SAMPLE_MODE, PROFILE_SAMPLE_RATE
+
+logger = logging.getLogger(__name__)
+
+MODES = {"cprofile": ".prof", "stacks": ".collapsed"}
+
+# cProfile and the sampler both hook one thread; two at once would garble each other
+_active = threading.Lock()
+
+
+class StackSampler:
+    """Counts a thread's collapsed stacks, sampled every ``interval`` seconds from a helper thread."""
+
+    def __init__(self, thread_id: int, interval: float):
+        self.thread_id = thread_id
+        self.interval = interval
+        self.counts: Counter = Counter()
+        self._stopping = threading.Event()
+        self._thread = threading.Thread(target=self._run, name="stack-sampler", daemon=True)
+
+    def start(self):
+        self._thread.start()
+
+    def stop(self):
+        self._stopping.set()
+        self._thread.join()
+
+    def _run(self):
+        while not self._stopping.wait(self.interval):
+            frame = sys._current_frames().get(self.thread_id)
+            if frame is not None:
+                self.counts[_collapse(frame)] += 1
+
+    def write(self, path: str):
+        with open(path, "w") as f:
+            for stack, count in self.counts.most_common():
+                f.write(f"{stack} {count}\n")
+
+
+def _collapse(frame) -> str:
+    names = []
+    while frame is not None:
+        code = frame.f_code
+        names.append(f"{code.co_name} ({os.path.basename(code.co_filename)}:{code.co_firstlineno})")
+        frame = frame.f_back
+    return ";".join(reversed(names))
+
+
+class TracingProfiler:
+    """``cProfile`` with the sampler's interface."""
+
+    def __init__(self):
+        self.profile = cProfile.Profile()
+
+    def start(self):
+        self.profile.enable()
+
+    def stop(self):
+        self.profile.disable()
+
+    def write(self, path: str):
+        self.profile.dump_stats(path)
+
+
+def render_pstats(path: str, limit: int = 100) -> str:
+    """A ``.prof`` file as a text report of its ``limit`` most expensive calls, cumulatively."""
+    stream = io.StringIO()
+    pstats.Stats(path, stream=stream).sort_stats("cumulative").print_stats(limit)
+    return stream.getvalue()
+
+
+class ProfileStore:
+    """Profiles on disk, named ``<time>-<pid>-<seq>-<method>-<route><ext>``; only the newest ``keep`` stay."""
+
+    def __init__(self, directory: str, keep: int):
+        self.directory = directory
+        self.keep = keep
+        self._sequence = itertools.count(1)
+
+    def name(self, method: str, route: str, mode: str) -> str:
+        slug = re.sub(r"[^A-Za-z0-9]+", "_", route).strip("_") or "root"
+        return f"{time.strftime('%Y%m%dT%H%M%S')}-{os.getpid()}-{next(self._sequence):06d}-{method}-{slug}{MODES[mode]}"
+
+    def save(self, name: str, profiler) -> None:
+        os.makedirs(self.directory, exist_ok=True)
+        profiler.write(os.path.join(self.directory, name))
+        # Names sort by time, so the oldest come first
+        for stale in sorted(self._names())[:-self.keep or None]:
+            try:
+                os.remove(os.path.join(self.directory, stale))
+            except FileNotFoundError:
+                pass  # Another worker pruned it
+
+    def list(self) -> List[dict]:
+        profiles = []
+        for name in sorted(self._names(), reverse=True):
+            try:
+                stat = os.stat(os.path.join(self.directory, name))
+            except FileNotFoundError:
+                continue
+            profiles.append({"name": name, "bytes": stat.st_size, "created": stat.st_mtime})
+        return profiles
+
+    def path(self, name: str) -> Optional[str]:
+        """The file of a stored profile, or None; never resolves outside the directory."""
+        if name not in self._names():
+            return None
+        return os.path.join(self.directory, name)
+
+    def _names(self) -> List[str]:
+        try:
+            return [name for name in os.listdir(self.directory) if name.endswith(tuple(MODES.values()))]
+        except FileNotFoundError:
+            return []
+
+
+profile_store = ProfileStore(PROFILE_DIR, PROFILE_KEEP)
+
+
+class ProfilingMiddleware:
+    """Pure ASGI middleware running flagged (admin) and sampled requests under a profiler."""
+
+    def __init__(self, app, store: ProfileStore = profile_store, sample_rate: int = PROFILE_SAMPLE_RATE,
+                 sample_mode: str = PROFILE_SAMPLE_MODE, interval_ms: float = PROFILE_SAMPLE_INTERVAL_MS):
+        self.app = app
+        self.store = store
+        self.sample_rate = sample_rate
+        self.sample_mode = sample_mode
+        self.interval = interval_ms / 1000
+        self._requests = itertools.count(1)
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        mode = await self._requested_mode(scope)
+        requested = mode is not None
+        if not requested and self.sample_rate > 0 and next(self._requests) % self.sample_rate == 0:
+            mode = self.sample_mode
+        if mode is None:
+            await self.app(scope, receive, send)
+            return
+        if not _active.acquire(blocking=False):
+            await self.app(scope, receive, _with_profile_header(send, "busy") if requested else send)
+            return
+
+        name = None
+
+        def profile_name():
+            nonlocal name
+            # The router has stored the matched route by the time the response starts
+            name = name or self.store.name(scope["method"], getattr(scope.get("route"), "path", "unmatched"), mode)
+            return name
+
+        profiler = TracingProfiler() if mode == "cprofile" else StackSampler(threading.get_ident(), self.interval)
+        profiler.start()
+        try:
+            await self.app(scope, receive, _with_profile_header(send, profile_name) if requested else send)
+        finally:
+            profiler.stop()
+            _active.release()
+        try:
+            await run_in_threadpool(self.store.save, profile_name(), profiler)
+        except OSError:
+            logger.exception("Saving profile %s failed", name)
+
+    async def _requested_mode(self, scope) -> Optional[str]:
+        headers = dict(scope["headers"])
+        mode = headers.get(b"x-profile", b"").decode("latin-1")
+        if not mode:
+            match = re.search(r"(?:^|&)profile=(\w+)", scope.get("query_string", b"").decode("latin-1"))
+            mode = match.group(1) if match else ""
+        if mode not in MODES:
+            return None
+        scheme, token = get_authorization_scheme_param(headers.get(b"authorization", b"").decode("latin-1"))
+        if scheme.lower() != "bearer" or not token:
+            return None
+        user = await run_in_threadpool(auth.user_from_token, token)
+        return mode if user is not None and user.get("role") == "admin" else None
+
+
+def _with_profile_header(send, value):
+    async def send_with_header(message):
+        if message["type"] == "http.response.start":
+            name = value() if callable(value) else value
+            message = {**message, "headers": [*message.get("headers", []), (b"x-profile", name.encode())]}
+        await send(message)
+    return send_with_header
@@ -0,0 +1,74 @@
+"""orjson encoding for list endpoints that skip per-row pydantic validation,
+and the chunk encoders behind the streamed listings and exports."""
+import csv
+import enum
+import io
+import zlib
+from datetime import datetime
+from typing import Any, AsyncIterator, Iterable, List, Sequence
+import orjson
+
+
+def rows_to_dicts(rows: Iterable) -> List[dict]:
+    """Maps SQLAlchemy rows (or namedtuples) to dicts keyed by column name.
+
+    Nothing is validated: select exactly the response schema's fields, e.g.
+    ``crud.EVENT_RESPONSE_COLUMNS``.
+    """
+    return [row._asdict() for row in rows]
+
+
+def dump_json(content: Any) -> bytes:
+    # orjson encodes datetimes as ISO 8601 and enums by value, like pydantic's JSON mode
+    return orjson.dumps(content)
+
+
+async def iter_json_array(chunks: AsyncIterator[Iterable]) -> AsyncIterator[bytes]:
+    """Encodes chunks of rows as a single JSON array, one chunk at a time."""
+    separator = b"["
+    async for chunk in chunks:
+        encoded = dump_json(rows_to_dicts(chunk))
+        if encoded != b"[]":
+            yield separator + encoded[1:-1]
+            separator = b","
+    yield b"[]" if separator == b"[" else b"]"
+
+
+async def iter_ndjson(chunks: AsyncIterator[Iterable]) -> AsyncIterator[bytes]:
+    """Encodes chunks of rows as NDJSON, one object per line."""
+    async for chunk in chunks:
+        yield b"".join(orjson.dumps(row, option=orjson.OPT_APPEND_NEWLINE) for row in rows_to_dicts(chunk))
+
+
+def _csv_value(value: Any) -> Any:
+    if value is None:
+        return ""
+    if isinstance(value, enum.Enum):
+        return value.value
+    if isinstance(value, datetime):
+        return value.isoformat()
+    return value
+
+
+async def iter_csv(chunks: AsyncIterator[Iterable], fieldnames: Sequence[str]) -> AsyncIterator[bytes]:
+    """Encodes chunks of rows as CSV with a header line, one chunk at a time."""
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    writer.writerow(fieldnames)
+    async for chunk in chunks:
+        writer.writerows([_csv_value(value) for value in row] for row in chunk)
+        yield buffer.getvalue().encode()
+        buffer.seek(0)
+        buffer.truncate()
+    if buffer.tell():
+        yield buffer.getvalue().encode()
+
+
+async def iter_gzip(chunks: AsyncIterator[bytes], level: int = 6) -> AsyncIterator[bytes]:
+    """Compresses a byte stream into a gzip file on the fly."""
+    compressor = zlib.compressobj(level, zlib.DEFLATED, 16 + zlib.MAX_WBITS)
+    async for chunk in chunks:
+        compressed = compressor.compress(chunk)
+        if compressed:
+            yield compressed
+    yield compressor.flush()
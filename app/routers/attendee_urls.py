@@ -1,5 +1,6 @@
-from typing import List, Optional
-from fastapi import APIRouter, Depends, File, UploadFile
+from typing import List, Literal, Optional
+from fastapi import APIRouter, Depends, Query, Request
+from fastapi.responses import StreamingResponse
 from app import schema
 from app.auth import get_current_user
 from app.dependency import get_db
@@ -14,17 +15,52 @@ class AttendeeRouter:
     async def register_attendee(attendee: schema.AttendeeCreate, db: Session = Depends(get_db), user=Depends(get_current_user)):
         return await AttendeeRouter.view.register_attendee(attendee, db, user)
 
+    # JSON array of attendees, or a CSV (raw text/csv body or multipart `file`) with a header row
+    @router.post(
+        "/bulk",
+        response_model=schema.BulkRegistrationReport,
+        openapi_extra={"requestBody": {"required": True, "content": {
+            "application/json": {"schema": {"type": "array", "items": {"$ref": "#/components/schemas/AttendeeCreate"}}},
+            "text/csv": {"schema": {"type": "string"}},
+            "multipart/form-data": {"schema": {
+                "type": "object",
+                "required": ["file"],
+                "properties": {"file": {"type": "string", "format": "binary"}},
+            }},
+        }}},
+    )
+    async def bulk_register(request: Request, db: Session = Depends(get_db), user=Depends(get_current_user)):
+        return await AttendeeRouter.view.bulk_register(request, db, user)
+
     @router.put("/check-in/{attendee_id}", response_model=schema.AttendeeResponse)
     async def check_in_attendee(attendee_id: int, db: Session = Depends(get_db), user=Depends(get_current_user)):
         return await AttendeeRouter.view.check_in_attendee(attendee_id, db, user)
 
+    # Streamed in attendee_id order; pass the last attendee_id seen as `after` to resume
     @router.get("/{event_id}", response_model=List[schema.AttendeeResponse])
-    async def list_attendees(event_id: int, check_in_status: Optional[bool] = None, db: Session = Depends(get_db), user=Depends(get_current_user)):
-        return await AttendeeRouter.view.list_attendees(event_id, check_in_status, db)
+    async def list_attendees(
+        event_id: int,
+        check_in_status: Optional[bool] = None,
+        after: Optional[int] = None,
+        limit: Optional[int] = Query(None, ge=1),
+        format: Literal["json", "ndjson"] = "json",
+        db: Session = Depends(get_db),
+        user=Depends(get_current_user),
+    ):
+        return await AttendeeRouter.view.list_attendees(event_id, check_in_status, after, limit, format, db)
 
-    @router.post("/bulk-check-in/", response_model=List[schema.AttendeeResponse])
-    async def bulk_check_in(file: UploadFile = File(...), db: Session = Depends(get_db), user=Depends(get_current_user)):
-        return await AttendeeRouter.view.bulk_check_in(file, db, user)
+    # The CSV is parsed from the raw request stream, so the form is only described for the docs
+    @router.post(
+        "/bulk-check-in/",
+        response_class=StreamingResponse,
+        openapi_extra={"requestBody": {"required": True, "content": {"multipart/form-data": {"schema": {
+            "type": "object",
+            "required": ["file"],
+            "properties": {"file": {"type": "string", "format": "binary"}},
+        }}}}},
+    )
+    async def bulk_check_in(request: Request, db: Session = Depends(get_db), user=Depends(get_current_user)):
+        return await AttendeeRouter.view.bulk_check_in(request, db, user)
 
 # Instantiate and expose the router
 attendee_router = AttendeeRouter.router
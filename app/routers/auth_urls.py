@@ -2,6 +2,7 @@ from fastapi import APIRouter, HTTPException, Depends
 from sqlalchemy.orm import Session
 from datetime import timedelta
 from app import schema, crud, auth
+from app.cache import event_responses
 from app.dependency import get_db
 
 class AuthRouter:
@@ -18,6 +19,11 @@ class AuthRouter:
         """Authenticates a user and returns a JWT token."""
         return await AuthRouter.auth_view.login(form_data, db)
 
+    @router.get("/cache-stats", response_model=dict)
+    async def cache_stats(admin=Depends(auth.get_current_admin)):
+        """Reports hit ratios of the token, user and event response caches (admins only)."""
+        return {**auth.auth_cache_stats(), "event_responses": event_responses.stats()}
+
 # Attach the AuthView instance
 from app.views.auth import AuthView  
 AuthRouter.auth_view = AuthView()
@@ -1,12 +1,13 @@
-from fastapi import APIRouter, Depends
+from fastapi import APIRouter, Depends, Query, Request
+from fastapi.responses import StreamingResponse
 from sqlalchemy.orm import Session
-from typing import List, Optional
+from typing import List, Literal, Optional, Union
 
 from app import schema
 from app.auth import get_current_user
 from app.dependency import get_db
 from app.models import model
-from app.views.event import EventView
+from app.views.event import MAX_PAGE_SIZE, EventView
 
 
 class EventRouter:
@@ -16,7 +17,13 @@ class EventRouter:
 
         self.router.post("", response_model=schema.EventResponse)(self.create_event)
         self.router.put("/{event_id}", response_model=schema.EventResponse)(self.update_event)
-        self.router.get("", response_model=List[schema.EventResponse])(self.list_events)
+        self.router.get("", response_model=Union[List[schema.EventResponse], schema.EventListResponse])(self.list_events)
+        # Registered before /{event_id} so "search" and "export" aren't parsed as event ids
+        self.router.get("/search", response_model=List[schema.EventResponse])(self.search_events)
+        self.router.get("/export", response_class=StreamingResponse)(self.export_events)
+        self.router.get("/stats", response_model=List[schema.EventStats])(self.list_event_stats)
+        self.router.get("/{event_id}/stats", response_model=schema.EventStats)(self.get_event_stats)
+        self.router.get("/{event_id}/attendees/export", response_class=StreamingResponse)(self.export_attendees)
         self.router.get("/{event_id}", response_model=schema.EventResponse)(self.get_event)
 
     async def create_event(
@@ -38,24 +45,83 @@ class EventRouter:
 
     async def list_events(
             self,
+            request: Request,
             status: Optional[model.EventStatus] = None,
             location: Optional[str] = None,
             start_date: Optional[str] = None,
             end_date: Optional[str] = None,
-            skip: int = 0,
-            limit: int = 10,
+            skip: int = Query(0, ge=0),
+            limit: int = Query(10, ge=1, le=MAX_PAGE_SIZE),
+            cursor: Optional[str] = None,
+            db: Session = Depends(get_db),
             user=Depends(get_current_user)
-        ) -> List[schema.EventResponse]:
-        return await self.event_view.list_events(status, location, start_date, end_date, skip, limit, user)
+        ) -> Union[List[schema.EventResponse], schema.EventListResponse]:
+        return await self.event_view.list_events(request, status, location, start_date, end_date, skip, limit, cursor, db, user)
 
 
+    async def search_events(
+        self,
+        request: Request,
+        q: str,
+        status: Optional[model.EventStatus] = None,
+        location: Optional[str] = None,
+        start_date: Optional[str] = None,
+        end_date: Optional[str] = None,
+        skip: int = Query(0, ge=0),
+        limit: int = Query(10, ge=1, le=MAX_PAGE_SIZE),
+        db: Session = Depends(get_db),
+        user=Depends(get_current_user),
+    ) -> List[schema.EventResponse]:
+        return await self.event_view.search_events(request, q, status, location, start_date, end_date, skip, limit, db, user)
+
+    async def export_events(
+        self,
+        format: Literal["csv", "ndjson"] = "csv",
+        gzip: bool = False,
+        status: Optional[model.EventStatus] = None,
+        location: Optional[str] = None,
+        start_date: Optional[str] = None,
+        end_date: Optional[str] = None,
+        db: Session = Depends(get_db),
+        user=Depends(get_current_user),
+    ) -> StreamingResponse:
+        return await self.event_view.export_events(format, gzip, status, location, start_date, end_date, db, user)
+
+    async def export_attendees(
+        self,
+        event_id: int,
+        format: Literal["csv", "ndjson"] = "csv",
+        gzip: bool = False,
+        check_in_status: Optional[bool] = None,
+        db: Session = Depends(get_db),
+        user=Depends(get_current_user),
+    ) -> StreamingResponse:
+        return await self.event_view.export_attendees(event_id, format, gzip, check_in_status, db, user)
+
+    async def list_event_stats(
+        self,
+        event_ids: List[int] = Query([]),
+        db: Session = Depends(get_db),
+        user=Depends(get_current_user),
+    ) -> List[schema.EventStats]:
+        return await self.event_view.list_event_stats(event_ids, db, user)
+
+    async def get_event_stats(
+        self,
+        event_id: int,
+        db: Session = Depends(get_db),
+        user=Depends(get_current_user),
+    ) -> schema.EventStats:
+        return await self.event_view.get_event_stats(event_id, db, user)
+
     async def get_event(
         self,
         event_id: int,
+        request: Request,
         db: Session = Depends(get_db),
         user=Depends(get_current_user),
     ) -> schema.EventResponse:
-        return await self.event_view.get_event(event_id, db, user)
+        return await self.event_view.get_event(event_id, request, db, user)
 
 
 # Expose the router instance
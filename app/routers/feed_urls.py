@@ -0,0 +1,17 @@
+from typing import Optional
+from fastapi import APIRouter, Depends, WebSocket
+from sqlalchemy.orm import Session
+from app.dependency import get_db
+from app.views.feed import FeedView
+
+class FeedRouter:
+    router = APIRouter(prefix="/ws", tags=["feeds"])
+    view = FeedView()
+
+    # Streams {"event_id": ..., "check_ins": [{"attendee_id", "first_name", "last_name"}, ...]} text frames
+    @router.websocket("/events/{event_id}/checkins")
+    async def check_in_feed(websocket: WebSocket, event_id: int, token: Optional[str] = None, db: Session = Depends(get_db)):
+        await FeedRouter.view.check_in_feed(websocket, event_id, token, db)
+
+# Expose the router instance
+feed_router = FeedRouter.router
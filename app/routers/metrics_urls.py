@@ -0,0 +1,20 @@
+import secrets
+from typing import Optional
+from fastapi import APIRouter, Header, HTTPException, Response, status
+from app.metrics import metrics
+from config import METRICS_TOKEN
+
+class MetricsRouter:
+    router = APIRouter(tags=["metrics"])
+
+    # Scraped by Prometheus rather than called by clients, so it stays out of the OpenAPI schema
+    @router.get("/metrics", include_in_schema=False)
+    async def scrape(authorization: Optional[str] = Header(None)):
+        """Request, database and job metrics of this worker process, in Prometheus text format."""
+        if METRICS_TOKEN and not secrets.compare_digest(authorization or "", f"Bearer {METRICS_TOKEN}"):
+            raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Invalid metrics token",
+                                headers={"WWW-Authenticate": "Bearer"})
+        return Response(metrics.render(), media_type="text/plain; version=0.0.4; charset=utf-8")
+
+# Expose the router instance
+metrics_router = MetricsRouter.router
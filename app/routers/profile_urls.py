@@ -0,0 +1,29 @@
+from typing import List
+from fastapi import APIRouter, Depends, HTTPException
+from fastapi.responses import FileResponse, PlainTextResponse
+from starlette.concurrency import run_in_threadpool
+from app.auth import get_current_admin
+from app.profiling import profile_store, render_pstats
+
+class ProfileRouter:
+    router = APIRouter(prefix="/profiles", tags=["profiling"])
+
+    @router.get("", response_model=List[dict])
+    async def list_profiles(admin=Depends(get_current_admin)):
+        """Stored request profiles of this worker's profile directory, newest first (admins only)."""
+        return await run_in_threadpool(profile_store.list)
+
+    # .prof files come back as a pstats report unless raw=true; .collapsed stacks as they are
+    @router.get("/{name}")
+    async def get_profile(name: str, raw: bool = False, admin=Depends(get_current_admin)):
+        """Downloads a stored request profile (admins only)."""
+        path = profile_store.path(name)
+        if path is None:
+            raise HTTPException(status_code=404, detail="Profile not found")
+        if name.endswith(".prof") and not raw:
+            return PlainTextResponse(await run_in_threadpool(render_pstats, path))
+        return FileResponse(path, media_type="text/plain" if name.endswith(".collapsed") else "application/octet-stream",
+                            filename=name)
+
+# Expose the router instance
+profile_router = ProfileRouter.router
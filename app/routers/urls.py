@@ -2,6 +2,8 @@ from fastapi import APIRouter
 from app.routers.event_urls import event_router
 from app.routers.attendee_urls import attendee_router
 from app.routers.auth_urls import auth_router
+from app.routers.feed_urls import feed_router
+from app.routers.profile_urls import profile_router
 
 # Create a main router
 router = APIRouter()
@@ -10,3 +12,5 @@ router = APIRouter()
 router.include_router(auth_router)
 router.include_router(event_router)
 router.include_router(attendee_router)
+router.include_router(feed_router)
+router.include_router(profile_router)
@@ -45,8 +45,15 @@ class EventResponse(BaseModel):
 
 class EventListResponse(BaseModel):
     events: List[EventResponse]
-    total: int
+    next_cursor: Optional[str] = None  # Opaque; null on the last page
     
+class EventStats(BaseModel):
+    event_id: int
+    max_attendees: int
+    registered_count: int
+    checked_in_count: int
+    remaining_seats: int
+
 class EventUpdate(BaseModel):
     name: Optional[str]
     description: Optional[str]
@@ -75,6 +82,26 @@ class AttendeeResponse(AttendeeBase):
     class Config:
         from_attributes = True
 
+class BulkRegistrationRow(BaseModel):
+    """Outcome of one uploaded row; ``row`` is its 1-based position (CSV header excluded)."""
+    row: int
+    attendee_id: Optional[int] = None
+    error: Optional[str] = None
+
+class BulkRegistrationReport(BaseModel):
+    registered: int
+    failed: int
+    results: List[BulkRegistrationRow]
+
+class BulkCheckInProgress(BaseModel):
+    """One NDJSON line of the bulk check-in stream; counts are cumulative."""
+    batch: int
+    rows: int
+    updated: int
+    already_checked_in: int
+    unknown: int
+    done: bool = False
+
 
 # Define User Roles (Schema)
 class UserRole(str, Enum):
@@ -0,0 +1,85 @@
+"""Full-text index over events' name, location and description.
+
+SQLite keeps an FTS5 table, ``events_fts``, over the ``events`` rows (external
+content, so the text isn't stored twice), maintained by triggers. Postgres keeps
+a generated ``search_vector`` tsvector column with a GIN index. Either way the
+database updates the index in the same statement as the event, for every
+writer: ``crud.create_event`` / ``crud.update_event``, bulk loads and other
+processes alike. Status transitions and attendance counters don't touch the
+indexed columns, so they don't pay for it.
+
+Both index words as written (no stemming) and ``parse_terms`` turns a query
+into words matched as prefixes, all of which must appear. Matches rank by name,
+then location, then description (``bm25`` / ``ts_rank``).
+"""
+import re
+from typing import List
+from sqlalchemy import Integer, column, table
+
+# Words beyond this are ignored; each one is another posting list to intersect
+MAX_TERMS = 8
+
+# For joining against in queries; the table itself is created by SQLITE_DDL
+events_fts = table("events_fts", column("rowid", Integer))
+
+SQLITE_DDL = [
+    """CREATE VIRTUAL TABLE IF NOT EXISTS events_fts USING fts5(
+        name, description, location,
+        content='events', content_rowid='event_id',
+        tokenize='unicode61 remove_diacritics 2', prefix='2 3'
+    )""",
+    """CREATE TRIGGER IF NOT EXISTS events_fts_insert AFTER INSERT ON events BEGIN
+        INSERT INTO events_fts (rowid, name, description, location)
+        VALUES (new.event_id, new.name, new.description, new.location);
+    END""",
+    """CREATE TRIGGER IF NOT EXISTS events_fts_delete AFTER DELETE ON events BEGIN
+        INSERT INTO events_fts (events_fts, rowid, name, description, location)
+        VALUES ('delete', old.event_id, old.name, old.description, old.location);
+    END""",
+    """CREATE TRIGGER IF NOT EXISTS events_fts_update AFTER UPDATE OF name, description, location ON events BEGIN
+        INSERT INTO events_fts (events_fts, rowid, name, description, location)
+        VALUES ('delete', old.event_id, old.name, old.description, old.location);
+        INSERT INTO events_fts (rowid, name, description, location)
+        VALUES (new.event_id, new.name, new.description, new.location);
+    END""",
+]
+
+POSTGRES_DDL = [
+    """ALTER TABLE events ADD COLUMN IF NOT EXISTS search_vector tsvector GENERATED ALWAYS AS (
+        setweight(to_tsvector('simple', coalesce(name, '')), 'A') ||
+        setweight(to_tsvector('simple', coalesce(location, '')), 'B') ||
+        setweight(to_tsvector('simple', coalesce(description, '')), 'C')
+    ) STORED""",
+    "CREATE INDEX IF NOT EXISTS ix_events_search_vector ON events USING gin (search_vector)",
+]
+
+
+def create_search_index(conn) -> None:
+    """Creates the index for ``conn``'s dialect and fills it from the existing events."""
+    if conn.dialect.name == "sqlite":
+        for statement in SQLITE_DDL:
+            conn.exec_driver_sql(statement)
+        # Reindex whatever the table already holds (e.g. after a bulk load without the triggers)
+        conn.exec_driver_sql("INSERT INTO events_fts (events_fts) VALUES ('rebuild')")
+    elif conn.dialect.name == "postgresql":
+        for statement in POSTGRES_DDL:
+            conn.exec_driver_sql(statement)
+
+
+def create_search_index_after_create(target, connection, **kw) -> None:
+    """``after_create`` hook for the events table, so ``create_all`` builds the index too."""
+    create_search_index(connection)
+
+
+def parse_terms(q: str) -> List[str]:
+    """The query's words, lowercased; punctuation and operators are dropped, never interpreted."""
+    return re.findall(r"\w+", q.lower())[:MAX_TERMS]
+
+
+def fts5_query(terms: List[str]) -> str:
+    # Quoted, so a word like NEAR or AND is searched for rather than parsed
+    return " ".join(f'"{term}"*' for term in terms)
+
+
+def tsquery(terms: List[str]) -> str:
+    return " & ".join(f"{term}:*" for term in terms)
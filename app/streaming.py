@@ -0,0 +1,132 @@
+"""Incremental upload parsing and streaming responses for bounded-memory endpoints."""
+import codecs
+import csv
+from collections import deque
+from typing import AsyncIterator, Iterator, List
+from fastapi import Request
+from fastapi.responses import StreamingResponse
+from python_multipart.multipart import MultipartParser, parse_options_header
+
+
+async def iter_multipart_file(request: Request, field_name: str) -> AsyncIterator:
+    """Parses a multipart body straight off the socket.
+
+    Yields the uploaded filename of ``field_name`` first, then its content as
+    byte chunks as they arrive; other parts are skipped. Nothing is spooled,
+    so memory is bounded by one network chunk.
+    """
+    _, params = parse_options_header(request.headers.get("content-type", ""))
+    if b"boundary" not in params:
+        return
+
+    events = []
+    part = {"header": b"", "headers": {}, "wanted": False}
+
+    def on_part_begin():
+        part.update(header=b"", headers={}, wanted=False)
+
+    def on_header_field(data, start, end):
+        part["header"] += data[start:end].lower()
+
+    def on_header_value(data, start, end):
+        headers = part["headers"]
+        headers[part["header"]] = headers.get(part["header"], b"") + data[start:end]
+
+    def on_header_end():
+        part["header"] = b""
+
+    def on_headers_finished():
+        _, options = parse_options_header(part["headers"].get(b"content-disposition", b""))
+        part["wanted"] = options.get(b"name") == field_name.encode() and b"filename" in options
+        if part["wanted"]:
+            events.append(options[b"filename"].decode())
+
+    def on_part_data(data, start, end):
+        if part["wanted"]:
+            events.append(bytes(data[start:end]))
+
+    parser = MultipartParser(params[b"boundary"], callbacks={
+        "on_part_begin": on_part_begin,
+        "on_header_field": on_header_field,
+        "on_header_value": on_header_value,
+        "on_header_end": on_header_end,
+        "on_headers_finished": on_headers_finished,
+        "on_part_data": on_part_data,
+    })
+    async for chunk in request.stream():
+        parser.write(chunk)
+        for event in events:
+            yield event
+        events.clear()
+    parser.finalize()
+
+
+class _LineFeed:
+    """Line iterator for one long-lived ``csv.reader``, topped up as chunks arrive.
+
+    Remembers the lines taken for the record being parsed, so a record cut
+    short by the end of the buffered lines can be handed back and reparsed.
+    """
+
+    def __init__(self):
+        self.lines = deque()
+        self.record = []
+        self.ran_dry = False
+
+    def __iter__(self):
+        return self
+
+    def __next__(self):
+        if not self.lines:
+            self.ran_dry = True
+            raise StopIteration
+        line = self.lines.popleft()
+        self.record.append(line)
+        return line
+
+
+def _complete_rows(reader, feed: _LineFeed) -> Iterator[List[str]]:
+    while True:
+        feed.record.clear()
+        feed.ran_dry = False
+        row = next(reader, None)
+        if feed.ran_dry:
+            # Out of lines, possibly inside a quoted field: keep them for the next chunk
+            feed.lines.extendleft(reversed(feed.record))
+            return
+        yield row
+
+
+async def iter_csv_rows(chunks: AsyncIterator[bytes], encoding: str = "utf-8-sig") -> AsyncIterator[List[str]]:
+    """Decodes byte chunks incrementally and yields CSV rows as records complete.
+
+    Quoted fields may span lines and chunks.
+    """
+    decoder = codecs.getincrementaldecoder(encoding)()
+    feed = _LineFeed()
+    reader = csv.reader(feed)
+    pending = ""
+    async for chunk in chunks:
+        *lines, pending = (pending + decoder.decode(chunk)).split("\n")
+        feed.lines.extend(line + "\n" for line in lines)
+        for row in _complete_rows(reader, feed):
+            yield row
+    pending += decoder.decode(b"", final=True)
+    if pending:
+        feed.lines.append(pending)
+    for row in reader:
+        yield row
+
+
+class UploadStreamingResponse(StreamingResponse):
+    """StreamingResponse for bodies produced while the request is still uploading.
+
+    Starlette's StreamingResponse listens for ``http.disconnect`` on ASGI < 2.4
+    servers (uvicorn's HTTP protocols), and that listener swallows request body
+    messages; a disconnect surfaces as ClientDisconnect from the body instead.
+    """
+
+    async def __call__(self, scope, receive, send):
+        await self.stream_response(send)
+        if self.background is not None:
+            await self.background()
@@ -0,0 +1,107 @@
+"""The app against a real in-memory SQLite database, with per-request query budgets.
+
+``api`` serves requests from a fresh session per request on its own engine,
+authenticated as a seeded admin through the real ``get_current_user``, with the
+token, user and event response caches emptied. Every SQL statement the engine
+executes is recorded, so a request can declare how many it may issue::
+
+    def test_listing_is_one_query(api):
+        api.get("/events", params={"limit": 100}, budget=2)
+
+and fails with the statements listed when it issues more. ``db`` is a session
+on the same database, for seeding rows and calling ``crud`` directly; test
+modules seed what they need through it (or ``api.engine``) in their own fixtures.
+"""
+from contextlib import contextmanager, nullcontext
+from typing import List, Optional
+import pytest
+from fastapi.testclient import TestClient
+from sqlalchemy import create_engine, event, insert
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import StaticPool
+from app import auth
+from app.cache import event_responses
+from app.db import Base
+from app.dependency import get_db
+from app.main import app
+from app.models.model import User
+
+
+class QueryRecorder:
+    """Keeps every statement an engine sends to the database, via ``before_cursor_execute``."""
+
+    def __init__(self, engine):
+        self.statements: List[str] = []
+        event.listen(engine, "before_cursor_execute", self._record)
+
+    def _record(self, conn, cursor, statement, parameters, context, executemany):
+        self.statements.append(" ".join(statement.split()))
+
+    @contextmanager
+    def budget(self, limit: int, label: str = "block"):
+        """Fails the test if the enclosed code executes more than ``limit`` statements."""
+        start = len(self.statements)
+        yield
+        issued = self.statements[start:]
+        if len(issued) > limit:
+            listing = "\n".join(f"  {number}. {statement}" for number, statement in enumerate(issued, 1))
+            pytest.fail(f"{label} issued {len(issued)} queries, over its budget of {limit}:\n{listing}", pytrace=False)
+
+
+class BudgetedClient:
+    """``TestClient`` calls that take an optional ``budget`` of SQL statements for the request."""
+
+    def __init__(self, client: TestClient, engine, queries: QueryRecorder, session_factory):
+        self.client = client
+        self.engine = engine
+        self.queries = queries
+        self.session_factory = session_factory
+
+    def request(self, method: str, url: str, budget: Optional[int] = None, **kwargs):
+        with self.queries.budget(budget, f"{method} {url}") if budget is not None else nullcontext():
+            return self.client.request(method, url, **kwargs)
+
+    def get(self, url: str, **kwargs):
+        return self.request("GET", url, **kwargs)
+
+    def post(self, url: str, **kwargs):
+        return self.request("POST", url, **kwargs)
+
+    def put(self, url: str, **kwargs):
+        return self.request("PUT", url, **kwargs)
+
+
+@pytest.fixture
+def api():
+    engine = create_engine("sqlite://", poolclass=StaticPool, connect_args={"check_same_thread": False})
+    Base.metadata.create_all(bind=engine)
+    with engine.begin() as conn:
+        conn.execute(insert(User), [{"user_id": 1, "username": "admin", "email": "admin@example.com",
+                                     "hashed_password": "x", "role": "admin"}])
+    SessionLocal = sessionmaker(bind=engine, autoflush=False)
+
+    def get_test_db():
+        db = SessionLocal()
+        try:
+            yield db
+        finally:
+            db.close()
+
+    app.dependency_overrides[get_db] = get_test_db
+    auth.token_cache.clear()
+    auth.user_cache.clear()
+    event_responses.clear()
+    token = auth.create_access_token({"sub": "1"})
+    client = TestClient(app, headers={"Authorization": f"Bearer {token}"})
+    yield BudgetedClient(client, engine, QueryRecorder(engine), SessionLocal)
+    app.dependency_overrides.clear()
+    auth.user_cache.clear()
+    event_responses.clear()
+    engine.dispose()
+
+
+@pytest.fixture
+def db(api):
+    session = api.session_factory()
+    yield session
+    session.close()
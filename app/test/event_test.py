@@ -1,4 +1,5 @@
 import pytest
+from collections import namedtuple
 from fastapi.testclient import TestClient
 from unittest.mock import MagicMock
 from sqlalchemy.exc import IntegrityError
@@ -7,7 +8,10 @@ from app.models.model import Event, EventStatus
 from app.schema import AttendeeCreate, AttendeeResponse, EventResponse
 from app.auth import get_current_user
 from app.dependency import get_db
-from datetime import datetime
+from datetime import datetime, timedelta
+from sqlalchemy import insert
+from app.cache import ResponseCache, event_responses
+from app.views.event import MAX_PAGE_SIZE
 
 # ✅ Create FastAPI test client fixture
 @pytest.fixture
@@ -35,6 +39,13 @@ def override_get_db(mock_db):
 def set_db_dependency(override_get_db):
     app.dependency_overrides[get_db] = override_get_db
 
+# ✅ Start every test with an empty response cache
+@pytest.fixture(autouse=True)
+def clear_event_cache():
+    event_responses.clear()
+    yield
+    event_responses.clear()
+
 # ✅ Override authentication dependency
 @pytest.fixture
 def override_get_current_user():
@@ -159,6 +170,7 @@ def test_update_event_not_found(client, mock_db):
 # ✅ Test: List Events - No Events Found
 def test_list_events_not_found(client, mock_db):
     mock_query = MagicMock()
+    mock_query.filter.return_value = mock_query
     mock_query.offset.return_value = mock_query
     mock_query.limit.return_value = mock_query
     mock_query.all.return_value = []  # No events
@@ -196,9 +208,13 @@ def test_get_event(client, mock_db, event_id, exists, sample_event):
 )
 def test_list_events(client, mock_db, params, expected_count, sample_event):
     mock_query = MagicMock()
+    mock_query.filter.return_value = mock_query
     mock_query.offset.return_value = mock_query
     mock_query.limit.return_value = mock_query
-    mock_query.all.return_value = [sample_event] if expected_count > 0 else []
+    # The list endpoint selects EventResponse's columns as rows, not ORM objects
+    EventRow = namedtuple("EventRow", EventResponse.model_fields)
+    row = EventRow(**{field: getattr(sample_event, field) for field in EventRow._fields})
+    mock_query.all.return_value = [row] if expected_count > 0 else []
 
     mock_db.query.return_value = mock_query
 
@@ -210,6 +226,7 @@ def test_list_events(client, mock_db, params, expected_count, sample_event):
     else:
         assert response.status_code == 200
         assert len(response.json()) == expected_count
+        assert EventResponse.model_validate(response.json()[0]).event_id == row.event_id
         
 
 
@@ -226,3 +243,103 @@ def sample_event():
         status=EventStatus.scheduled
     )
 
+
+@pytest.fixture
+def seeded(api):
+    start = datetime(2030, 1, 1, 9, 0, 0)
+    # Shuffled ids, repeated start times and undated events exercise every keyset branch
+    with api.engine.begin() as conn:
+        conn.execute(insert(Event), [
+            {"event_id": event_id, "name": f"Event {event_id}", "location": "Paris" if event_id % 2 else "Rome",
+             "start_time": None if event_id in (4, 9) else start + timedelta(days=event_id % 3),
+             "end_time": None, "max_attendees": 10, "status": EventStatus.scheduled}
+            for event_id in [7, 3, 11, 1, 9, 5, 2, 8, 4, 10, 6]
+        ])
+    return api
+
+def _walk_pages(client, params):
+    pages, cursor = [], ""
+    while cursor is not None:
+        response = client.get("/events", params={**params, "cursor": cursor})
+        assert response.status_code == 200
+        body = response.json()
+        pages.append([event["event_id"] for event in body["events"]])
+        cursor = body["next_cursor"]
+    return pages
+
+def test_list_events_cursor_mode_walks_every_event_once(seeded):
+    pages = _walk_pages(seeded, {"limit": 3})
+    paris_pages = _walk_pages(seeded, {"limit": 2, "location": "Paris"})
+
+    assert pages == [[4, 9, 3], [6, 1, 7], [10, 2, 5], [8, 11]]
+    assert paris_pages == [[9, 3], [1, 7], [5, 11]]
+
+@pytest.mark.parametrize("params", [
+    {"limit": 0, "cursor": ""},
+    {"limit": -1, "cursor": ""},
+    {"limit": 0},
+    {"limit": MAX_PAGE_SIZE + 1},
+    {"skip": -1},
+])
+def test_list_events_rejects_out_of_range_paging(client, params):
+    assert client.get("/events", params=params).status_code == 400
+    assert client.get("/events/search", params={"q": "event", **params}).status_code == 400
+
+def test_list_events_rejects_invalid_cursor(client):
+    response = client.get("/events", params={"cursor": "not-a-cursor"})
+
+    assert response.status_code == 400
+    assert response.json()["detail"] == "Invalid cursor"
+
+def test_event_reads_revalidate_with_etags_without_querying(seeded):
+    detail = seeded.get("/events/3")
+    listing = seeded.get("/events", params={"location": "Paris", "limit": 2})
+    not_modified = seeded.get("/events/3", headers={"If-None-Match": detail.headers["etag"]}, budget=0)
+    list_not_modified = seeded.get("/events", params={"limit": 2, "location": "Paris"},
+                                   headers={"If-None-Match": f'W/{listing.headers["etag"]}'}, budget=0)
+    cached = seeded.get("/events/3", budget=0)
+
+    assert detail.status_code == 200 and detail.json()["event_id"] == 3
+    assert not_modified.status_code == 304 and not_modified.content == b""
+    assert not_modified.headers["etag"] == detail.headers["etag"]
+    assert list_not_modified.status_code == 304
+    assert cached.json() == detail.json()
+    assert event_responses.stats()["hits"] == 3
+
+def test_event_writes_invalidate_cached_reads(seeded):
+    detail = seeded.get("/events/3")
+    other = seeded.get("/events/5")
+    listing = seeded.get("/events", params={"location": "Paris"})
+
+    update_payload = {**detail.json(), "name": "Renamed", "description": None}
+    del update_payload["event_id"]
+    assert seeded.put("/events/3", json=update_payload).status_code == 200
+
+    refreshed = seeded.get("/events/3", headers={"If-None-Match": detail.headers["etag"]})
+    assert refreshed.status_code == 200 and refreshed.json()["name"] == "Renamed"
+    assert seeded.get("/events/5", headers={"If-None-Match": other.headers["etag"]}).status_code == 304
+    relisted = seeded.get("/events", params={"location": "Paris"}, headers={"If-None-Match": listing.headers["etag"]})
+    assert relisted.status_code == 200
+    assert "Renamed" in [e["name"] for e in relisted.json()]
+
+def test_response_cache_skips_fills_that_raced_an_invalidation():
+    cache = ResponseCache(maxsize=2, ttl=60)
+    generation = cache.generation
+    cache.invalidate("event:1")
+    cache.set(("event", 1), b"stale", ("event:1",), generation)
+    assert cache.get(("event", 1)) is None
+
+    for event_id in (1, 2, 3):
+        cache.set(("event", event_id), b"{}", (f"event:{event_id}",), cache.generation)
+    assert cache.get(("event", 1)) is None and len(cache) == 2
+
+def test_response_cache_entries_expire_after_ttl():
+    now = [0.0]
+    cache = ResponseCache(maxsize=2, ttl=30, clock=lambda: now[0])
+    cache.set(("event", 1), b"{}", ("event:1",), cache.generation)
+
+    now[0] = 29
+    assert cache.get(("event", 1)) is not None
+    now[0] = 30
+    assert cache.get(("event", 1)) is None
+    assert len(cache) == 0 and cache.stats()["misses"] == 1
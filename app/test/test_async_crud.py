@@ -0,0 +1,61 @@
+import pytest
+import pytest_asyncio
+from datetime import datetime
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
+from sqlalchemy.pool import StaticPool
+from app import async_crud
+from app.db import Base
+from app.models.model import EventStatus
+from app.schema import AttendeeCreate, EventCreate
+
+@pytest_asyncio.fixture
+async def async_db():
+    engine = create_async_engine("sqlite+aiosqlite://", poolclass=StaticPool)
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+    session_factory = async_sessionmaker(engine, class_=AsyncSession, expire_on_commit=False)
+    async with session_factory() as session:
+        yield session
+    await engine.dispose()
+
+@pytest.fixture
+def event_data():
+    return EventCreate(
+        name="Async Conference",
+        description="Runs on aiosqlite",
+        location="Berlin",
+        start_time=datetime(2030, 5, 1, 9, 0, 0),
+        end_time=datetime(2030, 5, 1, 17, 0, 0),
+        max_attendees=1,
+    )
+
+@pytest.mark.asyncio
+async def test_async_create_and_get_event(async_db, event_data):
+    created = await async_crud.create_event(async_db, event_data)
+
+    fetched = await async_crud.get_event(async_db, created.event_id)
+
+    assert fetched.name == "Async Conference"
+    assert fetched.status == EventStatus.scheduled
+    assert [e.event_id for e in await async_crud.get_events(async_db, location="Berlin")] == [created.event_id]
+
+@pytest.mark.asyncio
+async def test_async_register_and_check_in(async_db, event_data):
+    event = await async_crud.create_event(async_db, event_data)
+    attendee_data = AttendeeCreate(
+        first_name="Alice",
+        last_name="Smith",
+        email="alice.smith@example.com",
+        phone_number="9876543210",
+        event_id=event.event_id,
+    )
+
+    attendee, error = await async_crud.create_attendee(async_db, attendee_data)
+    _, full_error = await async_crud.create_attendee(
+        async_db, attendee_data.model_copy(update={"email": "bob@example.com"})
+    )
+    checked_in = await async_crud.check_in_attendee(async_db, attendee.attendee_id)
+
+    assert error is None
+    assert full_error == "Event is fully booked"
+    assert checked_in.check_in_status is True
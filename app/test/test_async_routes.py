@@ -0,0 +1,106 @@
+"""Routes served from ``AsyncSession``s: ``USE_ASYNC_DB`` with the real ``get_db``, never overridden.
+
+Settings and engines are fixed on first import, so ``test_routes_serve_async_sessions``
+reruns this module in a fresh interpreter with ``USE_ASYNC_DB=true`` and a SQLite
+file; the other tests only run there. To run them directly::
+
+    USE_ASYNC_DB=true DATABASE_URL=sqlite:///./async-test.sqlite PYTHONPATH=. pytest app/test/test_async_routes.py
+"""
+import csv
+import gzip
+import io
+import json
+import os
+import re
+import subprocess
+import sys
+import pytest
+from fastapi.testclient import TestClient
+from app import dependency, metrics
+from app.test.test_startup import ROOT
+from config import USE_ASYNC_DB
+
+on_async_sessions = pytest.mark.skipif(not USE_ASYNC_DB, reason="runs with USE_ASYNC_DB=true")
+
+def test_routes_serve_async_sessions(tmp_path):
+    if USE_ASYNC_DB:
+        pytest.skip("already running on async sessions")
+    env = {**os.environ, "USE_ASYNC_DB": "true", "DATABASE_URL": f"sqlite:///{tmp_path / 'events.sqlite'}",
+           "BCRYPT_ROUNDS": "4", "PYTHONPATH": ROOT}
+    env.pop("ASYNC_DATABASE_URL", None)
+    result = subprocess.run([sys.executable, "-m", "pytest", "-q", "-p", "no:cacheprovider", __file__],
+                            cwd=ROOT, env=env, capture_output=True, text=True, timeout=300)
+    assert result.returncode == 0, result.stdout + result.stderr
+    assert re.search(r"\b2 passed\b", result.stdout), result.stdout
+
+@pytest.fixture(scope="module")
+def client():
+    from app.main import create_app
+    from app.migrate import migrate
+    migrate()
+    # One client for the module, so the async engine's connections stay on one event loop
+    with TestClient(create_app()) as client:
+        credentials = {"username": "door", "email": "door@example.com", "password": "s3cret"}
+        assert client.post("/auth/register", json=credentials).status_code == 200
+        token = client.post("/auth/login", json={"email": credentials["email"], "password": "s3cret"}).json()["access_token"]
+        client.headers["Authorization"] = f"Bearer {token}"
+        yield client
+
+def _event(name, **fields):
+    return {"name": name, "description": "Served from an AsyncSession", "location": "Berlin",
+            "start_time": "2030-05-01T09:00:00", "end_time": "2030-05-01T17:00:00", "max_attendees": 3, **fields}
+
+@on_async_sessions
+def test_event_routes(client):
+    assert dependency.get_db is dependency.get_async_db
+    queries = metrics.db_query_seconds.count("async")
+
+    created = client.post("/events", json=_event("Async Summit")).json()
+    second = client.post("/events", json=_event("Async Workshop", start_time="2030-05-02T09:00:00")).json()
+    event_id = created["event_id"]
+    detail = client.get(f"/events/{event_id}")
+    revalidated = client.get(f"/events/{event_id}", headers={"If-None-Match": detail.headers["etag"]})
+    renamed = client.put(f"/events/{event_id}", json={**_event("Async Summit"), "name": "Async Summit 2030",
+                                                      "status": "scheduled"})
+
+    assert detail.status_code == 200 and detail.json() == created
+    assert revalidated.status_code == 304
+    assert renamed.json()["name"] == "Async Summit 2030"
+    assert [e["event_id"] for e in client.get("/events", params={"location": "Berlin"}).json()] == [event_id, second["event_id"]]
+    first_page = client.get("/events", params={"cursor": "", "limit": 1}).json()
+    last_page = client.get("/events", params={"cursor": first_page["next_cursor"], "limit": 1}).json()
+    assert [page["events"][0]["event_id"] for page in (first_page, last_page)] == [event_id, second["event_id"]]
+    assert [e["event_id"] for e in client.get("/events/search", params={"q": "async summit"}).json()] == [event_id]
+    assert client.get("/events/99").status_code == 404
+    assert client.get(f"/events/{event_id}/stats").json()["remaining_seats"] == 3
+    assert metrics.db_query_seconds.count("async") > queries
+
+@on_async_sessions
+def test_attendee_routes_and_streams(client):
+    event_id = client.post("/events", json=_event("Async Expo", max_attendees=4)).json()["event_id"]
+    guest = {"first_name": "Guest", "last_name": "Async", "phone_number": "1234567890", "event_id": event_id}
+
+    single = client.post("/attendees", json={**guest, "email": "one@example.com"})
+    report = client.post("/attendees/bulk", json=[{**guest, "email": f"{name}@example.com"}
+                                                  for name in ("two", "one", "three", "four", "five")]).json()
+    ids = [single.json()["attendee_id"]] + [row["attendee_id"] for row in report["results"] if row["attendee_id"]]
+    checked_in = client.put(f"/attendees/check-in/{ids[0]}")
+    progress = client.post("/attendees/bulk-check-in/",
+                           files={"file": ("scan.csv", f"{ids[1]}\n{ids[0]}\n999\n".encode(), "text/csv")})
+    listed = client.get(f"/attendees/{event_id}")
+    ndjson = client.get(f"/attendees/{event_id}", params={"format": "ndjson", "check_in_status": True})
+    exported = client.get(f"/events/{event_id}/attendees/export", params={"gzip": True})
+    events = client.get("/events/export", params={"format": "ndjson", "location": "Berlin"})
+
+    assert single.status_code == 200
+    assert [row["error"] for row in report["results"]] == [
+        None, "Attendee already registered with this email", None, None, "Event is fully booked"]
+    assert checked_in.json()["check_in_status"] is True
+    assert [json.loads(line) for line in progress.text.splitlines()] == [
+        {"batch": 1, "rows": 3, "updated": 1, "already_checked_in": 1, "unknown": 1, "done": True}]
+    assert [a["attendee_id"] for a in listed.json()] == ids
+    assert [json.loads(line)["attendee_id"] for line in ndjson.text.splitlines()] == ids[:2]
+    rows = list(csv.DictReader(io.StringIO(gzip.decompress(exported.content).decode())))
+    assert [int(row["attendee_id"]) for row in rows] == ids
+    assert event_id in [json.loads(line)["event_id"] for line in events.text.splitlines()]
+    assert client.get(f"/events/{event_id}/stats").json()["checked_in_count"] == 2
@@ -1,9 +1,17 @@
+import json
 import pytest
+from concurrent.futures import ThreadPoolExecutor
 from unittest.mock import MagicMock
+from sqlalchemy import create_engine, event
 from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import sessionmaker
+from app import async_crud
+from app.db import Base
+from app.streaming import iter_csv_rows
+from app.views import attendee as attendee_view
 from app.models.model import Event, EventStatus, Attendee
-from app.crud import create_attendee, check_in_attendee
-from app.schema import AttendeeCreate
+from app.crud import bulk_check_in, bulk_create_attendees, create_attendee, check_in_attendee
+from app.schema import AttendeeCreate, AttendeeResponse
 
 @pytest.fixture
 def mock_db():
@@ -36,8 +44,7 @@ def sample_attendee():
     )
 
 def test_register_attendee_success(mock_db, sample_event):
-    mock_db.query.return_value.filter.return_value.first.side_effect = [sample_event, None]
-    mock_db.query.return_value.filter.return_value.count.return_value = 1
+    mock_db.query.return_value.filter.return_value.update.return_value = 1
 
     attendee_data = AttendeeCreate(
         first_name="Alice",
@@ -54,8 +61,8 @@ def test_register_attendee_success(mock_db, sample_event):
     mock_db.commit.assert_called_once()
 
 def test_register_attendee_full_event(mock_db, sample_event):
-    mock_db.query.return_value.filter.return_value.first.side_effect = [sample_event, None]
-    mock_db.query.return_value.filter.return_value.count.return_value = 2
+    mock_db.query.return_value.filter.return_value.update.return_value = 0
+    mock_db.query.return_value.filter.return_value.first.return_value = sample_event
 
     attendee_data = AttendeeCreate(
         first_name="Alice",
@@ -69,9 +76,11 @@ def test_register_attendee_full_event(mock_db, sample_event):
 
     assert db_attendee is None
     assert error == "Event is fully booked"
+    mock_db.add.assert_not_called()
 
 def test_register_attendee_invalid_event(mock_db):
     event = Event(event_id=1, name="Test Event", status=EventStatus.canceled, max_attendees=5)
+    mock_db.query.return_value.filter.return_value.update.return_value = 0
     mock_db.query.return_value.filter.return_value.first.return_value = event
 
     attendee_data = AttendeeCreate(
@@ -102,3 +111,257 @@ def test_check_in_attendee_not_found(mock_db):
 
     assert checked_in_attendee is None
     mock_db.commit.assert_not_called()
+
+def test_concurrent_registrations_never_overbook(tmp_path):
+    engine = create_engine(f"sqlite:///{tmp_path / 'flash_sale.sqlite'}", connect_args={"timeout": 60})
+    Base.metadata.create_all(bind=engine)
+    SessionLocal = sessionmaker(bind=engine, autoflush=False)
+    with SessionLocal() as db:
+        db.add(Event(event_id=1, name="Flash Sale", location="Online", status=EventStatus.scheduled, max_attendees=100))
+        db.commit()
+
+    def register(i):
+        with SessionLocal() as db:
+            attendee = AttendeeCreate(
+                first_name="Fan",
+                last_name=str(i),
+                email=f"fan{i}@example.com",
+                phone_number="1234567890",
+                event_id=1
+            )
+            return create_attendee(db, attendee)
+
+    with ThreadPoolExecutor(max_workers=32) as pool:
+        results = list(pool.map(register, range(2000)))
+
+    errors = [error for _, error in results if error]
+    with SessionLocal() as db:
+        event = db.get(Event, 1)
+        stored = db.query(Attendee).filter(Attendee.event_id == 1).count()
+
+    assert sum(1 for attendee, _ in results if attendee) == 100
+    assert errors == ["Event is fully booked"] * 1900
+    assert event.registered_count == stored == 100
+    engine.dispose()
+
+@pytest.fixture
+def door_db(db):
+    db.add(Event(event_id=1, name="Door Test", location="Hall A", status=EventStatus.scheduled, max_attendees=10))
+    db.add_all(
+        Attendee(attendee_id=i, first_name="Guest", last_name=str(i), email=f"guest{i}@example.com",
+                 phone_number="1234567890", event_id=1, check_in_status=(i == 3))
+        for i in range(1, 6)
+    )
+    db.commit()
+    return db
+
+def test_list_attendees_matches_schema_serialization(api, door_db):
+    response = api.get("/attendees/1", params={"check_in_status": False})
+
+    expected = [AttendeeResponse.model_validate(a).model_dump(mode="json")
+                for a in door_db.query(Attendee).filter(Attendee.check_in_status.is_(False))]
+    assert response.status_code == 200
+    assert response.json() == expected and len(expected) == 4
+
+@pytest.mark.parametrize(
+    "params, expected_ids",
+    [
+        ({}, [1, 2, 3, 4, 5]),
+        ({"check_in_status": False}, [1, 2, 4, 5]),
+        ({"check_in_status": True}, [3]),
+        ({"after": 1, "limit": 3}, [2, 3, 4]),
+        ({"check_in_status": False, "after": 2, "limit": 2}, [4, 5]),
+    ],
+)
+def test_list_attendees_streams_filtered_pages_across_chunks(api, door_db, monkeypatch, params, expected_ids):
+    monkeypatch.setattr(attendee_view, "ATTENDEE_STREAM_CHUNK_SIZE", 2)
+
+    response = api.get("/attendees/1", params=params)
+    ndjson = api.get("/attendees/1", params={**params, "format": "ndjson"})
+
+    assert response.status_code == 200
+    assert [a["attendee_id"] for a in response.json()] == expected_ids
+    assert ndjson.headers["content-type"] == "application/x-ndjson"
+    assert [json.loads(line) for line in ndjson.text.splitlines()] == response.json()
+
+def test_list_attendees_returns_404_when_nothing_matches(api, door_db):
+    response = api.get("/attendees/1", params={"after": 5})
+
+    assert response.status_code == 404
+    assert response.json()["detail"] == "No attendees found"
+
+@pytest.mark.asyncio
+async def test_stream_attendees_fetches_in_bounded_chunks(door_db):
+    chunks = [chunk async for chunk in async_crud.stream_attendees(door_db, 1, chunk_size=2)]
+
+    assert [len(chunk) for chunk in chunks] == [2, 2, 1]
+    assert [row.Attendee.attendee_id for chunk in chunks for row in chunk] == [1, 2, 3, 4, 5]
+
+def _guest(email, event_id=2, **overrides):
+    return {"first_name": "Guest", "last_name": "Bulk", "email": email,
+            "phone_number": "1234567890", "event_id": event_id, **overrides}
+
+def test_bulk_register_reports_every_row(api, door_db):
+    door_db.add_all([
+        Event(event_id=2, name="Sponsor Day", location="Hall B", status=EventStatus.scheduled, max_attendees=3),
+        Event(event_id=3, name="Last Year", location="Hall C", status=EventStatus.completed, max_attendees=3),
+    ])
+    door_db.commit()
+    payload = [
+        _guest("a@example.com"),
+        _guest("b@example.com"),
+        _guest("a@example.com"),
+        _guest("guest1@example.com"),
+        _guest("not-an-email"),
+        _guest("c@example.com", event_id=3),
+        _guest("d@example.com", event_id=99),
+        _guest("e@example.com"),
+        _guest("f@example.com"),
+    ]
+
+    response = api.post("/attendees/bulk", json=payload)
+
+    report = response.json()
+    errors = [row["error"] for row in report["results"]]
+    assert response.status_code == 200
+    assert (report["registered"], report["failed"]) == (3, 6)
+    assert [row["row"] for row in report["results"]] == list(range(1, 10))
+    assert errors[:4] == [None, None, "Duplicate email in this upload", "Attendee already registered with this email"]
+    assert errors[4].startswith("email: value is not a valid email address")
+    assert errors[5:] == ["Event not available for registration", "Event not available for registration",
+                          None, "Event is fully booked"]
+    stored = door_db.query(Attendee.attendee_id, Attendee.email).filter(Attendee.event_id == 2).all()
+    assert {row["attendee_id"] for row in report["results"] if row["attendee_id"]} == {row[0] for row in stored}
+    assert door_db.get(Event, 2).registered_count == 3
+
+@pytest.mark.parametrize("returning", [True, False])
+def test_bulk_create_attendees_in_chunks(api, door_db, monkeypatch, returning):
+    monkeypatch.setattr("app.crud.BULK_REGISTRATION_CHUNK_SIZE", 2)
+    monkeypatch.setattr(door_db.get_bind().dialect, "insert_executemany_returning", returning)
+    guests = [AttendeeCreate(**_guest(f"chunk{i}@example.com", event_id=1)) for i in range(7)]
+    issued = len(api.queries.statements)
+
+    results = bulk_create_attendees(door_db, guests)
+
+    inserts = [statement for statement in api.queries.statements[issued:] if statement.startswith("INSERT INTO attendees")]
+    # Without RETURNING, each chunk's ids are looked up by email after the insert
+    assert all(("RETURNING" in statement) == returning for statement in inserts) and inserts
+    lookups = [statement for statement in api.queries.statements[issued:] if statement.startswith("SELECT attendees.email FROM")]
+    assert len(lookups) == 4
+
+    stored = dict(door_db.query(Attendee.email, Attendee.attendee_id).filter(Attendee.email.like("chunk%")).all())
+    assert results == [(stored[guest.email], None) for guest in guests]
+    assert door_db.get(Event, 1).registered_count == 7
+
+def test_bulk_create_attendees_lets_a_rejected_rows_email_through_later(door_db):
+    door_db.add(Event(event_id=4, name="Sold Out", location="Hall D", status=EventStatus.scheduled, max_attendees=0))
+    door_db.commit()
+    retries = [AttendeeCreate(**_guest("retry@example.com", event_id=event_id)) for event_id in (99, 4, 1, 1)]
+
+    results = bulk_create_attendees(door_db, retries)
+
+    assert [error for _, error in results] == ["Event not available for registration", "Event is fully booked",
+                                               None, "Duplicate email in this upload"]
+    assert door_db.query(Attendee.attendee_id).filter(Attendee.email == "retry@example.com").all() == [(results[2][0],)]
+
+def test_bulk_register_accepts_csv_uploads(api, door_db):
+    body = (b"first_name,last_name,email,phone_number,event_id\n"
+            b"Ada,Lovelace,ada@example.com,1234567890,1\n\n"
+            b"Alan,Turing,alan@example.com,1234567890,x\n")
+
+    uploaded = api.post("/attendees/bulk", files={"file": ("sponsor.csv", body, "text/csv")})
+    raw = api.post("/attendees/bulk", content=body.replace(b"ada@", b"ada2@"), headers={"content-type": "text/csv"})
+    unsupported = api.post("/attendees/bulk", content=b"<xml/>", headers={"content-type": "application/xml"})
+
+    for response in (uploaded, raw):
+        assert response.status_code == 200
+        assert response.json()["registered"] == 1
+        assert response.json()["results"][1]["error"].startswith("event_id: Input should be a valid integer")
+    assert unsupported.status_code == 415
+
+@pytest.mark.parametrize("returning", [True, False])
+def test_bulk_check_in_reports_counts(door_db, monkeypatch, returning):
+    monkeypatch.setattr(door_db.get_bind().dialect, "update_returning", returning)
+
+    checked_in, already_checked_in, unknown = bulk_check_in(door_db, [1, 2, 2, 3, 99, 100])
+
+    assert sorted(a.attendee_id for a in checked_in) == [1, 2]
+    assert all(a.check_in_status for a in checked_in)
+    assert (already_checked_in, unknown) == (1, 2)
+    stored = door_db.query(Attendee.attendee_id).filter(Attendee.check_in_status.is_(True)).all()
+    assert sorted(row[0] for row in stored) == [1, 2, 3]
+
+def test_bulk_check_in_does_not_count_a_racing_check_in(tmp_path, monkeypatch):
+    engine = create_engine(f"sqlite:///{tmp_path / 'door.sqlite'}")
+    Base.metadata.create_all(bind=engine)
+    SessionLocal = sessionmaker(bind=engine, autoflush=False)
+    with SessionLocal() as db:
+        db.add(Event(event_id=1, name="Door Test", location="Hall A", status=EventStatus.scheduled, max_attendees=10))
+        db.add_all(Attendee(attendee_id=i, first_name="Guest", last_name=str(i), email=f"guest{i}@example.com",
+                            phone_number="1234567890", event_id=1) for i in (1, 2))
+        db.commit()
+    monkeypatch.setattr(engine.dialect, "update_returning", False)
+    published = []
+    monkeypatch.setattr("app.crud.publish_check_ins", lambda attendees: published.extend(a.attendee_id for a in attendees))
+    raced = False
+
+    @event.listens_for(engine, "before_cursor_execute")
+    def check_in_at_another_door(conn, cursor, statement, *args):
+        # Attendee 2 is checked in and committed between bulk_check_in's SELECT and its UPDATE
+        nonlocal raced
+        if statement.startswith("UPDATE attendees") and not raced:
+            raced = True
+            with SessionLocal() as other:
+                check_in_attendee(other, 2)
+
+    with SessionLocal() as db:
+        checked_in, already_checked_in, unknown = bulk_check_in(db, [1, 2])
+
+        assert [a.attendee_id for a in checked_in] == [1]
+        assert (already_checked_in, unknown) == (1, 0)
+        assert published == [2, 1]
+        assert db.get(Event, 1).checked_in_count == 2
+    engine.dispose()
+
+def test_bulk_check_in_streams_progress_per_batch(api, door_db, monkeypatch):
+    monkeypatch.setattr(attendee_view, "CHECK_IN_BATCH_SIZE", 2)
+    csv_body = "\ufeff1\r\n 2\nnot-an-id\n3\n\n42\n5".encode("utf-8")
+
+    response = api.post("/attendees/bulk-check-in/", files={"file": ("scan.csv", csv_body, "text/csv")})
+
+    lines = [json.loads(line) for line in response.text.splitlines()]
+    assert response.status_code == 200
+    assert response.headers["content-type"] == "application/x-ndjson"
+    assert [line["rows"] for line in lines] == [2, 4, 5]
+    assert [line["done"] for line in lines] == [False, False, True]
+    assert lines[-1] == {"batch": 3, "rows": 5, "updated": 3, "already_checked_in": 1, "unknown": 1, "done": True}
+
+def test_bulk_check_in_rejects_csv_without_ids(api, door_db):
+    response = api.post("/attendees/bulk-check-in/", files={"file": ("scan.csv", b"id\nabc\n", "text/csv")})
+
+    assert response.status_code == 400
+    assert response.json()["detail"] == "Invalid or empty CSV file"
+
+@pytest.mark.asyncio
+async def test_iter_csv_rows_handles_lines_split_across_chunks():
+    body = "\ufeff12,a\r\n345\n\u00e96\n7".encode("utf-8")
+
+    async def chunks():
+        for i in range(0, len(body), 3):
+            yield body[i:i + 3]
+
+    rows = [row async for row in iter_csv_rows(chunks())]
+
+    assert rows == [["12", "a"], ["345"], ["\u00e96"], ["7"]]
+
+@pytest.mark.asyncio
+async def test_iter_csv_rows_keeps_quoted_newlines():
+    body = b'id,note\r\n1,"two\r\nline"\n2,"split\nacross, chunks"\n3,\n'
+
+    async def chunks():
+        for i in range(0, len(body), 4):
+            yield body[i:i + 4]
+
+    rows = [row async for row in iter_csv_rows(chunks())]
+
+    assert rows == [["id", "note"], ["1", "two\r\nline"], ["2", "split\nacross, chunks"], ["3", ""]]
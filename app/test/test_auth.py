@@ -0,0 +1,113 @@
+import pytest
+import threading
+from datetime import timedelta
+from fastapi import HTTPException
+from sqlalchemy import create_engine, event
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import StaticPool
+from passlib.context import CryptContext
+from app import async_crud, auth
+from app.cache import TTLCache
+from app.db import Base
+from app.models.model import User
+
+@pytest.fixture
+def user_db():
+    engine = create_engine("sqlite://", poolclass=StaticPool)
+    Base.metadata.create_all(bind=engine)
+    statements = []
+    event.listen(engine, "before_cursor_execute", lambda *args: statements.append(args[2]))
+    SessionLocal = sessionmaker(bind=engine, autoflush=False)
+    with SessionLocal() as db:
+        db.add(User(user_id=1, username="alice", email="alice@example.com", hashed_password="x"))
+        db.commit()
+    auth.token_cache.clear()
+    auth.user_cache.clear()
+    yield SessionLocal, statements
+    auth.token_cache.clear()
+    auth.user_cache.clear()
+    engine.dispose()
+
+@pytest.mark.asyncio
+async def test_get_current_user_serves_warm_requests_without_queries(user_db):
+    SessionLocal, statements = user_db
+    token = auth.create_access_token({"sub": "1"})
+    # The counters are process-wide, so compare against what earlier tests left
+    token_hits, user_hits, user_misses = auth.token_cache.hits, auth.user_cache.hits, auth.user_cache.misses
+    with SessionLocal() as db:
+        await auth.get_current_user(token, db)
+
+    statements.clear()
+    with SessionLocal() as db:
+        user = await auth.get_current_user(token, db)
+        assert user.username == "alice"
+        assert user in db
+
+    assert statements == []
+    assert auth.token_cache.hits == token_hits + 1
+    assert (auth.user_cache.hits, auth.user_cache.misses) == (user_hits + 1, user_misses + 1)
+
+@pytest.mark.asyncio
+async def test_get_current_user_sees_user_changes(user_db):
+    SessionLocal, _ = user_db
+    token = auth.create_access_token({"sub": "1"})
+    with SessionLocal() as db:
+        await auth.get_current_user(token, db)
+
+    with SessionLocal() as db:
+        db.get(User, 1).role = "admin"
+        db.commit()
+    with SessionLocal() as db:
+        assert (await auth.get_current_user(token, db)).role == "admin"
+
+    with SessionLocal() as db:
+        db.delete(db.get(User, 1))
+        db.commit()
+    with SessionLocal() as db, pytest.raises(HTTPException) as exc:
+        await auth.get_current_user(token, db)
+    assert exc.value.status_code == 401
+
+@pytest.mark.asyncio
+async def test_expired_token_is_not_served_from_cache(user_db):
+    SessionLocal, _ = user_db
+    token = auth.create_access_token({"sub": "1"}, expires_delta=timedelta(seconds=-1))
+
+    with SessionLocal() as db, pytest.raises(HTTPException):
+        await auth.get_current_user(token, db)
+    assert len(auth.token_cache) == 0
+
+@pytest.mark.asyncio
+async def test_authenticate_user_hashes_off_the_event_loop_and_rehashes_on_cost_change(user_db, monkeypatch):
+    SessionLocal, _ = user_db
+    monkeypatch.setattr(auth, "pwd_context", CryptContext(schemes=["bcrypt"], bcrypt__rounds=4))
+    with SessionLocal() as db:
+        db.get(User, 1).hashed_password = await auth.get_password_hash_async("s3cret")
+        db.commit()
+
+    context = CryptContext(schemes=["bcrypt"], bcrypt__rounds=5)
+    threads = []
+    verify_and_update = context.verify_and_update
+    context.verify_and_update = lambda *args: threads.append(threading.current_thread().name) or verify_and_update(*args)
+    monkeypatch.setattr(auth, "pwd_context", context)
+    with SessionLocal() as db:
+        assert await async_crud.authenticate_user(db, "alice@example.com", "wrong") is None
+        user = await async_crud.authenticate_user(db, "alice@example.com", "s3cret")
+        assert user.user_id == 1
+
+    assert all(name.startswith("password-hash") for name in threads) and len(threads) == 2
+    with SessionLocal() as db:
+        assert db.get(User, 1).hashed_password.startswith("$2b$05$")
+
+def test_ttl_cache_expires_and_evicts_least_recently_used():
+    now = [0.0]
+    cache = TTLCache(maxsize=2, ttl=10, clock=lambda: now[0])
+    cache.set("a", 1)
+    cache.set("b", 2)
+    cache.get("a")
+    cache.set("c", 3)
+
+    assert cache.get("b") is None
+    assert cache.get("a") == 1
+    now[0] = 10
+    assert cache.get("a") is None
+    assert cache.stats() == {"size": 1, "maxsize": 2, "hits": 2, "misses": 2, "evictions": 1, "hit_ratio": 0.5}
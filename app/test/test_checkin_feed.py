@@ -0,0 +1,106 @@
+import asyncio
+import json
+import pytest
+from sqlalchemy import insert
+from app import auth, crud
+from app.broadcast import BroadcastHub, checkin_hub
+from app.main import app
+from app.models.model import Attendee, Event, EventStatus
+
+SUBSCRIBERS = 1000
+CHECK_INS = 10_000
+
+@pytest.fixture
+def arena(api):
+    with api.engine.begin() as conn:
+        conn.execute(insert(Event), [{"event_id": 1, "name": "Arena", "location": "Oslo", "max_attendees": CHECK_INS,
+                                      "status": EventStatus.ongoing}])
+        conn.execute(insert(Attendee), [
+            {"attendee_id": i, "first_name": "Guest", "last_name": str(i), "email": f"guest{i}@example.com",
+             "phone_number": "1234567890", "event_id": 1, "check_in_status": False}
+            for i in range(1, CHECK_INS + 1)
+        ])
+    return api
+
+class FeedClient:
+    """Drives the app's WebSocket endpoint directly over ASGI, without a network or thread per client."""
+
+    def __init__(self, path: str, query: str = ""):
+        self.scope = {
+            "type": "websocket", "asgi": {"version": "3.0"}, "scheme": "ws", "path": path, "raw_path": path.encode(),
+            "root_path": "", "query_string": query.encode(), "headers": [(b"host", b"test")],
+            "server": ("test", 80), "client": ("test", 1), "subprotocols": [],
+        }
+        self.inbox = asyncio.Queue()
+        self.accepted = asyncio.Event()
+        self.closed_with = None
+        self.first_frame = None
+        self.received = 0
+
+    async def connect(self):
+        self.inbox.put_nowait({"type": "websocket.connect"})
+        self.task = asyncio.create_task(app(self.scope, self.inbox.get, self.send))
+        accepted = asyncio.ensure_future(self.accepted.wait())
+        await asyncio.wait((accepted, self.task), return_when=asyncio.FIRST_COMPLETED)
+        accepted.cancel()
+
+    async def send(self, message):
+        if message["type"] == "websocket.accept":
+            self.accepted.set()
+        elif message["type"] == "websocket.send":
+            # Counting keys keeps 1,000 clients cheap; the first frame is decoded in full
+            self.first_frame = self.first_frame or message["text"]
+            self.received += message["text"].count('"attendee_id"')
+        elif message["type"] == "websocket.close":
+            self.closed_with = message["code"]
+
+    async def disconnect(self):
+        self.inbox.put_nowait({"type": "websocket.disconnect", "code": 1000})
+        await self.task
+
+@pytest.mark.asyncio
+async def test_a_thousand_subscribers_receive_a_burst_of_check_ins(arena, db):
+    token = auth.create_access_token({"sub": "1"})
+    clients = [FeedClient("/ws/events/1/checkins", f"token={token}") for _ in range(SUBSCRIBERS)]
+    for client in clients:
+        await client.connect()
+    assert all(client.accepted.is_set() for client in clients)
+    assert checkin_hub.stats()["subscribers"] == SUBSCRIBERS
+
+    checked_in, _, _ = crud.bulk_check_in(db, list(range(1, CHECK_INS + 1)))
+    assert len(checked_in) == CHECK_INS
+    for _ in range(1000):
+        if all(client.received == CHECK_INS for client in clients):
+            break
+        await asyncio.sleep(0.01)
+
+    assert [client.received for client in clients] == [CHECK_INS] * SUBSCRIBERS
+    first_frame = json.loads(clients[0].first_frame)
+    assert first_frame["event_id"] == 1
+    assert first_frame["check_ins"][0] == {"attendee_id": 1, "first_name": "Guest", "last_name": "1"}
+    for client in clients:
+        await client.disconnect()
+    assert checkin_hub.stats()["subscribers"] == 0
+
+@pytest.mark.asyncio
+async def test_feed_rejects_missing_or_invalid_tokens_and_unknown_events(arena):
+    token = auth.create_access_token({"sub": "1"})
+    for query, path in (("", "/ws/events/1/checkins"), ("token=bogus", "/ws/events/1/checkins"),
+                        (f"token={token}", "/ws/events/99/checkins")):
+        client = FeedClient(path, query)
+        await client.connect()
+        await client.task
+        assert not client.accepted.is_set()
+        assert client.closed_with == 1008
+
+@pytest.mark.asyncio
+async def test_slow_subscriber_is_dropped_without_blocking_others():
+    hub = BroadcastHub(maxsize=2)
+    slow, fast = hub.subscribe(1), hub.subscribe(1)
+
+    for i in range(3):
+        hub.publish(1, i)
+        assert await fast.get() == i
+
+    assert await slow.get() is None
+    assert hub.stats() == {"subscribers": 1, "published": 3, "delivered": 5, "dropped": 1}
@@ -0,0 +1,46 @@
+import pytest
+from sqlalchemy import create_engine, text
+from sqlalchemy.ext.asyncio import create_async_engine
+from app.db import apply_sqlite_pragmas, engine_options
+from config import Settings
+
+PRAGMAS = ("journal_mode", "synchronous", "mmap_size", "busy_timeout", "cache_size")
+
+def read_pragmas(conn):
+    return {name: conn.execute(text(f"PRAGMA {name}")).scalar() for name in PRAGMAS}
+
+def test_tuned_profile_applies_sqlite_pragmas_on_connect(tmp_path):
+    engine = create_engine(f"sqlite:///{tmp_path / 'tuned.sqlite'}")
+    apply_sqlite_pragmas(engine, Settings(db_engine_profile="tuned", sqlite_busy_timeout_ms=2500))
+
+    with engine.connect() as conn:
+        # synchronous=NORMAL reads back as 1
+        assert read_pragmas(conn) == {"journal_mode": "wal", "synchronous": 1, "mmap_size": 268435456,
+                                      "busy_timeout": 2500, "cache_size": -65536}
+    engine.dispose()
+
+def test_default_profile_leaves_sqlite_untouched(tmp_path):
+    engine = create_engine(f"sqlite:///{tmp_path / 'default.sqlite'}")
+    apply_sqlite_pragmas(engine, Settings(db_engine_profile="default"))
+
+    with engine.connect() as conn:
+        assert read_pragmas(conn)["journal_mode"] == "delete"
+    engine.dispose()
+
+@pytest.mark.asyncio
+async def test_tuned_profile_applies_to_the_async_engine(tmp_path):
+    engine = create_async_engine(f"sqlite+aiosqlite:///{tmp_path / 'async.sqlite'}")
+    apply_sqlite_pragmas(engine.sync_engine, Settings(db_engine_profile="tuned"))
+
+    async with engine.connect() as conn:
+        assert (await conn.execute(text("PRAGMA journal_mode"))).scalar() == "wal"
+    await engine.dispose()
+
+def test_engine_options_tune_the_postgres_pool_only():
+    tuned = Settings(db_engine_profile="tuned", db_pool_size=5, db_pool_timeout=3)
+    postgres = "postgresql+asyncpg://user:secret@db/events"
+
+    assert engine_options(postgres, tuned) == {"pool_timeout": 3, "pool_size": 5, "max_overflow": 20,
+                                               "pool_pre_ping": True, "pool_recycle": 1800}
+    assert engine_options("sqlite:///./eventdb.sqlite", tuned) == {"pool_timeout": 3}
+    assert engine_options(postgres, Settings(db_engine_profile="default")) == {}
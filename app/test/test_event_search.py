@@ -0,0 +1,63 @@
+from datetime import datetime
+import pytest
+from sqlalchemy import insert, update
+from app.models.model import Event, EventStatus
+
+EVENTS = [
+    (1, "Python Meetup", "Monthly talks", "Oslo", "2031-01-10", EventStatus.scheduled),
+    (2, "Data Summit", "Workshops on Python and pandas", "Rome", "2031-02-10", EventStatus.scheduled),
+    (3, "Café Crème", None, "Pythonville", "2031-03-10", EventStatus.completed),
+    (4, "Rust Conference", "Systems programming", "Oslo", "2031-04-10", EventStatus.scheduled),
+]
+
+@pytest.fixture
+def searchable(api):
+    with api.engine.begin() as conn:
+        conn.execute(insert(Event), [
+            {"event_id": event_id, "name": name, "description": description, "location": location,
+             "start_time": datetime.fromisoformat(start), "end_time": datetime.fromisoformat(start).replace(hour=6),
+             "max_attendees": 10, "status": status}
+            for event_id, name, description, location, start, status in EVENTS
+        ])
+    return api
+
+def ids(response):
+    assert response.status_code == 200, response.text
+    return [event["event_id"] for event in response.json()]
+
+def test_matches_word_prefixes_ranked_by_field(searchable):
+    # Name, then location, then description
+    assert ids(searchable.get("/events/search", params={"q": "pyth"})) == [1, 3, 2]
+    assert ids(searchable.get("/events/search", params={"q": "oslo PYTHON"})) == [1]
+    assert ids(searchable.get("/events/search", params={"q": "cafe"})) == [3]
+    assert ids(searchable.get("/events/search", params={"q": "kotlin"})) == []
+    assert ids(searchable.get("/events/search", params={"q": "pyth", "skip": 1, "limit": 1})) == [3]
+
+def test_combines_with_status_location_and_date_filters(searchable):
+    assert ids(searchable.get("/events/search", params={"q": "pyth", "status": "scheduled"})) == [1, 2]
+    assert ids(searchable.get("/events/search", params={"q": "pyth", "start_date": "2031-02-01"})) == [3, 2]
+    assert ids(searchable.get("/events/search", params={"q": "pyth", "end_date": "2031-02-28"})) == [1, 2]
+    assert ids(searchable.get("/events/search", params={"q": "o", "location": "Oslo"})) == [1, 4]
+
+def test_created_and_updated_events_are_searchable_at_once(searchable):
+    created = searchable.post("/events", json={"name": "Kotlin Night", "location": "Riga", "max_attendees": 5,
+                                              "start_time": "2031-05-01T18:00:00"})
+    event_id = created.json()["event_id"]
+    assert ids(searchable.get("/events/search", params={"q": "kotlin"})) == [event_id]
+
+    updated = searchable.put(f"/events/{event_id}", json={**created.json(), "name": "Scala Night"})
+    assert updated.status_code == 200, updated.text
+    assert ids(searchable.get("/events/search", params={"q": "kotlin"})) == []
+    assert ids(searchable.get("/events/search", params={"q": "scala riga"})) == [event_id]
+
+    # Status transitions and counters leave the index alone
+    with searchable.engine.begin() as conn:
+        conn.execute(update(Event).values(status=EventStatus.ongoing, registered_count=3))
+    assert ids(searchable.get("/events/search", params={"q": "scala", "status": "ongoing"})) == [event_id]
+
+def test_query_syntax_is_searched_for_not_interpreted(searchable):
+    assert ids(searchable.get("/events/search", params={"q": 'rust" OR NEAR(python'})) == []
+    assert ids(searchable.get("/events/search", params={"q": "rust*:conference"})) == [4]
+    response = searchable.get("/events/search", params={"q": " ?! "})
+    assert response.status_code == 400
+    assert response.json()["detail"] == "Search for at least one word"
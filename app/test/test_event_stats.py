@@ -0,0 +1,38 @@
+import pytest
+from sqlalchemy import update
+from app import crud
+from app.models.model import Event, EventStatus
+from app.schema import AttendeeCreate
+
+@pytest.fixture
+def attendance(db):
+    db.add_all([
+        Event(event_id=1, name="Expo", location="Oslo", max_attendees=5, status=EventStatus.scheduled),
+        Event(event_id=2, name="Summit", location="Rome", max_attendees=3, status=EventStatus.scheduled),
+    ])
+    db.commit()
+    for i in range(1, 5):
+        crud.create_attendee(db, AttendeeCreate(first_name="Guest", last_name=str(i), email=f"guest{i}@example.com",
+                                                phone_number="1234567890", event_id=1 if i < 4 else 2))
+    return db
+
+def test_check_ins_update_the_event_counters(api, attendance):
+    crud.check_in_attendee(attendance, 1)
+    crud.check_in_attendee(attendance, 1)
+    crud.bulk_check_in(attendance, [1, 2, 4, 99])
+
+    assert api.get("/events/1/stats").json() == {
+        "event_id": 1, "max_attendees": 5, "registered_count": 3, "checked_in_count": 2, "remaining_seats": 2
+    }
+    assert [stats["checked_in_count"] for stats in api.get("/events/stats", params={"event_ids": [2, 1, 99]}).json()] == [2, 1]
+    assert api.get("/events/99/stats").status_code == 404
+    assert api.get("/events/stats").status_code == 400
+
+def test_reconcile_event_counters_repairs_drift(api, attendance):
+    crud.check_in_attendee(attendance, 2)
+    with api.engine.begin() as conn:
+        conn.execute(update(Event).where(Event.event_id == 2).values(registered_count=0, checked_in_count=7))
+
+    assert crud.reconcile_event_counters(attendance) == [2]
+    assert [tuple(row) for row in crud.get_event_stats(attendance, [1, 2])] == [(1, 5, 3, 1), (2, 3, 1, 0)]
+    assert crud.reconcile_event_counters(attendance) == []
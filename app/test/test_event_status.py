@@ -0,0 +1,82 @@
+import time
+import pytest
+from datetime import datetime, timedelta
+from sqlalchemy import select
+from app import crud, event_status
+from app.event_status import EventStatusScheduler, utcnow
+from app.models.model import Event, EventStatus
+from app.cache import event_responses
+from app.schema import EventCreate, EventUpdate
+from config import STATUS_RESYNC_SECONDS
+
+NOW = datetime(2030, 6, 1, 12, 0)
+
+def add_event(SessionLocal, event_id, status, start_time, end_time):
+    with SessionLocal() as db:
+        db.add(Event(event_id=event_id, name=f"Event {event_id}", location="Hall", max_attendees=10,
+                     start_time=start_time, end_time=end_time, status=status))
+        db.commit()
+
+def statuses(SessionLocal):
+    with SessionLocal() as db:
+        return dict(db.execute(select(Event.event_id, Event.status)).all())
+
+def test_run_due_moves_events_forward_in_batches(api):
+    SessionLocal = api.session_factory
+    hour = timedelta(hours=1)
+    add_event(SessionLocal, 1, EventStatus.scheduled, NOW - hour, NOW + hour)       # → ongoing
+    add_event(SessionLocal, 2, EventStatus.scheduled, NOW - 2 * hour, NOW - hour)   # → completed
+    add_event(SessionLocal, 3, EventStatus.ongoing, NOW - 2 * hour, NOW - hour)     # → completed
+    add_event(SessionLocal, 4, EventStatus.canceled, NOW - 2 * hour, NOW - hour)    # never moves
+    add_event(SessionLocal, 5, EventStatus.scheduled, NOW + hour, NOW + 2 * hour)   # not yet due
+    scheduler = EventStatusScheduler(SessionLocal, batch_size=2)
+    scheduler.resync()
+    issued = len(api.queries.statements)
+
+    assert scheduler.run_due(NOW) == 3
+
+    assert statuses(SessionLocal) == {1: EventStatus.ongoing, 2: EventStatus.completed, 3: EventStatus.completed,
+                                      4: EventStatus.canceled, 5: EventStatus.scheduled}
+    # Two batches of due events, one UPDATE per (from, to) move within a batch
+    assert sum(statement.startswith("UPDATE") for statement in api.queries.statements[issued:]) == 3
+    # Event 1 is re-armed for its end_time, ahead of event 5's start
+    assert scheduler.next_deadline() == NOW + hour
+    assert scheduler.run_due(NOW + hour) == 2
+    assert statuses(SessionLocal)[1] == EventStatus.completed
+    assert statuses(SessionLocal)[5] == EventStatus.ongoing
+
+def test_scheduler_wakes_at_a_deadline_rearmed_by_update_event(api, monkeypatch):
+    SessionLocal = api.session_factory
+    add_event(SessionLocal, 1, EventStatus.scheduled, utcnow() + timedelta(days=1), None)
+    scheduler = EventStatusScheduler(SessionLocal)
+    monkeypatch.setattr(event_status, "status_scheduler", scheduler)
+    scheduler.start()
+    try:
+        with SessionLocal() as db:
+            start_time = utcnow() + timedelta(milliseconds=200)
+            crud.update_event(db, 1, EventUpdate.model_construct(start_time=start_time))
+        assert scheduler.next_deadline() == start_time
+
+        deadline = time.monotonic() + 5
+        while statuses(SessionLocal)[1] != EventStatus.ongoing and time.monotonic() < deadline:
+            time.sleep(0.05)
+    finally:
+        scheduler.stop()
+
+    assert statuses(SessionLocal)[1] == EventStatus.ongoing
+    assert scheduler.next_deadline() is None
+
+def test_writes_outside_the_leader_store_transitions_already_due(api):
+    # The scheduler isn't running here, as in a follower worker: it would only hear of these at a resync
+    SessionLocal = api.session_factory
+    hour = timedelta(hours=1)
+    with SessionLocal() as db:
+        crud.create_event(db, EventCreate(name="Started", location="Hall", max_attendees=10,
+                                          start_time=utcnow() - hour, end_time=utcnow() + hour))
+        crud.create_event(db, EventCreate(name="Later", location="Hall", max_attendees=10,
+                                          start_time=utcnow() + hour, end_time=utcnow() + 2 * hour))
+        crud.update_event(db, 2, EventUpdate.model_construct(end_time=utcnow() - hour))
+
+    assert statuses(SessionLocal) == {1: EventStatus.ongoing, 2: EventStatus.completed}
+    # Transitions the leader applies later reach other workers' cached responses within a resync
+    assert event_responses.ttl <= STATUS_RESYNC_SECONDS
@@ -0,0 +1,63 @@
+import asyncio
+import pytest
+from sqlalchemy import create_engine
+from app.jobs import FileLock, JobRunner, ProcessLock, leader_lock
+
+def make_runner(name, calls):
+    runner = JobRunner(retry_seconds=0.05)
+    runner.service("recorder", lambda: calls.append((name, "start")), lambda: calls.append((name, "stop")))
+
+    @runner.every(seconds=0.02)
+    def tick():
+        calls.append((name, "tick"))
+
+    return runner
+
+async def wait_for(condition, timeout=5.0):
+    deadline = asyncio.get_running_loop().time() + timeout
+    while not condition():
+        assert asyncio.get_running_loop().time() < deadline, "timed out"
+        await asyncio.sleep(0.01)
+
+@pytest.mark.asyncio
+async def test_only_the_lock_holder_runs_jobs_and_a_follower_takes_over(tmp_path):
+    calls = []
+    first, second = make_runner("first", calls), make_runner("second", calls)
+    path = str(tmp_path / "events.sqlite.leader")
+
+    await first.start(FileLock(path))
+    await wait_for(lambda: first.is_leader)
+    await second.start(FileLock(path))
+    await wait_for(lambda: calls.count(("first", "tick")) >= 3)
+    assert not second.is_leader
+    assert [call for call in calls if call[0] == "second"] == []
+
+    await first.stop()
+    assert calls[-1] == ("first", "stop")
+    await wait_for(lambda: ("second", "tick") in calls)
+    await second.stop()
+
+    assert [call for call in calls if call[1] != "tick"] == [
+        ("first", "start"), ("first", "stop"), ("second", "start"), ("second", "stop")
+    ]
+
+@pytest.mark.asyncio
+async def test_failing_job_keeps_its_schedule(tmp_path):
+    runner, runs = JobRunner(retry_seconds=0.05), []
+
+    @runner.every(seconds=0.02)
+    def flaky():
+        runs.append(1)
+        raise RuntimeError("boom")
+
+    await runner.start(ProcessLock())
+    await wait_for(lambda: len(runs) >= 3)
+    await runner.stop()
+    assert not runner.is_leader
+
+def test_leader_lock_follows_the_database(tmp_path):
+    file_db = create_engine(f"sqlite:///{tmp_path / 'events.sqlite'}")
+
+    assert isinstance(leader_lock(create_engine("sqlite://"), path=None), ProcessLock)
+    assert leader_lock(file_db, path=None).path == str(tmp_path / "events.sqlite.leader")
+    assert leader_lock(file_db, path=str(tmp_path / "custom.lock")).path == str(tmp_path / "custom.lock")
@@ -0,0 +1,64 @@
+import pytest
+from sqlalchemy import insert
+from app import metrics
+from app.jobs import JobRunner, ProcessLock
+from app.models.model import Event, EventStatus
+from app.routers import metrics_urls
+from app.test.test_jobs import wait_for
+
+@pytest.fixture
+def metered(api):
+    metrics.instrument_engine(api.engine, "test")
+    with api.engine.begin() as conn:
+        conn.execute(insert(Event), [{"event_id": 1, "name": "Expo", "location": "Oslo", "max_attendees": 5,
+                                      "status": EventStatus.scheduled}])
+    # The first authenticated request also loads the user, so keep it out of the counts
+    api.get("/events/1/stats")
+    return api
+
+def test_requests_are_timed_per_route_with_their_db_queries(metered, monkeypatch):
+    route = ("GET", "/events/{event_id}/stats")
+    requests, queries = metrics.http_requests.value(*route, "200"), metrics.http_request_queries.sum(*route)
+    checkouts = metrics.db_checkout_seconds.count("test")
+
+    for event_id in (1, 1, 2):
+        metered.get(f"/events/{event_id}/stats")
+
+    assert metrics.http_requests.value(*route, "200") == requests + 2
+    assert metrics.http_requests.value(*route, "404") >= 1
+    assert metrics.http_request_queries.sum(*route) == queries + 3
+    assert metrics.db_checkout_seconds.count("test") > checkouts
+    assert metrics.http_in_flight.value() == 0
+    body = metered.get("/metrics").text
+    assert f'http_requests_total{{method="GET",route="/events/{{event_id}}/stats",status="200"}} {requests + 2}' in body
+    assert 'http_request_duration_seconds_bucket{method="GET",route="/events/{event_id}/stats",le="+Inf"}' in body
+
+    monkeypatch.setattr(metrics_urls, "METRICS_TOKEN", "scrape-secret")
+    assert metered.get("/metrics").status_code == 401
+    assert metered.get("/metrics", headers={"Authorization": "Bearer scrape-secret"}).status_code == 200
+
+@pytest.mark.asyncio
+async def test_job_durations_and_failures_are_recorded():
+    runner = JobRunner(retry_seconds=0.05)
+
+    @runner.every(seconds=0.02, name="metered-flaky")
+    def flaky():
+        raise RuntimeError("boom")
+
+    await runner.start(ProcessLock())
+    await wait_for(lambda: metrics.job_failures.value("metered-flaky") >= 2)
+    await runner.stop()
+    assert metrics.job_seconds.count("metered-flaky") == metrics.job_failures.value("metered-flaky")
+
+def test_histogram_exposition_is_cumulative_and_escaped():
+    histogram = metrics.Histogram("latency_seconds", "Latency.", ("route",), buckets=(0.1, 1))
+    for value in (0.05, 0.1, 0.5, 3):
+        histogram.observe(value, 'say "hi"\n')
+
+    assert list(histogram.samples()) == [
+        'latency_seconds_bucket{route="say \\"hi\\"\\n",le="0.1"} 2',
+        'latency_seconds_bucket{route="say \\"hi\\"\\n",le="1"} 3',
+        'latency_seconds_bucket{route="say \\"hi\\"\\n",le="+Inf"} 4',
+        'latency_seconds_sum{route="say \\"hi\\"\\n"} 3.65',
+        'latency_seconds_count{route="say \\"hi\\"\\n"} 4',
+    ]
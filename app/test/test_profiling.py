@@ -0,0 +1,77 @@
+import asyncio
+import os
+import pytest
+from sqlalchemy import insert
+from sqlalchemy.orm import sessionmaker
+from app import auth, profiling
+from app.models.model import Event, EventStatus, User
+from app.profiling import ProfileStore, ProfilingMiddleware, profile_store
+
+@pytest.fixture
+def profiled(api, tmp_path, monkeypatch):
+    monkeypatch.setattr(profile_store, "directory", str(tmp_path))
+    # The middleware checks the role before any route (and its get_db) runs
+    monkeypatch.setattr(auth, "SessionLocal", sessionmaker(bind=api.engine))
+    with api.engine.begin() as conn:
+        conn.execute(insert(User), [{"user_id": 2, "username": "guest", "email": "guest@example.com",
+                                     "hashed_password": "x", "role": "user"}])
+        conn.execute(insert(Event), [{"event_id": 1, "name": "Expo", "location": "Oslo", "max_attendees": 5,
+                                      "status": EventStatus.scheduled}])
+    return api, tmp_path
+
+def test_admins_get_their_request_profiled(profiled):
+    api, directory = profiled
+
+    traced = api.get("/events/1", headers={"X-Profile": "cprofile"})
+    sampled = api.get("/events/1", params={"profile": "stacks"})
+
+    assert traced.status_code == sampled.status_code == 200
+    assert traced.headers["X-Profile"].endswith("-GET-events_event_id.prof")
+    assert sampled.headers["X-Profile"].endswith("-GET-events_event_id.collapsed")
+    assert [profile["name"] for profile in api.get("/profiles").json()] == [
+        sampled.headers["X-Profile"], traced.headers["X-Profile"]
+    ]
+    report = api.get(f"/profiles/{traced.headers['X-Profile']}").text
+    assert "function calls" in report and "get_event" in report
+    assert api.get(f"/profiles/{traced.headers['X-Profile']}", params={"raw": True}).content == \
+        (directory / traced.headers["X-Profile"]).read_bytes()
+    assert api.get("/profiles/missing.prof").status_code == 404
+
+def test_profile_flag_is_ignored_for_everyone_else(profiled):
+    api, directory = profiled
+    guest = {"Authorization": f"Bearer {auth.create_access_token({'sub': '2'})}"}
+
+    for headers in ({**guest, "X-Profile": "cprofile"}, {"Authorization": "Bearer bogus", "X-Profile": "cprofile"}):
+        assert "X-Profile" not in api.get("/events/1", headers=headers).headers
+    assert api.get("/events/1", headers={"X-Profile": "everything"}).headers.get("X-Profile") is None
+    assert api.get("/profiles", headers=guest).status_code == 403
+    assert os.listdir(directory) == []
+
+@pytest.mark.asyncio
+async def test_sampled_requests_rotate_and_concurrent_requests_are_not_profiled_twice(tmp_path):
+    store = ProfileStore(str(tmp_path), keep=2)
+    sent = []
+
+    async def endpoint(scope, receive, send):
+        await send({"type": "http.response.start", "status": 200, "headers": []})
+        await send({"type": "http.response.body", "body": b"{}"})
+
+    async def send(message):
+        sent.append(message)
+
+    middleware = ProfilingMiddleware(endpoint, store, sample_rate=3, sample_mode="cprofile")
+    scope = {"type": "http", "method": "GET", "path": "/", "headers": [], "query_string": b""}
+    for _ in range(9):
+        await middleware(dict(scope), None, send)
+
+    assert [name.rsplit("-", 1)[1] for name in sorted(os.listdir(tmp_path))] == ["unmatched.prof"] * 2
+    assert store.path("../config.py") is None
+
+    # While a profile runs, an admin's flagged request goes through unprofiled
+    auth.user_cache.set("1", {"user_id": 1, "role": "admin"})
+    flagged = {**scope, "headers": [(b"x-profile", b"stacks"),
+                                    (b"authorization", f"Bearer {auth.create_access_token({'sub': '1'})}".encode())]}
+    with profiling._active:
+        await middleware(flagged, None, send)
+    auth.user_cache.clear()
+    assert (b"x-profile", b"busy") in sent[-2]["headers"]
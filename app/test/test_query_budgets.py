@@ -0,0 +1,63 @@
+from datetime import datetime, timedelta
+import pytest
+from sqlalchemy import insert
+from app.models.model import Attendee, Event, EventStatus
+
+EVENTS = 150
+ATTENDEES = 300
+
+@pytest.fixture
+def seeded(api):
+    start = datetime(2031, 1, 1)
+    with api.engine.begin() as conn:
+        conn.execute(insert(Event), [
+            {"event_id": i, "name": f"Event {i}", "location": f"City {i % 3}", "max_attendees": 10_000,
+             "start_time": start + timedelta(hours=i), "end_time": start + timedelta(hours=i + 2),
+             "status": EventStatus.scheduled, "registered_count": ATTENDEES if i == 1 else 0}
+            for i in range(1, EVENTS + 1)
+        ])
+        conn.execute(insert(Attendee), [
+            {"attendee_id": i, "first_name": "Guest", "last_name": str(i), "email": f"guest{i}@example.com",
+             "phone_number": "1234567890", "event_id": 1, "check_in_status": False}
+            for i in range(1, ATTENDEES + 1)
+        ])
+    # The first authenticated request also loads the user into the auth cache
+    api.get("/events/stats", params={"event_ids": [1]}, budget=2)
+    return api
+
+def test_reads_cost_the_same_at_any_page_size(seeded):
+    for limit in (1, 50, EVENTS):
+        assert len(seeded.get("/events", params={"limit": limit}, budget=1).json()) == limit
+        assert len(seeded.get("/attendees/1", params={"limit": limit}, budget=1).json()) == limit
+        page = seeded.get("/events", params={"limit": limit, "cursor": "", "status": "scheduled"}, budget=2).json()
+        assert len(page["events"]) == limit
+    seeded.get("/events/1", budget=1)
+    assert len(seeded.get("/events/search", params={"q": "event city", "limit": 100}, budget=1).json()) == 100
+    seeded.get("/events/stats", params={"event_ids": list(range(1, 101))}, budget=1)
+    seeded.get("/events/1/attendees/export", budget=2)
+
+@pytest.mark.parametrize("size", [20, 200])
+def test_bulk_writes_cost_the_same_at_any_batch_size(seeded, size):
+    ids = "\n".join(str(attendee_id) for attendee_id in range(1, size + 1))
+    seeded.post("/attendees/bulk-check-in/", files={"file": ("ids.csv", ids.encode(), "text/csv")}, budget=3)
+
+    rows = [{"first_name": "New", "last_name": "Guest", "email": f"new{i}@example.com",
+             "phone_number": "1234567890", "event_id": 2 + i % 3} for i in range(size)]
+    # Existing emails, capacity, one seat claim per event, one multi-row INSERT
+    report = seeded.post("/attendees/bulk", json=rows, budget=6).json()
+    assert report["registered"] == size
+
+def test_single_writes_stay_within_budget(seeded):
+    seeded.put("/attendees/check-in/7", budget=4)
+    seeded.post("/attendees", json={"first_name": "New", "last_name": "Guest", "email": "new@example.com",
+                                    "phone_number": "1234567890", "event_id": 2}, budget=3)
+    seeded.post("/events", json={"name": "New", "location": "Oslo", "max_attendees": 5,
+                                 "start_time": "2032-01-01T00:00:00"}, budget=2)
+
+def test_exceeding_a_budget_lists_the_statements(api):
+    with pytest.raises(pytest.fail.Exception) as failure:
+        api.get("/events/1", budget=0)
+
+    message = str(failure.value)
+    assert message.startswith("GET /events/1 issued 2 queries, over its budget of 0:\n  1. SELECT users.user_id")
+    assert "\n  2. SELECT events.event_id" in message
@@ -0,0 +1,147 @@
+import os
+import re
+import pytest
+from datetime import datetime, timedelta
+from sqlalchemy import create_engine, event
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import StaticPool
+from app import crud
+from app.db import Base
+from app.event_status import EventStatusScheduler
+from app.models.model import Attendee, Event, EventStatus, User
+from app.schema import AttendeeCreate, EventCreate, EventUpdate
+
+# Point at a disposable Postgres database to check plans there instead of SQLite
+PLAN_DATABASE_URL = os.getenv("PLAN_TEST_DATABASE_URL", "sqlite://")
+
+# SQLite: "SCAN events" is a full table scan, "SCAN events USING INDEX ..." is not.
+# Postgres: any "Seq Scan on ..." survives only when no index can serve the query.
+FULL_SCAN = re.compile(r"^SCAN \w+$|Seq Scan on")
+FILTERED = re.compile(r"\bWHERE\b")
+# Search must look words up in the full-text index: an FTS5 MATCH ("M" in the
+# index string) on SQLite, the tsvector's GIN index on Postgres
+FULL_TEXT_MATCH = re.compile(r"^SCAN events_fts VIRTUAL TABLE INDEX \d+:M|Bitmap Index Scan on ix_events_search_vector")
+
+@pytest.fixture
+def plan_db():
+    if PLAN_DATABASE_URL.startswith("sqlite"):
+        engine = create_engine(PLAN_DATABASE_URL, poolclass=StaticPool)
+    else:
+        engine = create_engine(PLAN_DATABASE_URL)
+    Base.metadata.drop_all(bind=engine)
+    Base.metadata.create_all(bind=engine)
+    SessionLocal = sessionmaker(bind=engine, autoflush=False)
+    with SessionLocal() as db:
+        start = datetime(2030, 1, 1)
+        db.add_all(
+            Event(event_id=i, name=f"Event {i}", location=f"City {i % 5}", max_attendees=50,
+                  start_time=start + timedelta(days=i), end_time=start + timedelta(days=i, hours=2),
+                  status=EventStatus.scheduled)
+            for i in range(1, 21)
+        )
+        db.add_all(
+            Attendee(attendee_id=i, first_name="Guest", last_name=str(i), email=f"guest{i}@example.com",
+                     phone_number="1234567890", event_id=i % 20 + 1, check_in_status=i % 2 == 0)
+            for i in range(1, 101)
+        )
+        db.add(User(user_id=1, username="planner", email="planner@example.com", hashed_password="x"))
+        db.commit()
+        yield engine, SessionLocal
+    Base.metadata.drop_all(bind=engine)
+    engine.dispose()
+
+def _explain(conn, statement, parameters):
+    if conn.dialect.name == "sqlite":
+        rows = conn.exec_driver_sql("EXPLAIN QUERY PLAN " + statement, parameters).all()
+        return [row[-1] for row in rows]
+    conn.exec_driver_sql("SET enable_seqscan = off")
+    return [row[0] for row in conn.exec_driver_sql("EXPLAIN " + statement, parameters).all()]
+
+def _capture_statements(engine, call):
+    statements = []
+
+    def before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        # INSERTs don't scan; unfiltered listings are bounded by LIMIT, not an index
+        if not statement.lstrip().upper().startswith("INSERT") and FILTERED.search(statement):
+            statements.append((statement, parameters[0] if executemany else parameters))
+
+    event.listen(engine, "before_cursor_execute", before_cursor_execute)
+    try:
+        call()
+    finally:
+        event.remove(engine, "before_cursor_execute", before_cursor_execute)
+    return statements
+
+def _search(db, terms, status=None, location=None):
+    return crud.search_events(db, terms, status, location, None, None, 0, 10, crud.EVENT_RESPONSE_COLUMNS)
+
+def _new_attendee(email):
+    return AttendeeCreate(first_name="New", last_name="Guest", email=email, phone_number="1234567890", event_id=3)
+
+CRUD_QUERIES = {
+    "create_event": lambda db: crud.create_event(db, EventCreate(name="New", location="City 1", max_attendees=5)),
+    "update_event": lambda db: crud.update_event(db, 2, EventUpdate.model_construct(name="Renamed")),
+    "get_events_by_status": lambda db: crud.get_events(db, status=EventStatus.scheduled),
+    "get_events_by_location": lambda db: crud.get_events(db, location="City 1"),
+    "get_events_by_start_date": lambda db: crud.get_events(db, start_date=datetime(2030, 1, 5)),
+    "get_events_by_end_date": lambda db: crud.get_events(db, end_date=datetime(2030, 1, 5)),
+    "get_events_page_first": lambda db: crud.get_events_page(db, limit=5),
+    "get_events_page_after": lambda db: crud.get_events_page(db, after=(datetime(2030, 1, 5), 5), limit=5),
+    "get_events_page_by_status": lambda db: crud.get_events_page(
+        db, status=EventStatus.scheduled, after=(datetime(2030, 1, 5), 5), limit=5),
+    "get_events_page_by_location": lambda db: crud.get_events_page(
+        db, location="City 2", after=(datetime(2030, 1, 5), 5), limit=5),
+    "search_events": lambda db: _search(db, ["event", "city"], status=EventStatus.scheduled, location="City 2"),
+    "get_event": lambda db: crud.get_event(db, 3),
+    "get_event_stats": lambda db: crud.get_event_stats(db, [3, 4]),
+    "create_attendee": lambda db: crud.create_attendee(db, _new_attendee("new.guest@example.com")),
+    "create_attendee_duplicate": lambda db: crud.create_attendee(db, _new_attendee("guest1@example.com")),
+    "bulk_create_attendees": lambda db: crud.bulk_create_attendees(
+        db, [_new_attendee("bulk1@example.com"), _new_attendee("guest2@example.com"), _new_attendee("bulk2@example.com")]),
+    "get_attendees": lambda db: crud.get_attendees(db, 3),
+    "get_attendees_by_check_in_status": lambda db: crud.get_attendees(db, 3, check_in_status=True),
+    "get_attendees_after": lambda db: crud.get_attendees(db, 3, after=10, limit=5),
+    "check_in_attendee": lambda db: crud.check_in_attendee(db, 7),
+    "bulk_check_in": lambda db: crud.bulk_check_in(db, [1, 2, 3, 999]),
+    "get_user": lambda db: crud.get_user(db, 1),
+    "get_user_by_email": lambda db: crud.get_user_by_email(db, "planner@example.com"),
+}
+
+@pytest.mark.parametrize("name", sorted(CRUD_QUERIES))
+def test_crud_queries_avoid_full_table_scans(plan_db, name):
+    engine, SessionLocal = plan_db
+    with SessionLocal() as db:
+        statements = _capture_statements(engine, lambda: CRUD_QUERIES[name](db))
+
+    _assert_indexed(engine, name, statements)
+
+def test_event_status_scheduler_avoids_full_table_scans(plan_db):
+    engine, SessionLocal = plan_db
+    scheduler = EventStatusScheduler(SessionLocal)
+
+    def resync_and_run_due():
+        scheduler.resync()
+        assert scheduler.run_due(datetime(2030, 1, 5)) == 4
+
+    statements = _capture_statements(engine, resync_and_run_due)
+
+    _assert_indexed(engine, "event_status_scheduler", statements)
+
+def test_search_events_matches_through_the_full_text_index(plan_db):
+    engine, SessionLocal = plan_db
+    with SessionLocal() as db:
+        statements = _capture_statements(engine, lambda: _search(db, ["event", "city"]))
+
+    assert len(statements) == 1
+    with engine.connect() as conn:
+        plan = _explain(conn, *statements[0])
+    assert any(FULL_TEXT_MATCH.search(line.strip()) for line in plan), "search_events bypassed the index:\n" + "\n".join(plan)
+    assert not [line for line in plan if FULL_SCAN.search(line.strip())], "\n".join(plan)
+
+def _assert_indexed(engine, name, statements):
+    assert statements, f"{name} issued no filtered statements to check"
+    with engine.connect() as conn:
+        for statement, parameters in statements:
+            plan = _explain(conn, statement, parameters)
+            scans = [line for line in plan if FULL_SCAN.search(line.strip())]
+            assert not scans, f"{name} regressed to a full table scan:\n{statement}\n" + "\n".join(plan)
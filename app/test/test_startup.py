@@ -0,0 +1,67 @@
+import os
+import sqlite3
+import subprocess
+import sys
+from alembic.script import ScriptDirectory
+from app import auth, dependency
+from app.main import create_app
+from app.migrate import alembic_config
+from app.openapi import OPENAPI_PATH, generate_openapi, load_openapi
+
+ROOT = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+def run_python(code, database, *args):
+    # A fresh interpreter, since settings and engines are fixed on first import
+    env = {**os.environ, "DATABASE_URL": f"sqlite:///{database}", "PYTHONPATH": ROOT}
+    return subprocess.run([sys.executable, *args] if args else [sys.executable, "-c", code], cwd=ROOT, env=env,
+                          capture_output=True, text=True, timeout=120)
+
+def tables(database):
+    with sqlite3.connect(database) as conn:
+        return {name for (name,) in conn.execute("SELECT name FROM sqlite_master WHERE type = 'table'")}
+
+def test_importing_main_does_no_work(tmp_path):
+    result = run_python(
+        "import sys, app.main; "
+        "print(sorted(m for m in ('fastapi', 'sqlalchemy', 'app.db', 'app.routers.urls') if m in sys.modules))",
+        tmp_path / "events.sqlite")
+    assert result.returncode == 0, result.stderr
+    assert result.stdout.strip() == "[]"
+
+def test_startup_leaves_the_schema_to_the_migrate_command(tmp_path):
+    database = tmp_path / "events.sqlite"
+    started = run_python(
+        "from fastapi.testclient import TestClient\n"
+        "from app.main import create_app\n"
+        "with TestClient(create_app()):\n"
+        "    pass\n", database)
+    assert started.returncode == 0, started.stderr
+    assert not tables(database)
+
+    migrated = run_python(None, database, "-m", "app.migrate")
+    assert migrated.returncode == 0, migrated.stderr
+    assert {"alembic_version", "events", "attendees", "users"} <= tables(database)
+
+    legacy = tmp_path / "legacy.sqlite"
+    with sqlite3.connect(legacy) as conn:
+        conn.execute("CREATE TABLE events (event_id INTEGER PRIMARY KEY)")
+    refused = run_python(None, legacy, "-m", "app.migrate")
+    assert refused.returncode == 1
+    assert "no Alembic revision" in refused.stderr
+    assert tables(legacy) == {"events"}
+
+def test_precomputed_openapi_is_current_and_served():
+    app = create_app()
+    assert load_openapi() == generate_openapi(create_app()), f"run `python -m app.openapi` to refresh {OPENAPI_PATH}"
+    schema = app.openapi()
+    assert schema == load_openapi()
+    assert schema["paths"]["/events"]["get"]["security"] == [{"BearerAuth": []}]
+
+def test_routes_share_one_bearer_scheme():
+    assert auth.oauth2_scheme is dependency.oauth2_scheme
+
+def test_bundled_database_is_at_the_latest_revision():
+    with sqlite3.connect(os.path.join(ROOT, "eventdb.sqlite")) as conn:
+        (revision,), = conn.execute("SELECT version_num FROM alembic_version")
+    assert revision == ScriptDirectory.from_config(alembic_config()).get_current_head(), \
+        "run `DATABASE_URL=sqlite:///./eventdb.sqlite python -m app.migrate`"
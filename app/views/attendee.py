@@ -1,12 +1,25 @@
-from io import StringIO
-from fastapi import APIRouter, Depends, HTTPException, UploadFile, File
+from fastapi import APIRouter, Depends, HTTPException, Request
+from fastapi.responses import StreamingResponse
+from pydantic import TypeAdapter, ValidationError
 from sqlalchemy.orm import Session
-from typing import List, Optional
-import csv
-from app import schema, crud, models
+from typing import Dict, List, Literal, Optional, Tuple
+import orjson
+from app import schema, async_crud, models
 from app.dependency import get_db
 from app.auth import get_current_user
+from app.crud import ATTENDEE_RESPONSE_COLUMNS
+from app.responses import iter_json_array, iter_ndjson
+from app.streaming import UploadStreamingResponse, iter_csv_rows, iter_multipart_file
 
+# Attendee IDs checked in per transaction while a CSV upload streams in
+CHECK_IN_BATCH_SIZE = 1000
+
+# Rows fetched and encoded per chunk of a streamed attendee listing
+ATTENDEE_STREAM_CHUNK_SIZE = 1000
+
+_attendee_list = TypeAdapter(List[schema.AttendeeCreate])
+
+LISTING_FORMATS = {"json": (iter_json_array, "application/json"), "ndjson": (iter_ndjson, "application/x-ndjson")}
 
 class AttendeeView:
     async def register_attendee(
@@ -15,18 +28,40 @@ class AttendeeView:
         db: Session = Depends(get_db), 
         user=Depends(get_current_user)
     ):
-        db_attendee, error = crud.create_attendee(db, attendee)
+        db_attendee, error = await async_crud.create_attendee(db, attendee)
         if error:
             raise HTTPException(status_code=400, detail=error)
         return schema.AttendeeResponse.model_validate(db_attendee)
 
+    async def bulk_register(
+        self,
+        request: Request,
+        db: Session = Depends(get_db),
+        user=Depends(get_current_user)
+    ) -> schema.BulkRegistrationReport:
+        rows = await _read_registration_rows(request)
+        if not rows:
+            raise HTTPException(status_code=400, detail="No attendees to register")
+
+        valid, errors = _validate_registration_rows(rows)
+        outcomes = await async_crud.bulk_create_attendees(db, list(valid.values()))
+        results = {index: outcome for index, outcome in zip(valid, outcomes)}
+        results.update((index, (None, error)) for index, error in errors.items())
+
+        report = [
+            schema.BulkRegistrationRow(row=index + 1, attendee_id=attendee_id, error=error)
+            for index, (attendee_id, error) in sorted(results.items())
+        ]
+        registered = sum(1 for row in report if row.error is None)
+        return schema.BulkRegistrationReport(registered=registered, failed=len(report) - registered, results=report)
+
     async def check_in_attendee(
         self, 
         attendee_id: int, 
         db: Session = Depends(get_db), 
         user=Depends(get_current_user)
     ):
-        checked_in_attendee = crud.check_in_attendee(db, attendee_id)
+        checked_in_attendee = await async_crud.check_in_attendee(db, attendee_id)
         if not checked_in_attendee:
             raise HTTPException(status_code=404, detail="Attendee not found")
         return schema.AttendeeResponse.model_validate(checked_in_attendee)
@@ -35,48 +70,146 @@ class AttendeeView:
         self, 
         event_id: int, 
         check_in_status: Optional[bool] = None,
+        after: Optional[int] = None,
+        limit: Optional[int] = None,
+        format: Literal["json", "ndjson"] = "json",
         db: Session = Depends(get_db)
     ):
-        attendees = crud.get_attendees(db, event_id)
-        
-        if check_in_status is not None:
-            attendees = [att for att in attendees if att.check_in_status == check_in_status]
+        # The first chunk is read before responding, so an empty listing can still 404
+        first_limit = ATTENDEE_STREAM_CHUNK_SIZE if limit is None else min(limit, ATTENDEE_STREAM_CHUNK_SIZE)
+        attendees = await async_crud.get_attendees(
+            db, event_id, ATTENDEE_RESPONSE_COLUMNS, check_in_status, after, first_limit
+        )
 
         if not attendees:
             raise HTTPException(status_code=404, detail="No attendees found")
 
-        return [schema.AttendeeResponse.model_validate(att) for att in attendees]
+        encode, media_type = LISTING_FORMATS[format]
+        return StreamingResponse(
+            encode(self._iter_attendee_chunks(db, attendees, event_id, check_in_status, limit)),
+            media_type=media_type,
+        )
+
+    async def _iter_attendee_chunks(self, db: Session, first_chunk, event_id, check_in_status, limit):
+        # As with bulk check-in, get_db has closed the session before the body streams;
+        # the rest is fetched on the reused session, resuming after the first chunk's last id.
+        try:
+            yield first_chunk
+            remaining = None if limit is None else limit - len(first_chunk)
+            if len(first_chunk) < ATTENDEE_STREAM_CHUNK_SIZE or remaining == 0:
+                return
+            chunks = async_crud.stream_attendees(
+                db, event_id, ATTENDEE_RESPONSE_COLUMNS, check_in_status,
+                first_chunk[-1].attendee_id, remaining, ATTENDEE_STREAM_CHUNK_SIZE,
+            )
+            async for chunk in chunks:
+                yield chunk
+        finally:
+            await async_crud.close(db)
 
     async def bulk_check_in(
         self, 
-        file: UploadFile = File(...), 
+        request: Request, 
         db: Session = Depends(get_db), 
         user=Depends(get_current_user)
     ):
-        if not file or not file.filename:
+        upload = iter_multipart_file(request, "file")
+        filename = await anext(upload, None)
+        if not filename:
             raise HTTPException(status_code=400, detail="No file was uploaded")
 
         # Ensure it's a CSV file
-        if not file.filename.endswith(".csv"):
+        if not filename.endswith(".csv"):
             raise HTTPException(status_code=400, detail="Only CSV files are supported")
 
-        # Read the file content and decode it
-        content = await file.read()
-        csv_reader = csv.reader(content.decode("utf-8-sig").splitlines())
-        
-        attendee_ids = []
-        for row in csv_reader:
-            if row:
-                attendee_id = row[0].strip()  # Remove extra spaces
-                if attendee_id.isdigit():
-                    attendee_ids.append(int(attendee_id))  # Convert to integer
-        
-        if not attendee_ids:
+        # Rows are parsed as the upload arrives; only the first batch is read before responding
+        batches = _iter_batches(_iter_attendee_ids(upload), CHECK_IN_BATCH_SIZE)
+        first_batch = await anext(batches, None)
+        if first_batch is None:
             raise HTTPException(status_code=400, detail="Invalid or empty CSV file")
 
-        updated_attendees = crud.bulk_check_in(db, attendee_ids)
+        return UploadStreamingResponse(
+            self._stream_check_in_progress(db, first_batch, batches),
+            media_type="application/x-ndjson",
+        )
+
+    async def _stream_check_in_progress(self, db: Session, batch: List[int], batches):
+        progress = schema.BulkCheckInProgress(batch=0, rows=0, updated=0, already_checked_in=0, unknown=0)
+        # get_db has already closed the session by the time the body streams;
+        # a closed session is reusable, so keep using it and close it again at the end.
+        try:
+            while batch is not None:
+                checked_in, already_checked_in, unknown = await async_crud.bulk_check_in(db, batch)
+                progress.batch += 1
+                progress.rows += len(batch)
+                progress.updated += len(checked_in)
+                progress.already_checked_in += already_checked_in
+                progress.unknown += unknown
+                # Read ahead so the last batch's own line carries "done", rather than a repeat of it
+                batch = await anext(batches, None)
+                progress.done = batch is None
+                yield progress.model_dump_json() + "\n"
+        finally:
+            await async_crud.close(db)
+
+
+async def _read_registration_rows(request: Request) -> list:
+    content_type = request.headers.get("content-type", "")
+    if content_type.startswith("multipart/form-data"):
+        upload = iter_multipart_file(request, "file")
+        if not await anext(upload, None):
+            raise HTTPException(status_code=400, detail="No file was uploaded")
+        return await _read_csv_records(upload)
+    if content_type.startswith("text/csv"):
+        return await _read_csv_records(request.stream())
+    if content_type.startswith("application/json"):
+        try:
+            rows = orjson.loads(await request.body())
+        except orjson.JSONDecodeError:
+            raise HTTPException(status_code=400, detail="Invalid JSON body")
+        if not isinstance(rows, list):
+            raise HTTPException(status_code=400, detail="Expected a JSON array of attendees")
+        return rows
+    raise HTTPException(status_code=415, detail="Send a JSON array or a CSV file")
+
+
+async def _read_csv_records(chunks) -> List[dict]:
+    # The header row names the AttendeeCreate fields; blank lines are skipped
+    rows = iter_csv_rows(chunks)
+    header = [name.strip() for name in await anext(rows, [])]
+    return [dict(zip(header, row)) async for row in rows if any(value.strip() for value in row)]
+
+
+def _validate_registration_rows(rows: list) -> Tuple[Dict[int, schema.AttendeeCreate], Dict[int, str]]:
+    # One validation pass over the whole batch; only failing batches are revisited per row
+    try:
+        return dict(enumerate(_attendee_list.validate_python(rows))), {}
+    except ValidationError as exc:
+        errors = {}
+        for error in exc.errors():
+            index, field = error["loc"][0], ".".join(str(part) for part in error["loc"][1:])
+            errors.setdefault(index, f"{field}: {error['msg']}" if field else error["msg"])
+    valid = {
+        index: schema.AttendeeCreate.model_validate(row)
+        for index, row in enumerate(rows) if index not in errors
+    }
+    return valid, errors
+
+
+async def _iter_attendee_ids(chunks):
+    async for row in iter_csv_rows(chunks):
+        if row:
+            attendee_id = row[0].strip()  # Remove extra spaces
+            if attendee_id.isdigit():
+                yield int(attendee_id)
 
-        if not updated_attendees:
-            raise HTTPException(status_code=404, detail="No valid attendees found for check-in")
 
-        return [schema.AttendeeResponse.model_validate(att) for att in updated_attendees]
\ No newline at end of file
+async def _iter_batches(items, size: int):
+    batch = []
+    async for item in items:
+        batch.append(item)
+        if len(batch) == size:
+            yield batch
+            batch = []
+    if batch:
+        yield batch
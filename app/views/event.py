@@ -1,14 +1,31 @@
+import base64
+import json
 from datetime import datetime
-from fastapi import APIRouter, Depends, HTTPException
-from psycopg2 import IntegrityError
+from fastapi import APIRouter, Depends, HTTPException, Request
+from fastapi.responses import StreamingResponse
+from sqlalchemy.exc import IntegrityError
 from sqlalchemy.orm import Session
-from typing import List, Optional
-from app import schema, crud
+from typing import List, Literal, Optional, Tuple
+from app import schema, async_crud, search
 from app.models import model
 from app.dependency import get_db
 from app.auth import get_current_user
+from app.cache import event_responses
+from app.crud import ATTENDEE_RESPONSE_COLUMNS, EVENT_RESPONSE_COLUMNS
+from app.responses import dump_json, iter_csv, iter_gzip, iter_ndjson, rows_to_dicts
 from app import schema
 
+# Rows fetched from the server-side cursor per chunk of an export
+EXPORT_CHUNK_SIZE = 5000
+
+EXPORT_MEDIA_TYPES = {"csv": "text/csv", "ndjson": "application/x-ndjson"}
+
+# Events per GET /events/stats request
+MAX_STATS_EVENTS = 100
+
+# Largest limit GET /events and GET /events/search accept
+MAX_PAGE_SIZE = 1000
+
 class EventView:
     async def create_event(
         self, event: schema.EventCreate, 
@@ -19,14 +36,11 @@ class EventView:
             raise HTTPException(status_code=400, detail="max_attendees is required and cannot be null")
 
         try:
-            new_event = crud.create_event(db, event)
-            db.commit()  
-            db.refresh(new_event) 
-        
+            new_event = await async_crud.create_event(db, event)
             return schema.EventResponse.model_validate(new_event)  
 
         except IntegrityError as e:
-            db.rollback()  # Rollback transaction in case of failure
+            await async_crud.rollback(db)  # Rollback transaction in case of failure
             raise HTTPException(status_code=400, detail=f"Database error: {str(e.orig)}")
 
     async def update_event(
@@ -36,7 +50,7 @@ class EventView:
         db: Session = Depends(get_db), 
         user=Depends(get_current_user)
     ):
-        updated_event = crud.update_event(db, event_id, event_update)
+        updated_event = await async_crud.update_event(db, event_id, event_update)
         
         if not updated_event:
             raise HTTPException(status_code=404, detail="Event not found")
@@ -45,38 +59,189 @@ class EventView:
 
     async def list_events(
         self,
+        request: Request,
         status: Optional[model.EventStatus] = None, 
         location: Optional[str] = None, 
         start_date: Optional[str] = None, 
         end_date: Optional[str] = None, 
         skip: int = 0, 
         limit: int = 10, 
+        cursor: Optional[str] = None,
+        db: Session = Depends(get_db),
+        user=Depends(get_current_user)
+    ) -> List[schema.EventResponse] | schema.EventListResponse:
+        # Identical queries share one cached body, whatever the parameter order
+        cache_key = ("events", tuple(sorted(request.query_params.multi_items())))
+        cached = event_responses.get(cache_key)
+        if cached is None:
+            generation = event_responses.generation
+            body = await self._list_events_body(status, location, start_date, end_date, skip, limit, cursor, db)
+            cached = event_responses.set(cache_key, body, ("events",), generation)
+        return cached.to_response(request.headers.get("if-none-match"))
+
+    async def search_events(
+        self,
+        request: Request,
+        q: str,
+        status: Optional[model.EventStatus] = None,
+        location: Optional[str] = None,
+        start_date: Optional[str] = None,
+        end_date: Optional[str] = None,
+        skip: int = 0,
+        limit: int = 10,
+        db: Session = Depends(get_db),
         user=Depends(get_current_user)
     ) -> List[schema.EventResponse]:
-        
-        db: Session = next(get_db())  
-        
-        # Convert `start_date` and `end_date` strings to datetime objects
-        parsed_start_date, parsed_end_date = None, None
-        try:
-            if start_date:
-                parsed_start_date = datetime.strptime(start_date, "%Y-%m-%d")
-            if end_date:
-                parsed_end_date = datetime.strptime(end_date, "%Y-%m-%d")
-        except ValueError:
-            raise HTTPException(status_code=400, detail="Invalid date format. Use YYYY-MM-DD.")
+        terms = search.parse_terms(q)
+        if not terms:
+            raise HTTPException(status_code=400, detail="Search for at least one word")
+        parsed_start_date, parsed_end_date = _parse_dates(start_date, end_date)
+        # Tagged like the listings, so any event change drops cached results
+        cache_key = ("search", tuple(sorted(request.query_params.multi_items())))
+        cached = event_responses.get(cache_key)
+        if cached is None:
+            generation = event_responses.generation
+            events = await async_crud.search_events(
+                db, terms, status, location, parsed_start_date, parsed_end_date, skip, limit, EVENT_RESPONSE_COLUMNS
+            )
+            cached = event_responses.set(cache_key, dump_json(rows_to_dicts(events)), ("events",), generation)
+        return cached.to_response(request.headers.get("if-none-match"))
+
+    async def export_events(
+        self,
+        format: Literal["csv", "ndjson"] = "csv",
+        gzip: bool = False,
+        status: Optional[model.EventStatus] = None,
+        location: Optional[str] = None,
+        start_date: Optional[str] = None,
+        end_date: Optional[str] = None,
+        db: Session = Depends(get_db),
+        user=Depends(get_current_user)
+    ) -> StreamingResponse:
+        parsed_start_date, parsed_end_date = _parse_dates(start_date, end_date)
+        chunks = async_crud.stream_events(
+            db, status, location, parsed_start_date, parsed_end_date, EVENT_RESPONSE_COLUMNS, EXPORT_CHUNK_SIZE
+        )
+        return _export_response(db, chunks, EVENT_RESPONSE_COLUMNS, format, gzip, "events")
+
+    async def export_attendees(
+        self,
+        event_id: int,
+        format: Literal["csv", "ndjson"] = "csv",
+        gzip: bool = False,
+        check_in_status: Optional[bool] = None,
+        db: Session = Depends(get_db),
+        user=Depends(get_current_user)
+    ) -> StreamingResponse:
+        if not await async_crud.get_event(db, event_id):
+            raise HTTPException(status_code=404, detail="Event not found")
+        chunks = async_crud.stream_attendees(
+            db, event_id, ATTENDEE_RESPONSE_COLUMNS, check_in_status, chunk_size=EXPORT_CHUNK_SIZE
+        )
+        return _export_response(db, chunks, ATTENDEE_RESPONSE_COLUMNS, format, gzip, f"event-{event_id}-attendees")
+
+    async def _list_events_body(self, status, location, start_date, end_date, skip, limit, cursor, db) -> bytes:
+        parsed_start_date, parsed_end_date = _parse_dates(start_date, end_date)
+
+        # Cursor mode (`cursor=` for the first page) pages by key instead of offset
+        if cursor is not None:
+            after = _decode_cursor(cursor) if cursor else None
+            events = await async_crud.get_events_page(
+                db, status, location, parsed_start_date, parsed_end_date, after, limit, EVENT_RESPONSE_COLUMNS
+            )
+            next_cursor = _encode_cursor(events[limit - 1]) if len(events) > limit else None
+            return dump_json({"events": rows_to_dicts(events[:limit]), "next_cursor": next_cursor})
 
         # Fetch events using the updated date filters
-        events = crud.get_events(db, status, location, parsed_start_date, parsed_end_date, skip, limit)
+        events = await async_crud.get_events(
+            db, status, location, parsed_start_date, parsed_end_date, skip, limit, EVENT_RESPONSE_COLUMNS
+        )
 
         if not events:
             raise HTTPException(status_code=404, detail="No events found")
         
-        return [schema.EventResponse.model_validate(event) for event in events]
+        return dump_json(rows_to_dicts(events))
+
+    async def get_event(self, event_id: int, request: Request, db: Session = Depends(get_db),user=Depends(get_current_user)):
+        cache_key = ("event", event_id)
+        cached = event_responses.get(cache_key)
+        if cached is None:
+            generation = event_responses.generation
+            event = await async_crud.get_event(db, event_id)
+            if not event:
+                raise HTTPException(status_code=404, detail="Event not found")
+            body = schema.EventResponse.model_validate(event).model_dump_json().encode()
+            cached = event_responses.set(cache_key, body, (f"event:{event_id}",), generation)
+        return cached.to_response(request.headers.get("if-none-match"))
 
-    async def get_event(self, event_id: int, db: Session = Depends(get_db),user=Depends(get_current_user)):
-        event = crud.get_event(db, event_id)
-        if not event:
+    async def get_event_stats(self, event_id: int, db: Session = Depends(get_db), user=Depends(get_current_user)):
+        stats = await async_crud.get_event_stats(db, [event_id])
+        if not stats:
             raise HTTPException(status_code=404, detail="Event not found")
-        return schema.EventResponse.model_validate(event)
-    
\ No newline at end of file
+        return _event_stats(stats[0])
+
+    async def list_event_stats(
+        self, event_ids: List[int], db: Session = Depends(get_db), user=Depends(get_current_user)
+    ) -> List[schema.EventStats]:
+        # Unknown IDs are left out rather than failing the whole dashboard
+        event_ids = list(dict.fromkeys(event_ids))
+        if not event_ids:
+            raise HTTPException(status_code=400, detail="Pass at least one event_ids")
+        if len(event_ids) > MAX_STATS_EVENTS:
+            raise HTTPException(status_code=400, detail=f"At most {MAX_STATS_EVENTS} event_ids per request")
+        return [_event_stats(row) for row in await async_crud.get_event_stats(db, event_ids)]
+
+
+def _event_stats(row) -> schema.EventStats:
+    return schema.EventStats(
+        event_id=row.event_id,
+        max_attendees=row.max_attendees,
+        registered_count=row.registered_count,
+        checked_in_count=row.checked_in_count,
+        remaining_seats=max(row.max_attendees - row.registered_count, 0),
+    )
+
+def _parse_dates(start_date: Optional[str], end_date: Optional[str]) -> Tuple[Optional[datetime], Optional[datetime]]:
+    # Convert `start_date` and `end_date` strings to datetime objects
+    parsed_start_date, parsed_end_date = None, None
+    try:
+        if start_date:
+            parsed_start_date = datetime.strptime(start_date, "%Y-%m-%d")
+        if end_date:
+            parsed_end_date = datetime.strptime(end_date, "%Y-%m-%d")
+    except ValueError:
+        raise HTTPException(status_code=400, detail="Invalid date format. Use YYYY-MM-DD.")
+    return parsed_start_date, parsed_end_date
+
+def _export_response(db: Session, chunks, columns, format: str, gzip: bool, name: str) -> StreamingResponse:
+    fieldnames = [column.key for column in columns]
+    body = iter_csv(chunks, fieldnames) if format == "csv" else iter_ndjson(chunks)
+    filename = f"{name}.{format}"
+    media_type = EXPORT_MEDIA_TYPES[format]
+    if gzip:
+        body, filename, media_type = iter_gzip(body), filename + ".gz", "application/gzip"
+    return StreamingResponse(
+        _close_when_done(db, body),
+        media_type=media_type,
+        headers={"Content-Disposition": f'attachment; filename="{filename}"'},
+    )
+
+async def _close_when_done(db: Session, body):
+    # get_db has closed the session before the body streams; the export query
+    # runs on the reused session, which is closed again once the body is sent
+    try:
+        async for chunk in body:
+            yield chunk
+    finally:
+        await async_crud.close(db)
+
+def _encode_cursor(event: model.Event) -> str:
+    start_time = event.start_time.isoformat() if event.start_time else None
+    return base64.urlsafe_b64encode(json.dumps([start_time, event.event_id]).encode()).decode()
+
+def _decode_cursor(cursor: str) -> Tuple[Optional[datetime], int]:
+    try:
+        start_time, event_id = json.loads(base64.urlsafe_b64decode(cursor.encode()))
+        return (datetime.fromisoformat(start_time) if start_time else None), int(event_id)
+    except (ValueError, TypeError):
+        raise HTTPException(status_code=400, detail="Invalid cursor")
@@ -0,0 +1,58 @@
+import asyncio
+from typing import Optional
+from fastapi import HTTPException, WebSocket, WebSocketDisconnect, status
+from fastapi.security.utils import get_authorization_scheme_param
+from sqlalchemy.orm import Session
+from app import async_crud
+from app.auth import get_current_user
+from app.broadcast import checkin_hub
+
+
+class FeedView:
+    async def check_in_feed(self, websocket: WebSocket, event_id: int, token: Optional[str], db: Session):
+        # Browsers can't set headers on a WebSocket, so the token may also come as ?token=
+        if not token:
+            scheme, token = get_authorization_scheme_param(websocket.headers.get("authorization"))
+            token = token if scheme.lower() == "bearer" else None
+        try:
+            if not token:
+                raise HTTPException(status_code=401)
+            await get_current_user(token, db)
+            event = await async_crud.get_event(db, event_id)
+        except HTTPException:
+            await websocket.close(code=status.WS_1008_POLICY_VIOLATION, reason="Invalid authentication credentials")
+            return
+        finally:
+            # The feed never touches the database again; don't hold a connection for its lifetime
+            await async_crud.close(db)
+        if not event:
+            await websocket.close(code=status.WS_1008_POLICY_VIOLATION, reason="Event not found")
+            return
+
+        subscription = checkin_hub.subscribe(event_id)
+        try:
+            await websocket.accept()
+            disconnected = asyncio.ensure_future(_wait_for_disconnect(websocket))
+            try:
+                while True:
+                    message = asyncio.ensure_future(subscription.get())
+                    await asyncio.wait((message, disconnected), return_when=asyncio.FIRST_COMPLETED)
+                    if not message.done():
+                        message.cancel()
+                        return
+                    if message.result() is None:
+                        await websocket.close(code=status.WS_1013_TRY_AGAIN_LATER, reason="Too slow; reconnect")
+                        return
+                    await websocket.send_text(message.result())
+            finally:
+                disconnected.cancel()
+        except WebSocketDisconnect:
+            pass
+        finally:
+            checkin_hub.unsubscribe(subscription)
+
+
+async def _wait_for_disconnect(websocket: WebSocket):
+    # The feed is one-way; anything the client sends is ignored
+    while (await websocket.receive())["type"] != "websocket.disconnect":
+        pass
@@ -0,0 +1,96 @@
+"""Bulk check-in cost at 1k/10k/100k IDs: per-ID loop (before) vs set-based UPDATE (after).
+
+Run from the repository root:
+
+    python -m benchmarks.bench_bulk_check_in --sizes 1000 10000 100000
+
+Each size seeds a fresh SQLite file where 80% of the IDs are pending, 10% are
+already checked in and 10% don't exist, then times both implementations and
+counts the SQL statements they issue.
+"""
+import argparse
+import os
+import tempfile
+import time
+
+from sqlalchemy import create_engine, event, insert
+from sqlalchemy.orm import sessionmaker
+
+from app import crud
+from app.db import Base
+from app.models import model
+
+
+def legacy_bulk_check_in(db, attendee_ids):
+    """The original implementation: one SELECT per ID, one refresh per update."""
+    updated_attendees = []
+    for attendee_id in attendee_ids:
+        attendee = db.query(model.Attendee).filter(model.Attendee.attendee_id == attendee_id).first()
+        if attendee and not attendee.check_in_status:
+            attendee.check_in_status = True
+            updated_attendees.append(attendee)
+    if updated_attendees:
+        db.commit()
+        for attendee in updated_attendees:
+            db.refresh(attendee)
+    return updated_attendees
+
+
+def seed(path: str, size: int):
+    engine = create_engine(f"sqlite:///{path}")
+    Base.metadata.create_all(bind=engine)
+    existing = size - size // 10
+    with engine.begin() as conn:
+        conn.execute(insert(model.Event), [{"event_id": 1, "name": "Expo", "location": "Hall", "max_attendees": size}])
+        conn.execute(
+            insert(model.Attendee),
+            [
+                {
+                    "attendee_id": i,
+                    "first_name": "Guest",
+                    "last_name": str(i),
+                    "email": f"guest{i}@example.com",
+                    "phone_number": "1234567890",
+                    "event_id": 1,
+                    "check_in_status": i % 9 == 0,
+                }
+                for i in range(1, existing + 1)
+            ],
+        )
+    return engine, list(range(1, size + 1))
+
+
+def measure(fn, path: str, size: int):
+    engine, ids = seed(path, size)
+    statements = 0
+
+    @event.listens_for(engine, "before_cursor_execute")
+    def count(*_):
+        nonlocal statements
+        statements += 1
+
+    with sessionmaker(bind=engine, autoflush=False)() as db:
+        started = time.perf_counter()
+        fn(db, ids)
+        elapsed = time.perf_counter() - started
+    engine.dispose()
+    os.remove(path)
+    return elapsed, statements
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--sizes", type=int, nargs="+", default=[1000, 10000, 100000])
+    args = parser.parse_args()
+
+    print(f"{'ids':>8} {'before s':>10} {'stmts':>8} {'after s':>10} {'stmts':>8} {'speedup':>8}")
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "bulk.sqlite")
+        for size in args.sizes:
+            before, before_stmts = measure(legacy_bulk_check_in, path, size)
+            after, after_stmts = measure(crud.bulk_check_in, path, size)
+            print(f"{size:>8} {before:>10.3f} {before_stmts:>8} {after:>10.3f} {after_stmts:>8} {before / after:>7.1f}x")
+
+
+if __name__ == "__main__":
+    main()
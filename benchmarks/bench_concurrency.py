@@ -0,0 +1,132 @@
+"""Throughput at 1/16/128 concurrent clients with sync vs async database sessions.
+
+Run from the repository root:
+
+    python -m benchmarks.bench_concurrency --requests 2000
+
+Each mode runs in a fresh interpreter against the same seeded SQLite file,
+because ``config.USE_ASYNC_DB`` is read once at import time. The pool timeout is
+lowered so the sync mode reports its pool starvation as errors instead of
+stalling for 30 seconds per request once clients outnumber pooled connections.
+"""
+import argparse
+import asyncio
+import json
+import os
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import datetime, timedelta
+
+MODES = {"sync (before)": "false", "async (after)": "true"}
+
+
+def seed(events: int):
+    from app.db import Base, SessionLocal, engine
+    from app.models import model
+
+    Base.metadata.create_all(bind=engine)
+    db = SessionLocal()
+    try:
+        if not db.query(model.User).first():
+            db.add(model.User(username="bench", email="bench@example.com", hashed_password="x", role="admin"))
+            start = datetime(2030, 1, 1)
+            db.add_all(
+                model.Event(
+                    name=f"Event {i}",
+                    description="benchmark",
+                    location=f"City {i % 20}",
+                    start_time=start + timedelta(hours=i),
+                    end_time=start + timedelta(hours=i + 2),
+                    max_attendees=100,
+                )
+                for i in range(events)
+            )
+            db.commit()
+        user = db.query(model.User).first()
+        event_ids = [row[0] for row in db.query(model.Event.event_id).all()]
+        return user.user_id, event_ids
+    finally:
+        db.close()
+
+
+async def run_load(client, event_ids, clients: int, total: int) -> dict:
+    remaining = iter(range(total))
+    errors = 0
+
+    async def client_loop():
+        nonlocal errors
+        for i in remaining:
+            try:
+                if i % 2:
+                    response = await client.get(f"/events/{event_ids[i % len(event_ids)]}")
+                else:
+                    response = await client.get("/events", params={"limit": 10, "skip": i % 50})
+                response.raise_for_status()
+            except Exception:
+                # e.g. QueuePool timeouts once a blocked loop starves the sync pool
+                errors += 1
+
+    started = time.perf_counter()
+    await asyncio.gather(*(client_loop() for _ in range(clients)))
+    return {"rps": total / (time.perf_counter() - started), "errors": errors}
+
+
+async def run_all(args, user_id, event_ids) -> dict:
+    import httpx
+    from app.auth import create_access_token
+    from app.db import async_engine
+    from app.main import app
+
+    headers = {"Authorization": f"Bearer {create_access_token({'sub': str(user_id)})}"}
+    transport = httpx.ASGITransport(app=app)
+    results = {}
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench", headers=headers) as client:
+        for clients in args.clients:
+            results[clients] = await run_load(client, event_ids, clients, args.requests)
+    if async_engine is not None:
+        await async_engine.dispose()
+    return results
+
+
+def worker(args):
+    user_id, event_ids = seed(args.events)
+    print(json.dumps(asyncio.run(run_all(args, user_id, event_ids))))
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--requests", type=int, default=2000, help="requests per concurrency level")
+    parser.add_argument("--clients", type=int, nargs="+", default=[1, 16, 128])
+    parser.add_argument("--events", type=int, default=500, help="events seeded into the database")
+    parser.add_argument("--pool-timeout", type=float, default=1.0, help="seconds to wait for a pooled connection")
+    parser.add_argument("--worker", action="store_true", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.worker:
+        return worker(args)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        db_url = f"sqlite:///{os.path.join(tmp, 'bench.sqlite')}"
+        table = {}
+        for label, use_async in MODES.items():
+            env = dict(os.environ, DATABASE_URL=db_url, USE_ASYNC_DB=use_async, DB_POOL_TIMEOUT=str(args.pool_timeout))
+            env.pop("ASYNC_DATABASE_URL", None)
+            out = subprocess.run(
+                [sys.executable, "-m", "benchmarks.bench_concurrency", "--worker",
+                 "--requests", str(args.requests), "--events", str(args.events),
+                 "--clients", *map(str, args.clients)],
+                env=env, check=True, capture_output=True, text=True,
+            ).stdout
+            table[label] = json.loads(out.strip().splitlines()[-1])
+
+    print(f"{'clients':>8} " + " ".join(f"{label:>24}" for label in table))
+    for clients in args.clients:
+        cells = (table[label][str(clients)] for label in table)
+        row = " ".join(f"{c['rps']:>10.1f} r/s {c['errors']:>5} err" for c in cells)
+        print(f"{clients:>8} {row}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,97 @@
+"""Page latency of GET /events queries: OFFSET pagination (before) vs keyset cursor (after).
+
+Run from the repository root:
+
+    python -m benchmarks.bench_event_pagination --events 1000000 --page-size 100
+
+Seeds a SQLite file with the given number of events, then reports the time to
+fetch pages 1, 10, 100, ... with ``crud.get_events`` (skip/limit) and with
+``crud.get_events_page`` (walking the keyset cursor from the first page).
+"""
+import argparse
+import os
+import statistics
+import tempfile
+import time
+from datetime import datetime, timedelta
+
+from sqlalchemy import create_engine, insert
+from sqlalchemy.orm import sessionmaker
+
+from app import crud
+from app.db import Base
+from app.models import model
+
+
+def seed(engine, events: int):
+    Base.metadata.create_all(bind=engine)
+    start = datetime(2030, 1, 1)
+    with engine.begin() as conn:
+        for offset in range(0, events, 50_000):
+            conn.execute(
+                insert(model.Event),
+                [
+                    {
+                        "name": f"Event {i}",
+                        "location": f"City {i % 50}",
+                        # Many events share a start time, so the event_id tie-break matters
+                        "start_time": start + timedelta(minutes=(i * 7919) % (events // 4 or 1)),
+                        "max_attendees": 100,
+                        "status": model.EventStatus.scheduled,
+                    }
+                    for i in range(offset, min(offset + 50_000, events))
+                ],
+            )
+
+
+def timed(fn, repeat: int = 3) -> float:
+    samples = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        fn()
+        samples.append(time.perf_counter() - started)
+    return statistics.median(samples) * 1000
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--events", type=int, default=1_000_000)
+    parser.add_argument("--page-size", type=int, default=100)
+    args = parser.parse_args()
+
+    last_page = args.events // args.page_size
+    checkpoints = [p for p in (1, 10, 100, 1000, 10_000, 100_000) if p <= last_page]
+
+    with tempfile.TemporaryDirectory() as tmp:
+        engine = create_engine(f"sqlite:///{os.path.join(tmp, 'events.sqlite')}")
+        print(f"seeding {args.events} events...")
+        seed(engine, args.events)
+        db = sessionmaker(bind=engine)()
+
+        crud.get_events_page(db, limit=args.page_size)  # Warm the page cache
+        db.expunge_all()
+        keyset_ms = {}
+        after = None
+        for page in range(1, checkpoints[-1] + 1):
+            started = time.perf_counter()
+            events = crud.get_events_page(db, after=after, limit=args.page_size)
+            elapsed = (time.perf_counter() - started) * 1000
+            if page in checkpoints:
+                keyset_ms[page] = elapsed
+            last = events[args.page_size - 1]
+            after = (last.start_time, last.event_id)
+            db.expunge_all()
+
+        print(f"{'page':>8} {'offset ms':>10} {'keyset ms':>10}")
+        for page in checkpoints:
+            skip = (page - 1) * args.page_size
+            offset_ms = timed(lambda: crud.get_events(db, skip=skip, limit=args.page_size))
+            db.expunge_all()
+            print(f"{page:>8} {offset_ms:>10.2f} {keyset_ms[page]:>10.2f}")
+
+        db.close()
+        engine.dispose()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,104 @@
+"""Encoding throughput of 10k-row list responses: ORM + pydantic (before) vs column rows + orjson (after).
+
+Run from the repository root:
+
+    python -m benchmarks.bench_list_serialization --rows 10000
+
+"Before" is what the list views used to do: load ORM objects, ``model_validate``
+each one, then let FastAPI validate and serialize against ``response_model``
+and render the result with the stdlib json encoder. "After" selects
+``crud.*_RESPONSE_COLUMNS`` and encodes the rows with orjson the way the list
+views do, ``dump_json(rows_to_dicts(rows))`` (the attendee list per streamed chunk).
+Both include the query; bytes/sec is the size of the response body over time.
+"""
+import argparse
+import asyncio
+import statistics
+import time
+from datetime import datetime, timedelta
+from typing import List
+
+from fastapi.responses import JSONResponse
+from fastapi.routing import serialize_response
+from fastapi.utils import create_model_field
+from sqlalchemy import create_engine, insert
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import StaticPool
+
+from app import crud, schema
+from app.db import Base
+from app.models import model
+from app.responses import dump_json, rows_to_dicts
+
+
+def seed(engine, rows: int):
+    Base.metadata.create_all(bind=engine)
+    start = datetime(2030, 1, 1)
+    with engine.begin() as conn:
+        conn.execute(insert(model.Event), [
+            {"event_id": i, "name": f"Event {i}", "description": "A fairly ordinary event description",
+             "location": f"City {i % 50}", "start_time": start + timedelta(hours=i),
+             "end_time": start + timedelta(hours=i + 2), "max_attendees": 100, "status": model.EventStatus.scheduled}
+            for i in range(1, rows + 1)
+        ])
+        conn.execute(insert(model.Attendee), [
+            {"attendee_id": i, "first_name": "Guest", "last_name": str(i), "email": f"guest{i}@example.com",
+             "phone_number": "1234567890", "event_id": 1, "check_in_status": i % 3 == 0}
+            for i in range(1, rows + 1)
+        ])
+
+
+def before(db, load, entity, response_schema) -> bytes:
+    field = create_model_field("response", List[response_schema], mode="serialization")
+    content = [response_schema.model_validate(obj) for obj in load(db, (entity,))]
+    encoded = asyncio.run(serialize_response(field=field, response_content=content))
+    return JSONResponse(encoded).body
+
+
+def after(db, load, columns) -> bytes:
+    return dump_json(rows_to_dicts(load(db, columns)))
+
+
+def measure(fn, SessionLocal, repeat: int):
+    samples, body = [], b""
+    for _ in range(repeat):
+        with SessionLocal() as db:
+            started = time.perf_counter()
+            body = fn(db)
+            samples.append(time.perf_counter() - started)
+    return len(body), statistics.median(samples)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--rows", type=int, default=10_000)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    engine = create_engine("sqlite://", poolclass=StaticPool)
+    seed(engine, args.rows)
+    SessionLocal = sessionmaker(bind=engine)
+
+    endpoints = {
+        "GET /events": (
+            lambda db, columns: crud.get_events(db, limit=args.rows, columns=columns),
+            model.Event, schema.EventResponse, crud.EVENT_RESPONSE_COLUMNS,
+        ),
+        "GET /attendees/{id}": (
+            lambda db, columns: crud.get_attendees(db, 1, columns=columns),
+            model.Attendee, schema.AttendeeResponse, crud.ATTENDEE_RESPONSE_COLUMNS,
+        ),
+    }
+
+    print(f"{'endpoint':<20} {'bytes':>9} {'before ms':>10} {'MB/s':>7} {'after ms':>9} {'MB/s':>7} {'speedup':>8}")
+    for name, (load, entity, response_schema, columns) in endpoints.items():
+        size, slow = measure(lambda db: before(db, load, entity, response_schema), SessionLocal, args.repeat)
+        fast_size, fast = measure(lambda db: after(db, load, columns), SessionLocal, args.repeat)
+        print(f"{name:<20} {fast_size:>9} {slow * 1000:>10.1f} {size / slow / 1e6:>7.1f} "
+              f"{fast * 1000:>9.1f} {fast_size / fast / 1e6:>7.1f} {slow / fast:>7.1f}x")
+
+    engine.dispose()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,111 @@
+"""Latency of a non-auth endpoint during a login storm: bcrypt on the event loop (before) vs the hashing pool (after).
+
+Run from the repository root:
+
+    python -m benchmarks.bench_login_storm --logins 40 --concurrency 8
+
+A probe client fetches ``GET /events/{id}`` back to back while the given number
+of logins run concurrently. Probe latency is reported with no logins, with
+bcrypt run inline in the request (the old behaviour) and with bcrypt dispatched
+to ``auth``'s hashing pool.
+"""
+import argparse
+import asyncio
+import os
+import statistics
+import tempfile
+import time
+
+
+async def probe(client, event_id: int, stop: asyncio.Event) -> list:
+    samples = []
+    while not stop.is_set():
+        started = time.perf_counter()
+        response = await client.get(f"/events/{event_id}")
+        response.raise_for_status()
+        samples.append((time.perf_counter() - started) * 1000)
+        await asyncio.sleep(0)
+    return samples
+
+
+async def login_storm(client, logins: int, concurrency: int):
+    remaining = iter(range(logins))
+
+    async def login_loop():
+        for _ in remaining:
+            response = await client.post("/auth/login", json={"email": "storm@example.com", "password": "storm-password"})
+            response.raise_for_status()
+
+    await asyncio.gather(*(login_loop() for _ in range(concurrency)))
+
+
+async def measure(client, event_id: int, args, storm: bool) -> dict:
+    stop = asyncio.Event()
+    probe_task = asyncio.create_task(probe(client, event_id, stop))
+    started = time.perf_counter()
+    if storm:
+        await login_storm(client, args.logins, args.concurrency)
+    else:
+        await asyncio.sleep(args.idle_seconds)
+    elapsed = time.perf_counter() - started
+    stop.set()
+    samples = sorted(await probe_task)
+    return {
+        "seconds": elapsed,
+        "probes": len(samples),
+        "p50": statistics.median(samples),
+        "p99": samples[min(len(samples) - 1, int(len(samples) * 0.99))],
+        "max": samples[-1],
+    }
+
+
+async def run(args):
+    import httpx
+    from app import auth
+    from app.db import Base, SessionLocal, engine
+    from app.main import app
+    from app.models import model
+
+    Base.metadata.create_all(bind=engine)
+    with SessionLocal() as db:
+        user = model.User(username="storm", email="storm@example.com",
+                          hashed_password=auth.get_password_hash("storm-password"))
+        event = model.Event(name="Probe", location="Hall", max_attendees=10)
+        db.add_all([user, event])
+        db.commit()
+        user_id, event_id = user.user_id, event.event_id
+
+    async def verify_inline(plain_password, hashed_password):
+        return auth.pwd_context.verify_and_update(plain_password, hashed_password)
+
+    headers = {"Authorization": f"Bearer {auth.create_access_token({'sub': str(user_id)})}"}
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench", headers=headers, timeout=None) as client:
+        results = {"idle": await measure(client, event_id, args, storm=False)}
+        pooled = auth.verify_password_async
+        auth.verify_password_async = verify_inline
+        results["storm, inline (before)"] = await measure(client, event_id, args, storm=True)
+        auth.verify_password_async = pooled
+        results["storm, pool (after)"] = await measure(client, event_id, args, storm=True)
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--logins", type=int, default=40)
+    parser.add_argument("--concurrency", type=int, default=8)
+    parser.add_argument("--idle-seconds", type=float, default=2.0)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        os.environ["DATABASE_URL"] = f"sqlite:///{os.path.join(tmp, 'storm.sqlite')}"
+        os.environ.setdefault("USE_ASYNC_DB", "false")
+        results = asyncio.run(run(args))
+
+    print(f"{'phase':<24} {'seconds':>8} {'probes':>7} {'p50 ms':>8} {'p99 ms':>8} {'max ms':>8}")
+    for phase, r in results.items():
+        print(f"{phase:<24} {r['seconds']:>8.2f} {r['probes']:>7} {r['p50']:>8.2f} {r['p99']:>8.2f} {r['max']:>8.2f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,125 @@
+"""Overhead of the request/DB metrics: the app with METRICS_ENABLED=false vs true.
+
+Run from the repository root:
+
+    python -m benchmarks.bench_metrics --rounds 3 --requests 500
+
+Two measurements:
+
+* ``hooks``: the cost the instrumentation adds per request and per statement,
+  timed in isolation: ``MetricsMiddleware`` around a bare ASGI app, and
+  ``SELECT 1`` on an in-memory engine before and after ``instrument_engine``.
+* ``routes``: ``bench_routes run`` for a few cheap routes (where any overhead
+  shows the most), in a fresh process per setting since settings are read at
+  import time. Settings alternate over ``--rounds`` and the median is reported.
+  ``bench_routes`` counts statements with its own cursor listener, so both
+  settings pay SQLAlchemy's event dispatch there; ``hooks`` includes it.
+"""
+import argparse
+import asyncio
+import json
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+
+ROUTES = ["GET /events/{event_id}", "GET /events/{event_id}/stats", "GET /events", "PUT /attendees/check-in/{attendee_id}"]
+
+
+def time_asgi(app, scope, iterations: int) -> float:
+    async def receive():
+        return {"type": "http.request", "body": b"", "more_body": False}
+
+    async def send(message):
+        pass
+
+    async def loop():
+        started = time.perf_counter()
+        for _ in range(iterations):
+            await app(dict(scope), receive, send)
+        return time.perf_counter() - started
+
+    return asyncio.run(loop()) / iterations
+
+
+def hooks(iterations: int) -> dict:
+    from types import SimpleNamespace
+    from sqlalchemy import create_engine
+    from app.metrics import MetricsMiddleware, instrument_engine
+
+    async def endpoint(scope, receive, send):
+        await send({"type": "http.response.start", "status": 200, "headers": []})
+        await send({"type": "http.response.body", "body": b"{}"})
+
+    scope = {"type": "http", "method": "GET", "path": "/events/1", "route": SimpleNamespace(path="/events/{event_id}")}
+    bare, metered = time_asgi(endpoint, scope, iterations), time_asgi(MetricsMiddleware(endpoint), scope, iterations)
+
+    engine = create_engine("sqlite://")
+    with engine.connect() as conn:
+        def statements():
+            started = time.perf_counter()
+            for _ in range(iterations):
+                conn.exec_driver_sql("SELECT 1").scalar()
+            return (time.perf_counter() - started) / iterations
+        plain = statements()
+        instrument_engine(engine, "bench")
+        instrumented = statements()
+    return {
+        "request_us": round(bare * 1e6, 2), "request_metered_us": round(metered * 1e6, 2),
+        "middleware_overhead_us": round((metered - bare) * 1e6, 2),
+        "statement_us": round(plain * 1e6, 2), "statement_metered_us": round(instrumented * 1e6, 2),
+        "statement_overhead_us": round((instrumented - plain) * 1e6, 2),
+    }
+
+
+def run_routes(enabled: bool, args, out: str) -> dict:
+    env = {**os.environ, "METRICS_ENABLED": str(enabled).lower()}
+    command = [sys.executable, "-m", "benchmarks.bench_routes", "run", "--requests", str(args.requests),
+               "--concurrency", *map(str, args.concurrency), "--out", out, "--routes", *args.routes]
+    subprocess.run(command, env=env, check=True, stderr=subprocess.DEVNULL)
+    with open(out) as f:
+        return {(r["route"], r["concurrency"]): r for r in json.load(f)["results"]}
+
+
+def routes(args) -> list:
+    runs = {False: [], True: []}
+    with tempfile.TemporaryDirectory() as tmp:
+        for i in range(args.rounds):
+            # Alternate the order so drift (thermal, page cache) doesn't favour one setting
+            for enabled in ((False, True) if i % 2 == 0 else (True, False)):
+                runs[enabled].append(run_routes(enabled, args, os.path.join(tmp, f"{enabled}-{i}.json")))
+                print(f"round {i + 1}/{args.rounds} metrics {'on' if enabled else 'off'} done", file=sys.stderr)
+
+    results = []
+    for key in sorted(runs[False][0]):
+        off = {m: statistics.median(run[key][m] for run in runs[False]) for m in ("p50_ms", "rps")}
+        on = {m: statistics.median(run[key][m] for run in runs[True]) for m in ("p50_ms", "rps")}
+        results.append({
+            "route": key[0], "concurrency": key[1],
+            "p50_ms_off": off["p50_ms"], "p50_ms_on": on["p50_ms"],
+            "rps_off": off["rps"], "rps_on": on["rps"],
+            "rps_change": round(on["rps"] / off["rps"] - 1, 4),
+        })
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--iterations", type=int, default=100_000, help="calls per hook measurement")
+    parser.add_argument("--rounds", type=int, default=3)
+    parser.add_argument("--requests", type=int, default=500, help="requests per route and concurrency level")
+    parser.add_argument("--concurrency", type=int, nargs="+", default=[1, 8])
+    parser.add_argument("--routes", nargs="+", default=ROUTES)
+    args = parser.parse_args()
+
+    report = {"hooks": hooks(args.iterations), "routes": routes(args) if args.rounds else []}
+    for result in report["routes"]:
+        print(f"{result['route']:<40} c={result['concurrency']:<4} p50 {result['p50_ms_off']:.3f}→{result['p50_ms_on']:.3f}ms "
+              f"rps {result['rps_off']:.1f}→{result['rps_on']:.1f} ({result['rps_change']:+.1%})", file=sys.stderr)
+    print(json.dumps(report, indent=2))
+
+
+if __name__ == "__main__":
+    main()
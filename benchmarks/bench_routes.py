@@ -0,0 +1,261 @@
+"""Latency, throughput and DB queries per request of every HTTP route, against a seeded SQLite file.
+
+Run from the repository root:
+
+    python -m benchmarks.bench_routes run --requests 200 --concurrency 1 16 --out before.json
+    python -m benchmarks.bench_routes compare before.json after.json --threshold 0.1
+
+``run`` seeds a fresh SQLite database, then drives each route through
+``httpx.AsyncClient`` over ``ASGITransport`` (no sockets) with the given
+number of concurrent clients. It reports p50/p95/p99 latency, requests per
+second and DB statements per request as JSON; routes in ``app/routers`` without
+a scenario below are listed under ``uncovered``. Each scenario runs on its own,
+so its statement count divided by its requests is exact even with concurrency.
+
+``compare`` matches two runs by route and concurrency and exits non-zero when
+p95 latency or throughput got worse by more than ``--threshold`` (relative), or
+when a route issues more queries per request than before.
+
+Passwords are hashed at ``--bcrypt-rounds`` (default 4) so the auth routes
+measure the request path rather than bcrypt's configured cost.
+"""
+import argparse
+import asyncio
+import json
+import os
+import platform
+import statistics
+import sys
+import tempfile
+import time
+from datetime import datetime, timedelta
+
+START = datetime(2030, 1, 1)
+
+
+def event_row(event_id: int) -> dict:
+    return {
+        "event_id": event_id, "name": f"Event {event_id}", "description": "Benchmark event",
+        "location": f"City {event_id % 20}", "start_time": START + timedelta(hours=event_id),
+        "end_time": START + timedelta(hours=event_id + 2), "max_attendees": 1_000_000, "status": "scheduled",
+    }
+
+
+def seed(args):
+    from sqlalchemy import insert
+    from app import auth
+    from app.db import Base, engine
+    from app.models import model
+
+    Base.metadata.create_all(bind=engine)
+    with engine.begin() as conn:
+        conn.execute(insert(model.User), [
+            {"user_id": 1, "username": "admin", "email": "admin@example.com", "role": "admin",
+             "hashed_password": auth.get_password_hash("bench-password")},
+        ])
+        conn.execute(insert(model.Event), [
+            {**event_row(i), "status": model.EventStatus.scheduled} for i in range(1, args.events + 1)
+        ])
+        per_event = args.attendees // args.attendee_events
+        conn.execute(insert(model.Attendee), [
+            {"attendee_id": i, "first_name": "Guest", "last_name": str(i), "email": f"guest{i}@example.com",
+             "phone_number": "1234567890", "event_id": (i - 1) // per_event + 1, "check_in_status": False}
+            for i in range(1, per_event * args.attendee_events + 1)
+        ])
+        conn.execute(
+            model.Event.__table__.update()
+            .where(model.Event.event_id <= args.attendee_events)
+            .values(registered_count=per_event)
+        )
+
+
+def scenarios(args) -> dict:
+    """Route → request factory; ``i`` is the request's index within the scenario."""
+    events, attendee_events = args.events, args.attendee_events
+    attendees = args.attendees // attendee_events * attendee_events
+
+    def attendee(tag, i, n=0):
+        return {"first_name": "New", "last_name": "Guest", "email": f"{tag}{i}-{n}@example.com",
+                "phone_number": "1234567890", "event_id": i % attendee_events + 1}
+
+    def event_update(i):
+        row = event_row(i % events + 1)
+        return {**row, "name": f"Renamed {i}", "start_time": row["start_time"].isoformat(),
+                "end_time": row["end_time"].isoformat()}
+
+    def check_in_csv(i):
+        first = (i * 100) % attendees + 1
+        ids = "\n".join(str(attendee_id) for attendee_id in range(first, min(first + 100, attendees + 1)))
+        return {"files": {"file": ("ids.csv", ids.encode(), "text/csv")}}
+
+    return {
+        "POST /auth/register": lambda i: ("POST", "/auth/register", {"json": {
+            "username": f"user{i}", "email": f"user{i}@example.com", "password": "bench-password"}}),
+        "POST /auth/login": lambda i: ("POST", "/auth/login", {"json": {
+            "email": "admin@example.com", "password": "bench-password"}}),
+        "GET /auth/cache-stats": lambda i: ("GET", "/auth/cache-stats", {}),
+        "POST /events": lambda i: ("POST", "/events", {"json": {
+            "name": f"New {i}", "location": "City 1", "max_attendees": 100,
+            "start_time": (START + timedelta(days=400, hours=i)).isoformat()}}),
+        "PUT /events/{event_id}": lambda i: ("PUT", f"/events/{i % events + 1}", {"json": event_update(i)}),
+        "GET /events": lambda i: ("GET", "/events", {"params": {"location": f"City {i % 20}", "limit": 50}}),
+        "GET /events?cursor": lambda i: ("GET", "/events", {"params": {"cursor": "", "limit": 50, "status": "scheduled"}}),
+        "GET /events/search": lambda i: ("GET", "/events/search", {"params": {"q": f"city {i % 20}", "limit": 10}}),
+        "GET /events/export": lambda i: ("GET", "/events/export", {"params": {"location": f"City {i % 20}"}}),
+        "GET /events/stats": lambda i: ("GET", "/events/stats", {"params": {
+            "event_ids": [(i + n) % events + 1 for n in range(20)]}}),
+        "GET /events/{event_id}/stats": lambda i: ("GET", f"/events/{i % events + 1}/stats", {}),
+        "GET /events/{event_id}/attendees/export": lambda i: (
+            "GET", f"/events/{i % attendee_events + 1}/attendees/export", {}),
+        "GET /events/{event_id}": lambda i: ("GET", f"/events/{i % events + 1}", {}),
+        "GET /events/{event_id}?profile": lambda i: ("GET", f"/events/{i % events + 1}", {"headers": {"X-Profile": "stacks"}}),
+        "POST /attendees": lambda i: ("POST", "/attendees", {"json": attendee("single", i)}),
+        "POST /attendees/bulk": lambda i: ("POST", "/attendees/bulk", {"json": [
+            attendee("bulk", i, n) for n in range(50)]}),
+        "PUT /attendees/check-in/{attendee_id}": lambda i: ("PUT", f"/attendees/check-in/{i % attendees + 1}", {}),
+        "GET /attendees/{event_id}": lambda i: ("GET", f"/attendees/{i % attendee_events + 1}", {}),
+        "POST /attendees/bulk-check-in/": lambda i: ("POST", "/attendees/bulk-check-in/", check_in_csv(i)),
+        "GET /metrics": lambda i: ("GET", "/metrics", {}),
+        "GET /profiles": lambda i: ("GET", "/profiles", {}),
+    }
+
+
+def percentile(samples, q: int) -> float:
+    return statistics.quantiles(samples, n=100, method="inclusive")[q - 1] if len(samples) > 1 else samples[0]
+
+
+async def drive(client, factory, requests: int, concurrency: int, statements: list) -> dict:
+    latencies, errors, remaining = [], 0, iter(range(requests))
+
+    async def worker():
+        nonlocal errors
+        for i in remaining:
+            method, url, kwargs = factory(i)
+            started = time.perf_counter()
+            response = await client.request(method, url, **kwargs)
+            latencies.append((time.perf_counter() - started) * 1000)
+            errors += response.status_code >= 400
+
+    before = len(statements)
+    started = time.perf_counter()
+    await asyncio.gather(*(worker() for _ in range(concurrency)))
+    elapsed = time.perf_counter() - started
+    return {
+        "requests": requests, "errors": errors,
+        "p50_ms": round(percentile(latencies, 50), 3), "p95_ms": round(percentile(latencies, 95), 3),
+        "p99_ms": round(percentile(latencies, 99), 3), "rps": round(requests / elapsed, 1),
+        "queries_per_request": round((len(statements) - before) / requests, 2),
+    }
+
+
+async def run(args) -> dict:
+    import httpx
+    import sqlalchemy
+    from fastapi.routing import APIRoute
+    from sqlalchemy import event
+    from app import auth
+    from app.db import async_engine, engine
+    from app.main import app
+
+    seed(args)
+    statements = []
+    for sync_engine in filter(None, (engine, async_engine and async_engine.sync_engine)):
+        event.listen(sync_engine, "before_cursor_execute", lambda *a: statements.append(a[2]))
+
+    selected = scenarios(args)
+    if args.routes:
+        selected = {name: factory for name, factory in selected.items() if name in args.routes}
+    routes = {f"{method} {route.path}" for route in app.routes if isinstance(route, APIRoute) for method in route.methods}
+    covered = {name.split("?")[0] for name in scenarios(args)}
+
+    headers = {"Authorization": f"Bearer {auth.create_access_token({'sub': '1'}, timedelta(hours=12))}"}
+    results = []
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench", headers=headers, timeout=None) as client:
+        for name, factory in selected.items():
+            for concurrency in args.concurrency:
+                # Offsets keep writes of later passes from colliding with earlier ones
+                offset = concurrency * 1_000_000
+                result = await drive(client, lambda i: factory(offset + i), args.requests, concurrency, statements)
+                results.append({"route": name, "concurrency": concurrency, **result})
+                print(f"{name:<42} c={concurrency:<4} p50={result['p50_ms']:>8.2f}ms p95={result['p95_ms']:>8.2f}ms "
+                      f"rps={result['rps']:>8.1f} q/req={result['queries_per_request']:>6.2f} errors={result['errors']}",
+                      file=sys.stderr)
+
+    return {
+        "meta": {
+            "events": args.events, "attendees": args.attendees, "requests": args.requests,
+            "concurrency": args.concurrency, "bcrypt_rounds": args.bcrypt_rounds,
+            "python": platform.python_version(), "sqlalchemy": sqlalchemy.__version__,
+            "use_async_db": os.environ.get("USE_ASYNC_DB", "false"), "cpus": os.cpu_count(),
+        },
+        "results": results,
+        "uncovered": sorted(routes - covered),
+    }
+
+
+def compare(args) -> int:
+    with open(args.baseline) as f:
+        baseline = {(r["route"], r["concurrency"]): r for r in json.load(f)["results"]}
+    with open(args.current) as f:
+        current = {(r["route"], r["concurrency"]): r for r in json.load(f)["results"]}
+
+    regressions = 0
+    print(f"{'route':<42} {'c':>4} {'p95 ms':>17} {'rps':>17} {'q/req':>11}")
+    for key in sorted(baseline.keys() & current.keys()):
+        old, new = baseline[key], current[key]
+        flags = []
+        if new["p95_ms"] > old["p95_ms"] * (1 + args.threshold):
+            flags.append("p95")
+        if new["rps"] < old["rps"] * (1 - args.threshold):
+            flags.append("rps")
+        if new["queries_per_request"] > old["queries_per_request"]:
+            flags.append("queries")
+        regressions += bool(flags)
+        print(f"{key[0]:<42} {key[1]:>4} {old['p95_ms']:>8.2f}→{new['p95_ms']:<8.2f} {old['rps']:>8.1f}→{new['rps']:<8.1f} "
+              f"{old['queries_per_request']:>5.2f}→{new['queries_per_request']:<5.2f} {'REGRESSED: ' + ', '.join(flags) if flags else ''}")
+    for key in sorted(baseline.keys() ^ current.keys()):
+        print(f"{key[0]:<42} {key[1]:>4} only in {'baseline' if key in baseline else 'current'}")
+    print(f"{regressions} regression(s) beyond {args.threshold:.0%}")
+    return 1 if regressions else 0
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    commands = parser.add_subparsers(dest="command", required=True)
+    run_parser = commands.add_parser("run", help="benchmark every route and write JSON results")
+    run_parser.add_argument("--requests", type=int, default=200, help="requests per route and concurrency level")
+    run_parser.add_argument("--concurrency", type=int, nargs="+", default=[1, 16])
+    run_parser.add_argument("--events", type=int, default=2000)
+    run_parser.add_argument("--attendees", type=int, default=50_000)
+    run_parser.add_argument("--attendee-events", type=int, default=100, help="events the attendees are spread over")
+    run_parser.add_argument("--bcrypt-rounds", type=int, default=4)
+    run_parser.add_argument("--routes", nargs="*", help="only these scenarios, e.g. 'GET /events'")
+    run_parser.add_argument("--out", help="write JSON here instead of stdout")
+    compare_parser = commands.add_parser("compare", help="flag regressions between two runs")
+    compare_parser.add_argument("baseline")
+    compare_parser.add_argument("current")
+    compare_parser.add_argument("--threshold", type=float, default=0.1)
+    args = parser.parse_args()
+
+    if args.command == "compare":
+        sys.exit(compare(args))
+
+    with tempfile.TemporaryDirectory() as tmp:
+        # Settings are read at import time, so the app is only imported once these are set
+        os.environ["DATABASE_URL"] = f"sqlite:///{os.path.join(tmp, 'routes.sqlite')}"
+        os.environ["BCRYPT_ROUNDS"] = str(args.bcrypt_rounds)
+        os.environ["PROFILE_DIR"] = os.path.join(tmp, "profiles")
+        os.environ.setdefault("USE_ASYNC_DB", "false")
+        report = asyncio.run(run(args))
+
+    output = json.dumps(report, indent=2)
+    if args.out:
+        with open(args.out, "w") as f:
+            f.write(output + "\n")
+    else:
+        print(output)
+
+
+if __name__ == "__main__":
+    main()
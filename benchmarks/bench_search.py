@@ -0,0 +1,110 @@
+"""Latency of GET /events/search's query over a million events, against the LIKE scan it replaces.
+
+Run from the repository root:
+
+    python -m benchmarks.bench_search --events 1000000 --repeat 20
+    python -m benchmarks.bench_search --dataset large.sqlite
+
+Without ``--dataset``, a file of ``--events`` events (no attendees) is built with
+``benchmarks.generate_dataset``, whose names combine a city, a topic and a kind
+(``Oslo Python Workshop #42``), so a word matches anything from one event in ten
+to one in a million. Each query runs ``crud.search_events`` for the first page
+(``--limit``) ``--repeat`` times on the app's tuned SQLite settings, reporting
+p50/p95 and how many events match in total. ``like`` rows time the substring
+scan over ``name`` a client would need without the index (unranked).
+"""
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import datetime
+
+QUERIES = [
+    ("one common word", "python", {}),
+    ("two words", "python workshop", {}),
+    ("three words", "oslo python workshop", {}),
+    ("prefixes", "pyth wor", {}),
+    ("rare word", "123457", {}),
+    ("no match", "nonexistent", {}),
+    ("word + status", "python", {"status": "scheduled"}),
+    ("words + dates", "python workshop", {"start_date": "2026-01-01", "end_date": "2026-12-31"}),
+]
+
+
+def timed(fn, repeat: int) -> dict:
+    samples = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        fn()
+        samples.append((time.perf_counter() - started) * 1000)
+    samples.sort()
+    return {"p50_ms": round(statistics.median(samples), 3),
+            "p95_ms": round(samples[min(len(samples) - 1, int(len(samples) * 0.95))], 3)}
+
+
+def run(path: str, args) -> list:
+    from sqlalchemy import create_engine, func, literal_column, select
+    from sqlalchemy.orm import Session
+    from app import crud, search
+    from app.db import apply_sqlite_pragmas
+    from app.models import model
+
+    engine = create_engine(f"sqlite:///{path}")
+    apply_sqlite_pragmas(engine)
+    results = []
+    with Session(engine) as db:
+        for label, q, filters in QUERIES:
+            terms = search.parse_terms(q)
+            status = model.EventStatus(filters["status"]) if "status" in filters else None
+            start_date = datetime.fromisoformat(filters["start_date"]) if "start_date" in filters else None
+            end_date = datetime.fromisoformat(filters["end_date"]) if "end_date" in filters else None
+            matches = db.execute(
+                select(func.count()).select_from(search.events_fts)
+                .where(literal_column("events_fts").op("MATCH")(search.fts5_query(terms)))
+            ).scalar()
+
+            def page():
+                return crud.search_events(db, terms, status, None, start_date, end_date, 0, args.limit,
+                                          crud.EVENT_RESPONSE_COLUMNS)
+
+            results.append({"query": label, "q": q, **filters, "matches": matches, "returned": len(page()),
+                            **timed(page, args.repeat)})
+
+        for label, q, filters in QUERIES[:6]:
+            like = (select(*crud.EVENT_RESPONSE_COLUMNS)
+                    .where(*(model.Event.name.ilike(f"%{term}%") for term in search.parse_terms(q)))
+                    .order_by(model.Event.event_id).limit(args.limit))
+            results.append({"query": f"like: {label}", "q": q, **timed(lambda: db.execute(like).all(), args.repeat)})
+    engine.dispose()
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--dataset", help="existing generate_dataset file to search instead of building one")
+    parser.add_argument("--events", type=int, default=1_000_000)
+    parser.add_argument("--repeat", type=int, default=20, help="runs per query")
+    parser.add_argument("--limit", type=int, default=10, help="page size")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = args.dataset
+        if path is None:
+            path = os.path.join(tmp, "search.sqlite")
+            subprocess.run([sys.executable, "-m", "benchmarks.generate_dataset", path, "--events", str(args.events),
+                            "--attendees-per-event", "fixed:0", "--users", "1"], check=True)
+        results = run(path, args)
+
+    for result in results:
+        matches = f"{result['matches']:>9,} matches" if "matches" in result else " " * 17
+        print(f"{result['query']:<26} {matches}  p50 {result['p50_ms']:8.2f}ms  p95 {result['p95_ms']:8.2f}ms",
+              file=sys.stderr)
+    print(json.dumps({"events": args.events if args.dataset is None else None, "results": results}, indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,132 @@
+"""Cold start of the app: a fresh process from import to its first served request.
+
+Run from the repository root:
+
+    python -m benchmarks.bench_startup --runs 5 --target-ms 2000
+
+The database is migrated once with ``python -m app.migrate`` and seeded with an
+admin and one event. Each run is then a new interpreter that imports
+``app.main``, builds the app with ``create_app``, runs the lifespan startup
+(job leader election included) and serves an authenticated
+``GET /events/{event_id}`` followed by the first ``GET /openapi.json``, calling
+the ASGI app directly so no client library's imports are counted.
+
+Per run it reports each phase, ``ready_ms`` (import through the first response)
+and ``process_ms`` (the whole process as the parent sees it, interpreter start
+and exit included). Exits non-zero when the median ``ready_ms`` is over
+``--target-ms``.
+"""
+import argparse
+import asyncio
+import json
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+
+PHASES = ["import_ms", "create_app_ms", "startup_ms", "first_request_ms", "openapi_ms", "ready_ms", "process_ms"]
+
+
+async def call(app, path: str, headers: list = ()) -> int:
+    scope = {
+        "type": "http", "asgi": {"version": "3.0"}, "http_version": "1.1", "method": "GET", "scheme": "http",
+        "path": path, "raw_path": path.encode(), "query_string": b"", "root_path": "",
+        "headers": [(b"host", b"bench"), *headers], "client": ("127.0.0.1", 50000), "server": ("bench", 80),
+    }
+    status = None
+
+    async def receive():
+        return {"type": "http.request", "body": b"", "more_body": False}
+
+    async def send(message):
+        nonlocal status
+        if message["type"] == "http.response.start":
+            status = message["status"]
+
+    await app(scope, receive, send)
+    return status
+
+
+def child(token: str) -> dict:
+    """One cold start, timed in this (fresh) process."""
+    started = time.perf_counter()
+    import app.main
+    imported = time.perf_counter()
+    application = app.main.create_app()
+    created = time.perf_counter()
+
+    async def serve() -> dict:
+        async with application.router.lifespan_context(application):
+            up = time.perf_counter()
+            status = await call(application, "/events/1", [(b"authorization", f"Bearer {token}".encode())])
+            assert status == 200, f"GET /events/1 returned {status}"
+            answered = time.perf_counter()
+            status = await call(application, "/openapi.json")
+            assert status == 200, f"GET /openapi.json returned {status}"
+            documented = time.perf_counter()
+        return {
+            "import_ms": (imported - started) * 1000, "create_app_ms": (created - imported) * 1000,
+            "startup_ms": (up - created) * 1000, "first_request_ms": (answered - up) * 1000,
+            "openapi_ms": (documented - answered) * 1000, "ready_ms": (answered - started) * 1000,
+        }
+
+    return asyncio.run(serve())
+
+
+def prepare(env: dict) -> str:
+    subprocess.run([sys.executable, "-m", "app.migrate"], env=env, check=True, stderr=subprocess.DEVNULL)
+    from sqlalchemy import create_engine, insert
+    from app import auth
+    from app.models import model
+    from benchmarks.bench_routes import event_row
+
+    engine = create_engine(env["DATABASE_URL"])
+    with engine.begin() as conn:
+        conn.execute(insert(model.User), [{"user_id": 1, "username": "admin", "email": "admin@example.com",
+                                           "role": "admin", "hashed_password": "x"}])
+        conn.execute(insert(model.Event), [{**event_row(1), "status": model.EventStatus.scheduled}])
+    engine.dispose()
+    return auth.create_access_token({"sub": "1"})
+
+
+def run(args) -> list:
+    runs = []
+    with tempfile.TemporaryDirectory() as tmp:
+        env = {**os.environ, "DATABASE_URL": f"sqlite:///{os.path.join(tmp, 'startup.sqlite')}"}
+        token = prepare(env)
+        for i in range(args.runs):
+            started = time.perf_counter()
+            result = subprocess.run([sys.executable, "-m", "benchmarks.bench_startup", "--child", token],
+                                    env=env, check=True, capture_output=True, text=True)
+            process_ms = (time.perf_counter() - started) * 1000
+            runs.append({**json.loads(result.stdout.strip().splitlines()[-1]), "process_ms": process_ms})
+            print(f"run {i + 1}/{args.runs}: ready in {runs[-1]['ready_ms']:.0f}ms", file=sys.stderr)
+    return runs
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--runs", type=int, default=5, help="fresh processes to time")
+    parser.add_argument("--target-ms", type=float, default=2000, help="ceiling for the median ready_ms")
+    parser.add_argument("--child", metavar="TOKEN", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.child:
+        print(json.dumps(child(args.child)))
+        return
+
+    runs = run(args)
+    summary = {phase: {"median": round(statistics.median(r[phase] for r in runs), 1),
+                       "max": round(max(r[phase] for r in runs), 1)} for phase in PHASES}
+    ready = summary["ready_ms"]["median"]
+    print(json.dumps({"target_ms": args.target_ms, "summary": summary, "runs": runs}, indent=2))
+    if ready > args.target_ms:
+        print(f"median ready_ms {ready:.0f} is over the {args.target_ms:.0f}ms target", file=sys.stderr)
+        sys.exit(1)
+    print(f"median ready_ms {ready:.0f} is within the {args.target_ms:.0f}ms target", file=sys.stderr)
+
+
+if __name__ == "__main__":
+    main()
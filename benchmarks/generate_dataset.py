@@ -0,0 +1,279 @@
+"""Bulk-generate a synthetic Event / Attendee / User dataset into a SQLite file.
+
+Run from the repository root:
+
+    python -m benchmarks.generate_dataset large.sqlite --events 250000 --attendees-per-event lognormal:25,1.2
+
+Rows are built from the tables in ``app/models/model.py`` and inserted with Core
+``executemany`` in transactions of ``--transaction-rows`` rows, with the build-only
+PRAGMAs ``journal_mode=OFF`` / ``synchronous=OFF`` and secondary indexes (and the
+full-text index) created after the load. The result is stamped with the Alembic head, so the app can be
+pointed at it directly (``DATABASE_URL=sqlite:///./large.sqlite``).
+
+Distributions:
+
+* ``--attendees-per-event``: ``fixed:N``, ``uniform:LO,HI``, ``lognormal:MEDIAN,SIGMA``
+  or ``pareto:ALPHA,MIN``, capped by ``--max-attendees-per-event``.
+* ``--status-mix``: relative weights per ``EventStatus``. Event times agree with
+  the status at ``--now``: scheduled events start within ``--future-days``,
+  completed ones ended within ``--past-days``, ongoing ones span ``--now``.
+* ``--check-in-rate``: fraction of attendees checked in, per status.
+
+``registered_count`` and ``checked_in_count`` match the generated attendees.
+Every user gets the same password, hashed once with the app's bcrypt settings.
+"""
+import argparse
+import math
+import os
+import random
+import sys
+import time
+from datetime import datetime, timedelta
+from itertools import islice
+from typing import Callable, Dict, Iterable, Iterator, List
+
+from alembic.config import Config
+from alembic.migration import MigrationContext
+from alembic.script import ScriptDirectory
+from sqlalchemy import create_engine, event, insert
+from sqlalchemy.schema import CreateTable
+
+from app.auth import pwd_context
+from app.db import Base
+from app.event_status import utcnow
+from app.models import model
+from app.models.model import EventStatus
+from app.search import create_search_index
+
+ALEMBIC_INI = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "alembic.ini")
+
+CITIES = ["Oslo", "Rome", "Lisbon", "Berlin", "Madrid", "Paris", "Vienna", "Prague", "Warsaw", "Dublin",
+          "Helsinki", "Athens", "Zurich", "Tallinn", "Riga", "Porto", "Milan", "Munich", "Lyon", "Krakow"]
+TOPICS = ["Python", "Data", "Cloud", "Design", "Security", "Music", "Film", "Food", "Health", "Startup"]
+KINDS = ["Meetup", "Summit", "Workshop", "Conference", "Expo", "Festival", "Hackathon", "Forum"]
+FIRST_NAMES = ["Ada", "Alan", "Grace", "Linus", "Guido", "Margaret", "Ken", "Barbara", "Dennis", "Frances",
+               "Tim", "Radia", "John", "Katherine", "Edsger", "Hedy", "Donald", "Sophie", "Bjarne", "Anita"]
+LAST_NAMES = ["Lovelace", "Turing", "Hopper", "Torvalds", "Rossum", "Hamilton", "Thompson", "Liskov", "Ritchie",
+              "Allen", "Berners-Lee", "Perlman", "McCarthy", "Johnson", "Dijkstra", "Lamarr", "Knuth", "Wilson"]
+
+
+def parse_distribution(spec: str) -> Callable[[random.Random], float]:
+    """Turns ``kind:params`` into a sampler, e.g. ``lognormal:25,1.2``."""
+    kind, _, params = spec.partition(":")
+    try:
+        args = [float(value) for value in params.split(",")] if params else []
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"invalid distribution parameters: {spec!r}")
+    samplers = {
+        "fixed": (1, lambda rng, n: n),
+        "uniform": (2, lambda rng, lo, hi: rng.uniform(lo, hi + 1)),
+        "lognormal": (2, lambda rng, median, sigma: rng.lognormvariate(math.log(median), sigma)),
+        "pareto": (2, lambda rng, alpha, minimum: minimum * rng.paretovariate(alpha)),
+    }
+    if kind not in samplers or len(args) != samplers[kind][0]:
+        raise argparse.ArgumentTypeError(
+            f"expected fixed:N, uniform:LO,HI, lognormal:MEDIAN,SIGMA or pareto:ALPHA,MIN, got {spec!r}")
+    sample = samplers[kind][1]
+    return lambda rng: sample(rng, *args)
+
+
+def parse_per_status(spec: str) -> Dict[EventStatus, float]:
+    """Parses ``scheduled=55,completed=35`` into per-status values; unnamed statuses get 0."""
+    values = dict.fromkeys(EventStatus, 0.0)
+    for item in filter(None, spec.split(",")):
+        name, _, value = item.partition("=")
+        try:
+            values[EventStatus(name.strip())] = float(value)
+        except ValueError:
+            raise argparse.ArgumentTypeError(f"expected status=number pairs, got {item!r}")
+    if any(value < 0 for value in values.values()):
+        raise argparse.ArgumentTypeError(f"values must not be negative: {spec!r}")
+    return values
+
+
+def parse_range(spec: str) -> tuple:
+    lo, _, hi = spec.partition(",")
+    try:
+        lo, hi = float(lo), float(hi or lo)
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"expected LO,HI, got {spec!r}")
+    if not 0 < lo <= hi:
+        raise argparse.ArgumentTypeError(f"expected 0 < LO <= HI, got {spec!r}")
+    return lo, hi
+
+
+def event_times(rng: random.Random, status: EventStatus, now: datetime, args) -> tuple:
+    """A (start_time, end_time) pair consistent with ``status`` at ``now``."""
+    duration = timedelta(seconds=round(rng.uniform(*args.duration_hours) * 3600))
+    if status == EventStatus.scheduled:
+        start = now + timedelta(days=rng.uniform(0, args.future_days)) + timedelta(minutes=1)
+    elif status == EventStatus.ongoing:
+        start = now - duration * rng.random()
+    elif status == EventStatus.completed:
+        start = now - timedelta(days=rng.uniform(0, args.past_days)) - duration
+    else:
+        start = now + timedelta(days=rng.uniform(-args.past_days, args.future_days))
+    start = start.replace(microsecond=0)
+    return start, start + duration
+
+
+def generate(args, password_hash: str) -> Iterator[tuple]:
+    """Yields ``(table, row)`` pairs: each event followed by its attendees, then the users."""
+    rng = random.Random(args.seed)
+    attendees_per_event = args.attendees_per_event
+    statuses, weights = zip(*args.status_mix.items())
+    now = args.now.replace(microsecond=0)
+    # Hot loop: one random() per field is noticeably cheaper than choice()/randrange()
+    random_ = rng.random
+    first_names, last_names = FIRST_NAMES, LAST_NAMES
+    attendee_id = 0
+    for event_id in range(1, args.events + 1):
+        status = rng.choices(statuses, weights)[0]
+        start_time, end_time = event_times(rng, status, now, args)
+        registered = min(max(int(attendees_per_event(rng)), 0), args.max_attendees_per_event)
+        check_in_rate = args.check_in_rate[status]
+        checked_in = 0
+        attendees = []
+        for _ in range(registered):
+            attendee_id += 1
+            check_in_status = random_() < check_in_rate
+            checked_in += check_in_status
+            attendees.append({
+                "attendee_id": attendee_id, "first_name": first_names[int(random_() * len(first_names))],
+                "last_name": last_names[int(random_() * len(last_names))], "email": f"guest{attendee_id}@example.com",
+                "phone_number": str(1_000_000_000 + int(random_() * 9_000_000_000)),
+                "check_in_status": check_in_status, "event_id": event_id,
+            })
+        city = rng.choice(CITIES)
+        yield model.Event.__table__, {
+            "event_id": event_id, "name": f"{city} {rng.choice(TOPICS)} {rng.choice(KINDS)} #{event_id}",
+            "description": None if rng.random() < 0.2 else f"Synthetic event {event_id}",
+            "start_time": start_time, "end_time": end_time, "location": city,
+            "max_attendees": max(math.ceil(registered * (1 + rng.uniform(0, args.headroom))), 1),
+            "registered_count": registered, "checked_in_count": checked_in, "status": status,
+        }
+        for attendee in attendees:
+            yield model.Attendee.__table__, attendee
+    for user_id in range(1, args.users + 1):
+        yield model.User.__table__, {
+            "user_id": user_id, "username": f"user{user_id}", "email": f"user{user_id}@example.com",
+            "hashed_password": password_hash, "role": "admin" if rng.random() < args.admin_ratio else "user",
+        }
+
+
+def batched(rows: Iterable[tuple], size: int) -> Iterator[Dict[object, List[dict]]]:
+    """Groups ``(table, row)`` pairs into per-table batches of up to ``size`` rows in total."""
+    rows = iter(rows)
+    while True:
+        batch: Dict[object, List[dict]] = {}
+        for table, row in islice(rows, size):
+            batch.setdefault(table, []).append(row)
+        if not batch:
+            return
+        yield batch
+
+
+def build(args) -> Dict[str, int]:
+    url = f"sqlite:///{args.path}"
+    engine = create_engine(url)
+
+    @event.listens_for(engine, "connect")
+    def _bulk_load_pragmas(dbapi_connection, _):
+        # Nothing to recover if the build dies half way: no journal, no fsync
+        cursor = dbapi_connection.cursor()
+        for pragma in ("journal_mode=OFF", "synchronous=OFF", "cache_size=-262144", "temp_store=MEMORY",
+                       "locking_mode=EXCLUSIVE"):
+            cursor.execute(f"PRAGMA {pragma}")
+        cursor.close()
+
+    tables = Base.metadata.sorted_tables
+    with engine.begin() as conn:
+        for table in tables:
+            # Secondary indexes are cheaper to build once at the end than to maintain per row
+            conn.execute(CreateTable(table))
+
+    password_hash = pwd_context.hash(args.password)
+    counts = dict.fromkeys((table.name for table in tables), 0)
+    started = last_report = time.perf_counter()
+    conn = engine.connect()
+    try:
+        pending = 0
+        for batch in batched(generate(args, password_hash), args.batch_size):
+            for table in tables:
+                if table in batch:
+                    conn.execute(insert(table), batch[table])
+                    counts[table.name] += len(batch[table])
+                    pending += len(batch[table])
+            if pending >= args.transaction_rows:
+                conn.commit()
+                pending = 0
+            if time.perf_counter() - last_report >= 5:
+                last_report = time.perf_counter()
+                total = sum(counts.values())
+                print(f"  {total:,} rows, {total / (last_report - started):,.0f} rows/s", file=sys.stderr)
+        conn.commit()
+        loaded = time.perf_counter()
+
+        for table in tables:
+            for index in sorted(table.indexes, key=lambda index: index.name):
+                index.create(conn)
+        # The full-text index too, built in one pass over the loaded events
+        create_search_index(conn)
+        conn.exec_driver_sql("PRAGMA analysis_limit=1000")
+        conn.exec_driver_sql("ANALYZE")
+        MigrationContext.configure(conn).stamp(ScriptDirectory.from_config(Config(ALEMBIC_INI)), "head")
+        conn.commit()
+    finally:
+        conn.close()
+        engine.dispose()
+    finished = time.perf_counter()
+    counts.update(load_seconds=round(loaded - started, 1), index_seconds=round(finished - loaded, 1))
+    return counts
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("path", help="SQLite file to create")
+    parser.add_argument("--force", action="store_true", help="overwrite an existing file")
+    parser.add_argument("--events", type=int, default=100_000)
+    parser.add_argument("--attendees-per-event", type=parse_distribution, default="lognormal:25,1.2",
+                        help="fixed:N, uniform:LO,HI, lognormal:MEDIAN,SIGMA or pareto:ALPHA,MIN (default: %(default)s)")
+    parser.add_argument("--max-attendees-per-event", type=int, default=20_000)
+    parser.add_argument("--headroom", type=float, default=0.5,
+                        help="max_attendees exceeds the registrations by up to this fraction (default: %(default)s)")
+    parser.add_argument("--status-mix", type=parse_per_status, default="scheduled=55,ongoing=5,completed=35,canceled=5")
+    parser.add_argument("--check-in-rate", type=parse_per_status, default="ongoing=0.4,completed=0.85")
+    parser.add_argument("--now", type=datetime.fromisoformat, default=utcnow(),
+                        help="naive UTC reference time for event statuses (default: the current time)")
+    parser.add_argument("--past-days", type=float, default=365)
+    parser.add_argument("--future-days", type=float, default=180)
+    parser.add_argument("--duration-hours", type=parse_range, default="1,72", help="LO,HI (default: %(default)s)")
+    parser.add_argument("--users", type=int, default=1000)
+    parser.add_argument("--admin-ratio", type=float, default=0.01)
+    parser.add_argument("--password", default="password", help="password of every generated user")
+    parser.add_argument("--batch-size", type=int, default=20_000, help="rows per executemany")
+    parser.add_argument("--transaction-rows", type=int, default=1_000_000, help="rows per commit")
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    if not sum(args.status_mix.values()):
+        parser.error("--status-mix needs at least one positive weight")
+    if any(rate > 1 for rate in args.check_in_rate.values()):
+        parser.error("--check-in-rate values are fractions between 0 and 1")
+    if os.path.exists(args.path):
+        if not args.force:
+            parser.error(f"{args.path} exists; pass --force to overwrite it")
+        for suffix in ("", "-wal", "-shm", "-journal"):
+            if os.path.exists(args.path + suffix):
+                os.remove(args.path + suffix)
+
+    counts = build(args)
+    rows = sum(counts[table.name] for table in Base.metadata.sorted_tables)
+    seconds = counts["load_seconds"] + counts["index_seconds"]
+    print(f"{rows:,} rows in {seconds:.1f}s ({rows / max(counts['load_seconds'], 1e-9):,.0f} rows/s loading)")
+    for name, value in counts.items():
+        print(f"  {name}: {value:,}")
+
+
+if __name__ == "__main__":
+    main()
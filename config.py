@@ -1 +1,122 @@
-DATABASE_URL = "sqlite:///./eventdb.sqlite"
+import os
+from typing import Literal, Optional
+from pydantic_settings import BaseSettings, SettingsConfigDict
+
+
+def _async_url(url: str) -> str:
+    """Maps a sync database URL onto its async driver (aiosqlite / asyncpg)."""
+    if url.startswith("sqlite:"):
+        return url.replace("sqlite:", "sqlite+aiosqlite:", 1)
+    if url.startswith(("postgresql:", "postgresql+psycopg2:")):
+        return "postgresql+asyncpg:" + url.split(":", 1)[1]
+    return url
+
+
+class Settings(BaseSettings):
+    """Application settings, read from the environment (or a .env file) by field name."""
+
+    model_config = SettingsConfigDict(env_file=".env", extra="ignore")
+
+    database_url: str = "sqlite:///./eventdb.sqlite"
+    # Async engine settings; USE_ASYNC_DB switches get_db over to AsyncSession
+    async_database_url: Optional[str] = None
+    use_async_db: bool = False
+
+    # "tuned" applies the PRAGMAs / pool settings below; "default" leaves SQLAlchemy's defaults
+    db_engine_profile: Literal["tuned", "default"] = "tuned"
+    # SQLite, applied to every new connection
+    sqlite_journal_mode: str = "wal"
+    sqlite_synchronous: str = "normal"
+    sqlite_mmap_size: int = 256 * 1024 * 1024
+    sqlite_busy_timeout_ms: int = 5000
+    sqlite_cache_size: int = -64 * 1024  # Negative values are KiB, i.e. 64 MiB
+    # Postgres connection pool
+    db_pool_size: int = 10
+    db_max_overflow: int = 20
+    db_pool_pre_ping: bool = True
+    db_pool_recycle: int = 1800
+    # Seconds to wait for a pooled connection; unset keeps SQLAlchemy's default
+    db_pool_timeout: Optional[float] = None
+
+    # In-process cache of decoded JWT claims and users for get_current_user
+    auth_cache_ttl_seconds: float = 60
+    auth_cache_max_entries: int = 10000
+
+    # bcrypt cost for new hashes; users hashed at another cost are rehashed at their next login
+    bcrypt_rounds: int = 12
+    # Threads that hash and verify passwords, i.e. the cap on concurrent bcrypt work
+    password_hash_workers: int = os.cpu_count() or 1
+
+    # Events moved per transaction by the status scheduler, and how often it reloads its deadlines
+    # from the database to pick up events written by other processes
+    status_batch_size: int = 500
+    status_resync_seconds: int = 60
+
+    # How often the leader checks events' attendance counters against the attendees table
+    stats_reconcile_seconds: int = 900
+
+    # Live check-in feed: frames queued per WebSocket subscriber before it is dropped as too slow,
+    # and check-ins per frame
+    checkin_feed_queue_size: int = 256
+    checkin_feed_frame_size: int = 500
+
+    # Background jobs run in the one process holding the leader lock: a file next to the SQLite
+    # database (or JOB_LOCK_PATH), or a Postgres advisory lock; the others retry this often
+    job_leader_retry_seconds: float = 5
+    job_lock_path: Optional[str] = None
+    job_advisory_lock_key: int = 0x6576656E7473  # "events"
+
+    # Serialized GET /events and GET /events/{id} responses kept for ETag revalidation; writes
+    # only invalidate their own process's entries, so the TTL bounds how stale other workers get
+    event_cache_max_entries: int = 1024
+    event_cache_ttl_seconds: float = 30
+
+    # Request, database and job metrics, served in Prometheus text format at /metrics;
+    # with a token set, scrapes must send "Authorization: Bearer <token>"
+    metrics_enabled: bool = True
+    metrics_token: Optional[str] = None
+
+    # Request profiles: asked for by admins (X-Profile header or ?profile=), plus 1 in
+    # PROFILE_SAMPLE_RATE requests when that is set; the newest PROFILE_KEEP are kept
+    profile_dir: str = "profiles"
+    profile_keep: int = 200
+    profile_sample_rate: int = 0
+    profile_sample_mode: Literal["stacks", "cprofile"] = "stacks"
+    profile_sample_interval_ms: float = 1
+
+
+settings = Settings()
+
+DATABASE_URL = settings.database_url
+ASYNC_DATABASE_URL = settings.async_database_url or _async_url(DATABASE_URL)
+USE_ASYNC_DB = settings.use_async_db
+
+AUTH_CACHE_TTL_SECONDS = settings.auth_cache_ttl_seconds
+AUTH_CACHE_MAX_ENTRIES = settings.auth_cache_max_entries
+
+BCRYPT_ROUNDS = settings.bcrypt_rounds
+PASSWORD_HASH_WORKERS = settings.password_hash_workers
+
+EVENT_CACHE_MAX_ENTRIES = settings.event_cache_max_entries
+EVENT_CACHE_TTL_SECONDS = settings.event_cache_ttl_seconds
+
+STATUS_BATCH_SIZE = settings.status_batch_size
+STATUS_RESYNC_SECONDS = settings.status_resync_seconds
+
+STATS_RECONCILE_SECONDS = settings.stats_reconcile_seconds
+
+CHECKIN_FEED_QUEUE_SIZE = settings.checkin_feed_queue_size
+CHECKIN_FEED_FRAME_SIZE = settings.checkin_feed_frame_size
+
+JOB_LEADER_RETRY_SECONDS = settings.job_leader_retry_seconds
+JOB_LOCK_PATH = settings.job_lock_path
+JOB_ADVISORY_LOCK_KEY = settings.job_advisory_lock_key
+
+METRICS_ENABLED = settings.metrics_enabled
+METRICS_TOKEN = settings.metrics_token
+
+PROFILE_DIR = settings.profile_dir
+PROFILE_KEEP = settings.profile_keep
+PROFILE_SAMPLE_RATE = settings.profile_sample_rate
+PROFILE_SAMPLE_MODE = settings.profile_sample_mode
+PROFILE_SAMPLE_INTERVAL_MS = settings.profile_sample_interval_ms